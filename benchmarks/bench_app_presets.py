@@ -0,0 +1,105 @@
+# 按应用切换预设：前台窗口来回切换时的规则解析 (未命中缓存 vs 按窗口缓存)、整次切换，以及引擎换用新快照的开销
+# 同时检查切换期间没有写任何文件：
+#   python benchmarks/bench_app_presets.py        (切换期间有文件写入或结果不对时退出码为 1)
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_mouse.app_presets import AppPresetSwitcher, PresetRules, parse_app_rules, preset_profiles
+from global_mouse.backends import RecordingBackend
+from global_mouse.config import ConfigStore, ConfigSnapshot, RuntimeState
+from global_mouse.curves import compile_curve
+from global_mouse.engine import ScrollEngine
+from global_mouse.foreground import ForegroundWindow
+
+PRESETS = 8
+WINDOWS = 20
+
+# 切换期间以写模式打开的文件 (审计钩子装上后无法移除，只在 writes 不为 None 时记录)
+writes = None
+
+
+def audit(event, args):
+    if writes is not None and event == "open" and args[1] is not None and any(c in str(args[1]) for c in "wax+"):
+        writes.append(args[0])
+
+
+def make_presets():
+    return {f"preset{i}": ConfigSnapshot(sensitivity=1.0 + i * 0.5, curve_type="bezier" if i % 2 else "power",
+                                         tick_rate=120 if i % 2 else 240, inertia=bool(i % 3)).to_dict()
+            for i in range(PRESETS)}
+
+
+def make_rules(n):
+    # 规则依次为 class:app0.exe ... 末尾一条通配规则；只有前 PRESETS 条指向存在的预设
+    lines = [f"class:app{i}.exe => preset{i % PRESETS}" for i in range(n - 1)]
+    return lines + ["glob:*Visual Studio Code* => preset1"]
+
+
+def make_windows():
+    # 一半命中规则，一半不命中
+    return [ForegroundWindow(f"document {i} - Editor", f"app{i}.exe" if i % 2 == 0 else f"other{i}.exe", None, False)
+            for i in range(WINDOWS)]
+
+
+def bench(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main(sizes=(10, 100)):
+    global writes
+    sys.addaudithook(audit)
+    presets = make_presets()
+    profiles = preset_profiles(presets)
+    results = {}
+    ok = True
+    for n in sizes:
+        lines = make_rules(n)
+        windows = make_windows()
+        rules = parse_app_rules(lines)
+        uncached = PresetRules(rules, cache_size=0)
+        cached = PresetRules(rules)
+        flip = lambda rules: [rules.resolve(w.title, w.window_class) for w in windows]
+        resolve_uncached = bench(lambda: flip(uncached), max(20, 2000 // n)) / len(windows)
+        flip(cached)
+        resolve_cached = bench(lambda: flip(cached), 2000) / len(windows)
+
+        store = ConfigStore(ConfigSnapshot(app_presets=lines))
+        state = RuntimeState()
+        switcher = AppPresetSwitcher(store, state)
+        switcher.set_profiles(profiles)
+        engine = ScrollEngine(switcher, state, lambda: (0, 0), RecordingBackend())
+
+        # 切换一次：更新前台窗口 -> 解析 -> 换快照；随后引擎 tick 时读到新快照并应用
+        def switch():
+            for w in windows:
+                state.window = w
+                switcher.on_foreground_changed(w)
+                engine.apply_snapshot(switcher.snapshot)
+        writes = []
+        switch()
+        switch_us = bench(switch, 200) / len(windows)
+        file_writes, writes = len(writes), None
+
+        # 命中的窗口用对应预设的滚动参数，其余用基础配置；配置仓库本身不变
+        for w in windows:
+            switcher.on_foreground_changed(w)
+            name = cached.resolve(w.title, w.window_class)
+            expected = presets[name]["sensitivity"] if name in presets else store.snapshot.sensitivity
+            ok = ok and switcher.active == (name if name in presets else None) and switcher.snapshot.sensitivity == expected
+        ok = ok and store.snapshot.sensitivity == ConfigSnapshot().sensitivity and file_writes == 0
+
+        compile_us = bench(lambda: compile_curve(switcher.snapshot, engine.base_multiplier), 200)
+        results[n] = {"resolve_uncached_us": resolve_uncached, "resolve_cached_us": resolve_cached, "switch_us": switch_us,
+                      "compile_curve_us": compile_us, "switches": switcher.switches, "file_writes": file_writes,
+                      "cache_hits": switcher.rules.hits, "cache_misses": switcher.rules.misses}
+        print(f"{n:>5} rules  resolve uncached {resolve_uncached:6.2f} us   cached {resolve_cached:5.2f} us   "
+              f"switch + apply {switch_us:6.2f} us   (compile curve {compile_us:7.2f} us)   file writes {file_writes}")
+    results["ok"] = ok
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main()["ok"] else 1)
@@ -0,0 +1,150 @@
+# 连点风暴下鼠标钩子回调的耗时分布：旧版在回调里做过滤/状态切换 vs 只入队、由 click_dispatch 线程处理
+#   python benchmarks/bench_clicks.py
+import os
+import sys
+import time
+import random
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.clicks import ClickQueue, ClickDispatcher, CLICK_TOGGLE, CLICK_CANCEL
+from global_mouse.config import ConfigStore, RuntimeState
+from global_mouse.engine import ScrollEngine
+from global_mouse.filters import AppFilter
+from global_mouse.foreground import ForegroundWindow
+from global_mouse.motion import MotionRing
+
+from bench_filter import make_rules
+
+MIDDLE, LEFT, RIGHT = "middle", "left", "right"
+CODES = {MIDDLE: CLICK_TOGGLE, LEFT: CLICK_CANCEL, RIGHT: CLICK_CANCEL}
+
+
+# 与 MainWindow / HeadlessDaemon 相同的判定与状态切换
+# 跨线程 Qt 信号 (排队连接) 会唤醒阻塞在事件循环里的 GUI 线程，这里用一个等待 Event 的线程代替 (不含 Qt 自身的开销)
+class Host:
+    def __init__(self, rules):
+        self.config = ConfigStore()
+        self.config.update(filter_mode=1 if rules else 0, filter_list=rules)
+        self.state = RuntimeState()
+        self.motion = MotionRing()
+        self.output = RecordingBackend(120)
+        self.app_filter = AppFilter.from_config(self.config.snapshot)
+        self.quantize_filter = AppFilter.for_quantization(self.config.snapshot)
+        self.engine = ScrollEngine(self.config, self.state, self.motion.position, self.output)
+        threading.Thread(target=self.engine.run, daemon=True).start()
+        self.clicks = ClickQueue()
+        self.dispatch = []
+        self.dispatcher = ClickDispatcher(self.clicks, self.handle_click, name="bench_click_dispatch")
+        self.dispatcher.start()
+        self.gui_wake = threading.Event()
+        self.gui_events = 0
+        threading.Thread(target=self.gui_loop, daemon=True).start()
+
+    def gui_loop(self):
+        while True:
+            self.gui_wake.wait(); self.gui_wake.clear()
+            self.gui_events += 1
+
+    def emit(self):
+        self.gui_wake.set()
+
+    def transition(self, code, x, y, t=None):
+        state = self.state
+        if code == CLICK_TOGGLE:
+            window = state.window
+            if not state.paused and self.app_filter.allowed(window.title, window.window_class, window.fullscreen):
+                if not state.active:
+                    state.origin_pos = (x, y)
+                    whole = self.quantize_filter.allowed(window.title, window.window_class, window.fullscreen)
+                    self.output.set_quantum(self.output.steps_per_unit if whole else 1)
+                    state.active = True
+                    self.engine.notify(t)
+                    self.emit()
+                else:
+                    state.active = False
+                    self.emit()
+        else:
+            if state.active:
+                state.active = False
+                self.emit()
+            if self.engine.gliding(): self.engine.stop_glide()
+
+    def handle_click(self, code, x, y, t):
+        self.transition(code, x, y, t)
+        self.dispatch.append(time.perf_counter() - t)
+
+    # 旧版：全部工作都在钩子线程里完成
+    def legacy_on_click(self, x, y, button, pressed):
+        self.motion.push(x, y)
+        if pressed and button in CODES: self.transition(CODES[button], x, y)
+
+    # 新版：查按键表后入队
+    def queued_on_click(self, x, y, button, pressed):
+        self.motion.push(x, y)
+        if pressed:
+            code = CODES.get(button)
+            if code: self.clicks.push(code, x, y)
+
+    def close(self):
+        self.dispatcher.close()
+        self.state.active = False
+        self.engine.notify()
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def storm(host, on_click, clicks, cached, rate):
+    # 每轮：中键按下/抬起 (激活)、中键按下/抬起 (停止)、左键按下/抬起；未命中缓存时每次点击前都切换前台窗口
+    # 回调按 rate (次/秒) 均匀到达：真实钩子线程在两次事件之间是空闲的，其他线程才能拿到 GIL
+    samples = []
+    state = host.state
+    interval = 1.0 / rate
+    due = time.perf_counter()
+    for i in range(clicks):
+        if not cached or i == 0:
+            state.window = ForegroundWindow(f"Document {i} - Editor", "Chrome_WidgetWin_1", None, False)
+        for button, pressed in ((MIDDLE, True), (MIDDLE, False), (MIDDLE, True), (MIDDLE, False), (LEFT, True), (LEFT, False)):
+            due += interval
+            delay = due - time.perf_counter()
+            if delay > 0: time.sleep(delay)
+            start = time.perf_counter()
+            on_click(400.0, 300.0, button, pressed)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summary(samples):
+    samples = sorted(samples)
+    return {"p50_us": percentile(samples, 0.5) * 1e6, "p99_us": percentile(samples, 0.99) * 1e6,
+            "max_us": samples[-1] * 1e6, "count": len(samples)}
+
+
+def main(clicks=2000, rule_counts=(0, 1000), rate=2000):
+    rng = random.Random(42)
+    rules = make_rules(max(rule_counts), rng)
+    results = {}
+    for rule_count in rule_counts:
+        for cached in (True, False):
+            host = Host(rules[:rule_count])
+            key = f"{rule_count}_rules_{'cached' if cached else 'uncached'}"
+            legacy = summary(storm(host, host.legacy_on_click, clicks, cached, rate))
+            queued = summary(storm(host, host.queued_on_click, clicks, cached, rate))
+            deadline = time.perf_counter() + 5.0
+            while host.clicks.tail != host.clicks.head and time.perf_counter() < deadline: time.sleep(0.001)
+            dispatch = summary(host.dispatch) if host.dispatch else {}
+            host.close()
+            results[key] = {"legacy": legacy, "queued": queued, "dispatch": dispatch, "dropped": host.clicks.dropped}
+            print(f"{key:<22} callback p99: legacy {legacy['p99_us']:8.2f} us  queued {queued['p99_us']:6.2f} us  "
+                  f"(p50 {legacy['p50_us']:6.2f} / {queued['p50_us']:5.2f} us, max {legacy['max_us']:8.1f} / {queued['max_us']:7.1f} us)  "
+                  f"enqueue->handled p99 {dispatch.get('p99_us', 0.0):8.1f} us  dropped {host.clicks.dropped}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# 配置文件：大量预设 + 长过滤列表时的加载/保存耗时，旧版同步写入 vs 后台合并写入的 GUI 线程开销
+#   python benchmarks/bench_config.py
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from global_mouse.config import ConfigSnapshot
+from global_mouse.persistence import ConfigFile
+
+from bench_filter import make_rules
+
+
+def make_config(presets, rules, rng):
+    data = {}
+    for i in range(presets):
+        snap = ConfigSnapshot(sensitivity=rng.uniform(1, 5), dead_zone=rng.uniform(5, 40), filter_mode=1,
+                              filter_list=make_rules(rules, rng), hotkeys={"toggle_pause": "Ctrl+Alt+P"})
+        data[f"预设 {i}"] = snap.to_dict()
+    return {"presets": data, "last_used": "预设 0"}
+
+
+# 旧版 save_presets_to_file：在 GUI 线程里直接覆盖写
+def legacy_save(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main(sizes=((10, 100), (200, 100), (500, 1000)), burst=50):
+    rng = random.Random(42)
+    directory = tempfile.mkdtemp(prefix="global_mouse_config_")
+    path = os.path.join(directory, "config.json")
+    results = {}
+    try:
+        for presets, rules in sizes:
+            data = make_config(presets, rules, rng)
+            repeat = 3 if presets * rules > 100000 else 10
+            key = f"{presets}_presets_{rules}_rules"
+            store = ConfigFile(path, delay=0.05, max_delay=0.2)
+
+            legacy_ms = timed(lambda: legacy_save(path, data), repeat)
+            atomic_ms = timed(lambda: store.write(data), repeat)
+            load_ms = timed(lambda: [ConfigSnapshot.from_dict(p) for p in store.load()["presets"].values()], repeat)
+
+            # 连续快速切换预设：每次都调用 save()，测 GUI 线程开销与实际写盘次数
+            store.writes = 0
+            start = time.perf_counter()
+            for i in range(burst): store.save(dict(data, last_used=f"预设 {i % presets}"))
+            enqueue_us = (time.perf_counter() - start) / burst * 1e6
+            store.close()
+            while store._thread.is_alive(): time.sleep(0.01)
+
+            results[key] = {"size_kb": os.path.getsize(path) / 1024, "load_ms": load_ms,
+                            "legacy_save_ms": legacy_ms, "atomic_save_ms": atomic_ms,
+                            "gui_save_us": enqueue_us, "burst_saves": burst, "burst_writes": store.writes}
+            print(f"{key:<28} {results[key]['size_kb']:9.1f} KB  load {load_ms:8.2f} ms  "
+                  f"legacy save {legacy_ms:8.2f} ms  atomic save {atomic_ms:8.2f} ms  "
+                  f"GUI thread {enqueue_us:6.2f} us/save  {burst} saves -> {store.writes} writes")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    main()
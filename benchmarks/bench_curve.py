@@ -0,0 +1,60 @@
+# 曲线查表 vs 旧版内联计算的单 tick 耗时对比
+#   python benchmarks/bench_curve.py
+import os
+import sys
+import math
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.curves import CURVE_TYPES, DEFAULT_CURVE_PARAMS, CompiledCurve
+from global_mouse.engine import ScrollEngine, BASE_MULTIPLIER
+from global_mouse.config import ConfigStore, RuntimeState
+
+
+# 旧版 scroll_loop 中每个 tick 的方向判断与曲线计算 (不含 pynput 调用)
+def legacy_tick(cfg, dx, dy):
+    if not cfg.enable_horizontal: dx = 0
+    dist = math.hypot(dx, dy)
+    current_dir = 'neutral'
+    if dist > cfg.dead_zone:
+        if abs(dx) > abs(dy): current_dir = 'right' if dx > 0 else 'left'
+        else: current_dir = 'down' if dy > 0 else 'up'
+    if dist > cfg.dead_zone:
+        eff_dist = dist - cfg.dead_zone
+        speed_scalar = math.pow(eff_dist, cfg.sensitivity) * BASE_MULTIPLIER * cfg.speed_factor
+        return (dx / dist) * speed_scalar, (dy / dist) * speed_scalar * -1, current_dir
+    return 0.0, 0.0, current_dir
+
+
+def bench(fn, number):
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number * 1e9
+
+
+def main(number=200000):
+    store = ConfigStore()
+    cfg = store.snapshot
+    offsets = [(37.0, 211.5), (-5.0, -48.0), (310.0, 12.0), (3.0, 4.0)]
+
+    results = {}
+    results["legacy_inline"] = bench(lambda: [legacy_tick(cfg, dx, dy) for dx, dy in offsets], number // 4) / len(offsets)
+    for curve_type in CURVE_TYPES:
+        store.update(curve_type=curve_type, curve_params=DEFAULT_CURVE_PARAMS[curve_type])
+        engine = ScrollEngine(store, RuntimeState(), lambda: (0, 0), RecordingBackend())
+        results[f"lut_{curve_type}"] = bench(lambda: [engine.velocity(dx, dy) for dx, dy in offsets], number // 4) / len(offsets)
+
+    # 同样的贝塞尔形状若不查表，每 tick 都要做一次二分求解
+    bezier = CompiledCurve("bezier", DEFAULT_CURVE_PARAMS["bezier"], cfg.sensitivity, cfg.speed_factor, cfg.dead_zone, BASE_MULTIPLIER)
+    results["inline_bezier"] = bench(lambda: [bezier.evaluate(math.hypot(dx, dy)) for dx, dy in offsets], number // 40) / len(offsets)
+
+    compile_cost = bench(lambda: CompiledCurve("bezier", DEFAULT_CURVE_PARAMS["bezier"], cfg.sensitivity, cfg.speed_factor,
+                                               cfg.dead_zone, BASE_MULTIPLIER), 5) / 1e3
+    for name, ns in results.items(): print(f"{name:<16} {ns:8.1f} ns/tick")
+    print(f"{'compile_bezier':<16} {compile_cost:8.1f} us/rebuild")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# 空闲唤醒次数与 "激活 -> 首个 tick" 延迟
+#   python benchmarks/bench_idle.py
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.config import ConfigStore, RuntimeState
+from global_mouse.engine import ScrollEngine
+
+
+def main(idle_seconds=2.0, activations=50):
+    state = RuntimeState()
+    engine = ScrollEngine(ConfigStore(), state, lambda: (0, 300), RecordingBackend())
+    threading.Thread(target=engine.run, daemon=True).start()
+    time.sleep(0.05)
+
+    before = engine.wakeups.count
+    time.sleep(idle_seconds)
+    idle_per_minute = (engine.wakeups.count - before) * 60.0 / idle_seconds
+
+    latencies = []
+    for _ in range(activations):
+        state.origin_pos = (0, 0); state.active = True; engine.notify()
+        time.sleep(0.02)
+        latencies.append(engine.first_tick_latency)
+        state.active = False
+        time.sleep(0.02)
+    latencies.sort()
+    result = {
+        "idle_wakeups_per_minute": idle_per_minute,
+        "activation_latency_median_ms": latencies[len(latencies) // 2] * 1e3,
+        "activation_latency_max_ms": latencies[-1] * 1e3,
+    }
+    for name, value in result.items(): print(f"{name:<32} {value:8.3f}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# 每 tick 询问系统指针位置 vs 读取钩子写入的环形缓冲
+#   python benchmarks/bench_motion.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.config import ConfigStore, RuntimeState
+from global_mouse.engine import ScrollEngine, VirtualClock
+from global_mouse.motion import MotionRing
+
+# 模拟一次平台往返 (XQueryPointer / GetCursorPos / CGEventGetLocation) 的开销
+ROUND_TRIP = 20e-6
+
+
+class SlowController:
+    def __init__(self):
+        self.queries = 0
+        self.pos = (0.0, 300.0)
+
+    @property
+    def position(self):
+        self.queries += 1
+        end = time.perf_counter() + ROUND_TRIP
+        while time.perf_counter() < end: pass
+        return self.pos
+
+
+def run(engine, clock, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        engine.advance((0, 0))
+        clock.sleep_until(engine.next_deadline)
+    return (time.perf_counter() - start) / ticks * 1e6
+
+
+def main(ticks=20000):
+    controller = SlowController()
+    clock = VirtualClock()
+    polled = ScrollEngine(ConfigStore(), RuntimeState(), lambda: controller.position, RecordingBackend(), clock=clock)
+    polled_us = run(polled, clock, ticks)
+    polled_queries = controller.queries
+
+    ring = MotionRing()
+    ring.push(0.0, 300.0)
+    controller.queries = 0
+    clock = VirtualClock()
+    buffered = ScrollEngine(ConfigStore(), RuntimeState(), ring.position, RecordingBackend(), clock=clock)
+    buffered_us = run(buffered, clock, ticks)
+
+    for i in range(1000): ring.push(i * 2.0, 300.0, t=i / 1000.0)
+    start = time.perf_counter()
+    for _ in range(2000): ring.velocity()
+    velocity_us = (time.perf_counter() - start) / 2000 * 1e6
+
+    result = {"polled_tick_us": polled_us, "polled_queries_per_tick": polled_queries / ticks,
+              "ring_tick_us": buffered_us, "ring_queries_per_tick": controller.queries / ticks,
+              "ring_velocity_us": velocity_us}
+    for name, value in result.items(): print(f"{name:<26} {value:8.3f}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# 输出后端：合并前后每秒注入的事件数，以及量化后输出总量是否守恒
+#   python benchmarks/bench_output.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.config import ConfigStore, RuntimeState
+from global_mouse.engine import ScrollEngine, VirtualClock
+
+
+def drive(backend, clock, tick_rate, distance, seconds=1.0):
+    store = ConfigStore()
+    store.update(tick_rate=tick_rate)
+    engine = ScrollEngine(store, RuntimeState(), lambda: (0, distance), backend, clock=clock)
+    end = clock.now() + seconds
+    while clock.now() < end:
+        engine.advance((0, 0))
+        clock.sleep_until(engine.next_deadline)
+    emitted = engine.emitted_y
+    engine.reset()
+    return emitted
+
+
+def main():
+    result = {}
+    # 以 Windows 的 1/120 格为单位，慢速 (死区外 40px) 与快速 (死区外 300px)
+    for label, distance in (("slow", 60), ("fast", 320)):
+        for tick_rate in (120, 1000):
+            clock = VirtualClock()
+            raw = RecordingBackend(120, clock=clock.now)
+            steps = drive(raw, clock, tick_rate, distance)
+            clock = VirtualClock()
+            merged = RecordingBackend(120, min_steps=8, max_delay=0.008, clock=clock.now)
+            drive(merged, clock, tick_rate, distance)
+            clock = VirtualClock()
+            whole = RecordingBackend(120, clock=clock.now)
+            whole.set_quantum(120)
+            drive(whole, clock, tick_rate, distance)
+            key = f"{label}_{tick_rate}hz"
+            result[f"{key}_events_raw"] = raw.events
+            result[f"{key}_events_coalesced"] = merged.events
+            result[f"{key}_events_whole_notch"] = whole.events
+            result[f"{key}_steps_lost_coalesced"] = abs(steps) - abs(merged.total_y)
+            result[f"{key}_steps_lost_whole_notch"] = abs(steps) - abs(whole.total_y)
+    for name, value in result.items(): print(f"{name:<40} {value:8d}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
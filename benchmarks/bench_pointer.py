@@ -0,0 +1,116 @@
+# 相对位移指针模式：在屏幕边缘激活时三种指针模式能达到的速度、屏幕中央激活时与绝对模式的输出是否一致，
+# 以及每 tick 读取虚拟位置的开销
+#   python benchmarks/bench_pointer.py        (有一项核对失败时退出码为 1)
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.config import ConfigStore, ConfigSnapshot, RuntimeState
+from global_mouse.engine import ScrollEngine, VirtualClock, POINTER_ABSOLUTE, POINTER_RECENTER, POINTER_CONFINE, POINTER_MODES
+from global_mouse.motion import MotionRing
+from global_mouse.pointer import RelativePointer
+from global_mouse.screens import Screen, ScreenIndex
+
+SCREENS = ScreenIndex([Screen("main", (0, 0, 1920, 1080), (0, 0, 1920, 1080), 1.0, 60.0)])
+
+
+# 模拟系统指针：手的移动与移回锚点都会被截断在屏幕范围内
+class ClampedController:
+    def __init__(self, pos):
+        self.x, self.y = pos
+
+    @property
+    def position(self):
+        return self.x, self.y
+
+    @position.setter
+    def position(self, pos):
+        self.x = min(max(pos[0], 0), 1919)
+        self.y = min(max(pos[1], 0), 1079)
+
+    def move(self, dx, dy):
+        self.position = (self.x + dx, self.y + dy)
+
+
+def run(mode, origin, hand, seconds=1.5, tick_rate=120):
+    # hand(t) 为每个 tick 手移动的像素 (dx, dy)；返回 (引擎, 指针, 控制器, 每 tick 的速度)
+    controller = ClampedController(origin)
+    clock = VirtualClock(0.0)
+    store = ConfigStore(ConfigSnapshot(pointer_mode=mode, tick_rate=tick_rate))
+    engine = ScrollEngine(store, RuntimeState(), lambda: controller.position, RecordingBackend(clock=clock.now), clock=clock)
+    pointer = engine.pointer = RelativePointer(controller, lambda: SCREENS)
+    engine.reset()
+    engine.begin_pointer(origin)
+    speeds = []
+    for i in range(int(seconds * tick_rate)):
+        now = i / tick_rate
+        controller.move(*hand(now))
+        engine.advance(origin, now, True)
+        speeds.append(abs(engine.vx) + abs(engine.vy))
+    return engine, pointer, controller, speeds
+
+
+def main():
+    failures = 0
+    results = {}
+
+    def check(label, ok):
+        nonlocal failures
+        if not ok:
+            failures += 1
+            print(f"FAIL {label}")
+
+    # 在右边缘 (离边缘 10px) 激活并一直向右移：绝对模式撞到边缘后距离不超过死区，完全不滚动
+    push = lambda t: (25, 0)
+    top = None
+    for mode in POINTER_MODES:
+        engine, pointer, controller, speeds = run(mode, (1910, 540), push)
+        top = engine.curve.evaluate(engine.curve.limit)
+        results[f"edge_{mode}"] = {"peak_speed": max(speeds), "curve_top_speed": top, "warps": pointer.warps,
+                                   "scrolled": engine.emitted_x}
+        print(f"边缘激活 {mode:<9} 最高速度 {max(speeds):9.1f} 格/秒 (曲线上限 {top:9.1f})  移回指针 {pointer.warps:4d} 次  "
+              f"指针 {controller.position}")
+        if mode == POINTER_ABSOLUTE:
+            check("absolute mode is stuck at the edge", max(speeds) == 0.0)
+        else:
+            check(f"{mode}: reaches the curve's top speed", abs(max(speeds) - top) < 1e-6 * top)
+            check(f"{mode}: pointer kept off the edge", 0 < controller.x < 1919)
+        if mode == POINTER_RECENTER:
+            # 往回拉：超出曲线范围的位移没有累积，第一个 tick 就开始减速
+            _, _, _, back = run(mode, (1910, 540), lambda t: (25, 0) if t < 1.2 else (-25, 0))
+            i = int(1.2 * 120)
+            check("recenter: slows down as soon as the hand reverses", back[i] < back[i - 1])
+
+    # 屏幕中央激活、移动不出屏幕：相对模式与绝对模式的输出逐 tick 一致
+    wiggle = lambda t: (6 if t < 0.5 else -4, 3 if t < 0.8 else -5)
+    reference = run(POINTER_ABSOLUTE, (960, 540), wiggle)[0].output.records
+    for mode in (POINTER_RECENTER, POINTER_CONFINE):
+        engine, pointer, _, _ = run(mode, (960, 540), wiggle)
+        same = engine.output.records == reference
+        results[f"center_{mode}"] = {"same_as_absolute": same, "warps": pointer.warps}
+        check(f"{mode}: same output as absolute mode away from the edges", same)
+        if mode == POINTER_CONFINE: check("confine: pointer not moved away from the edges", pointer.warps == 0)
+
+    # 开销：绝对模式读钩子环形缓冲 vs 相对模式 (每次都移回指针的最坏情况)
+    ring = MotionRing(); ring.push(960, 540)
+    controller = ClampedController((960, 540))
+    pointer = RelativePointer(controller, lambda: SCREENS)
+    pointer.begin((960, 540), POINTER_RECENTER)
+    def relative():
+        controller.x += 1
+        pointer.position(4116.0)
+    n = 50000
+    results["read_ring_ns"] = min(timeit.repeat(ring.position, number=n, repeat=5)) / n * 1e9
+    results["relative_ns"] = min(timeit.repeat(relative, number=n, repeat=5)) / n * 1e9
+    print(f"读取位置：环形缓冲 {results['read_ring_ns']:.0f} ns  相对位移 (含移回指针) {results['relative_ns']:.0f} ns")
+
+    results["failures"] = failures
+    print(f"{failures} 项核对失败")
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main()["failures"] else 0)
@@ -0,0 +1,57 @@
+# 会话录制：每次 advance 的额外开销、压缩后体积、回放速度与逐字节一致性
+#   python benchmarks/bench_recorder.py
+import os
+import sys
+import math
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.config import ConfigStore, RuntimeState
+from global_mouse.engine import ScrollEngine, VirtualClock
+from global_mouse.recorder import SessionRecorder, Session, pack, replay
+
+
+def drive(recorder, seconds, tick_rate):
+    store = ConfigStore()
+    store.update(tick_rate=tick_rate, inertia=True)
+    clock = VirtualClock()
+    # 指针在原点下方 40~280px 之间摆动，模拟一次真实的阅读滚动
+    engine = ScrollEngine(store, RuntimeState(), lambda: (0.0, 160.0 + 120.0 * math.sin(clock.now() * 2.0)),
+                          RecordingBackend(120, clock=clock.now), clock=clock)
+    engine.recorder = recorder
+    if recorder is not None: recorder.begin(engine, (0, 0))
+    start = time.perf_counter()
+    while clock.now() < seconds:
+        engine.advance((0, 0), active=clock.now() < seconds * 0.8)
+        clock.sleep_until(engine.next_deadline)
+    elapsed = time.perf_counter() - start
+    return elapsed / max(engine.ticks, 1) * 1e6
+
+
+def main(seconds=30.0, tick_rate=1000):
+    plain_us = drive(None, seconds, tick_rate)
+    recorder = SessionRecorder(capacity=int(seconds * tick_rate) + 16)
+    recorded_us = drive(recorder, seconds, tick_rate)
+    raw = len(pack(dict(recorder.header, samples=recorder.n, outputs=recorder.m, truncated=False),
+                   recorder.samples, recorder.outputs, recorder.n, recorder.m))
+    start = time.perf_counter()
+    blob = recorder.end()
+    compress_ms = (time.perf_counter() - start) * 1e3
+
+    session = Session.unpack(blob)
+    start = time.perf_counter()
+    replayed = replay(session)
+    replay_ms = (time.perf_counter() - start) * 1e3
+
+    result = {"tick_us": plain_us, "recorded_tick_us": recorded_us, "samples": session.header["samples"],
+              "raw_kb": raw / 1024, "compressed_kb": len(blob) / 1024, "compressed_kb_per_minute": len(blob) / 1024 * 60 / seconds,
+              "compress_ms": compress_ms, "replay_ms": replay_ms,
+              "replay_identical": int(replayed.output_bytes() == session.output_bytes())}
+    for name, value in result.items(): print(f"{name:<26} {value:10.3f}")
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# 屏幕布局索引：在合成的多屏布局上核对点/窗口 -> 屏幕查找、全屏判断、物理/逻辑坐标换算与刷新率，并测量查找开销
+#   python benchmarks/bench_screens.py            (有一项核对失败时退出码为 1)
+#   python benchmarks/bench_screens.py --check    (只做核对、不测开销，用作回归检查)
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_mouse.config import RuntimeState
+from global_mouse.foreground import WindowMonitor, FakeForegroundProvider
+from global_mouse.screens import Screen, ScreenIndex
+
+
+def windows_screen(name, x, y, width, height, scale, rate):
+    # 与 qt_screen_index() 在 Windows 上的换算相同：原点为物理坐标，Qt 给出的尺寸为逻辑像素
+    return Screen(name, (x, y, width, height), (x, y, width * scale, height * scale), scale, rate)
+
+
+def plain_screen(name, x, y, width, height, rate):
+    return Screen(name, (x, y, width, height), (x, y, width, height), 1.0, rate)
+
+
+# 合成布局：屏幕列表，第一项为主屏；核对项见 checks()
+LAYOUTS = {
+    "single_1080p": [plain_screen("main", 0, 0, 1920, 1080, 60.0)],
+    # 主屏 4K@150% (逻辑 2560x1440) 左侧是一块 1080p@100% 副屏，副屏在主屏左边 (负坐标)
+    "mixed_dpi": [windows_screen("4k", 0, 0, 2560, 1440, 1.5, 144.0), windows_screen("side", -1920, 200, 1920, 1080, 1.0, 60.0)],
+    # 副屏在主屏上方，两屏之间有一段空隙，外加一块竖屏
+    "stacked_gap": [plain_screen("main", 0, 0, 2560, 1440, 165.0), plain_screen("top", 320, -1200, 1920, 1080, 75.0),
+                    plain_screen("portrait", 2600, -400, 1080, 1920, 60.0)],
+}
+
+
+def checks(index, layout):
+    # 返回 [(描述, 实际, 期望)]
+    s = index.screens
+    if layout == "single_1080p":
+        return [
+            ("center -> main", index.at(960, 540).name, "main"),
+            ("outside -> None", index.at(2000, 100), None),
+            ("outside -> nearest", index.screen_at(2000, 100).name, "main"),
+            ("fullscreen window", index.covers((0, 0, 1920, 1080)), True),
+            ("maximized window (taskbar visible)", index.covers((-8, -8, 1928, 1040)), False),
+            ("rate", index.refresh_rate((10, 10)), 60.0),
+        ]
+    if layout == "mixed_dpi":
+        return [
+            ("physical point on 4k", index.at(3000, 1000).name, "4k"),
+            ("same point is off-screen in logical units", index.at(3000, 1000, physical=False), None),
+            ("side screen (negative x)", index.at(-100, 500).name, "side"),
+            ("gap above side screen -> nearest", index.screen_at(-500, 50).name, "side"),
+            ("fullscreen on 4k (physical)", index.covers((0, 0, 3840, 2160)), True),
+            ("fullscreen on side screen", index.covers((-1920, 200, 0, 1280)), True),
+            ("old primary-size check would miss 4k", index.covers((0, 0, 2560, 1440)), False),
+            ("window spanning both -> larger overlap", index.for_rect((-1000, 300, 400, 900)).name, "side"),
+            ("physical -> logical", index.to_logical(3840, 2160), (2560.0, 1440.0)),
+            ("logical -> physical", index.to_physical(1280, 720), (1920.0, 1080.0)),
+            ("side screen unscaled", index.to_logical(-960, 740), (-960.0, 740.0)),
+            ("rate on 4k", index.refresh_rate((100, 100)), 144.0),
+            ("rate on side", index.refresh_rate((-1000, 400)), 60.0),
+            ("control region round trip", ScreenIndex.from_rates(index.rates()).rates(), index.rates()),
+        ]
+    return [
+        ("top screen", index.at(500, -600).name, "top"),
+        ("gap between main and top -> nearest", index.screen_at(1000, -30).name, "main"),
+        ("portrait screen", index.at(3000, 1400).name, "portrait"),
+        ("fullscreen on portrait", index.covers((2600, -400, 3680, 1520)), True),
+        ("fullscreen on top", index.covers((320, -1200, 2240, -120)), True),
+        ("window off every screen -> nearest to centre", index.for_rect((-900, -900, -500, -600)).name, "top"),
+        ("rate on top", index.refresh_rate((400, -1000)), 75.0),
+        ("primary first", s[0].name, "main"),
+    ]
+
+
+def monitor_checks():
+    # WindowMonitor：没有全屏标志的窗口按当前屏幕布局判断，布局变化后 refresh() 重新判断
+    layout = [LAYOUTS["mixed_dpi"]]
+    state = RuntimeState()
+    provider = FakeForegroundProvider()
+    monitor = WindowMonitor(state, provider, lambda: ScreenIndex(layout[0]))
+    monitor.start()
+    provider.set_foreground("game", "Game.exe", (-1920, 200, 0, 1280))
+    on_side = state.window.fullscreen
+    layout[0] = LAYOUTS["mixed_dpi"][:1]            # 拔掉副屏：窗口不再覆盖任何屏幕
+    monitor.refresh()
+    unplugged = state.window.fullscreen
+    provider.set_foreground("player", "", None, True)   # 后端给出的全屏标志照用
+    return [("fullscreen on secondary", on_side, True), ("after unplug", unplugged, False),
+            ("provider flag kept", state.window.fullscreen, True)]
+
+
+def bench(fn, number=20000):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def verify():
+    # 返回全部核对失败的描述，空列表表示全部通过
+    failed = []
+    for name, screens in LAYOUTS.items():
+        failed += [f"{name}: {label}: {actual!r} != {expected!r}"
+                   for label, actual, expected in checks(ScreenIndex(screens), name) if actual != expected]
+    failed += [f"monitor: {label}: {actual!r} != {expected!r}" for label, actual, expected in monitor_checks() if actual != expected]
+    for line in failed: print(f"FAIL {line}")
+    return failed
+
+
+def main(check_only=False):
+    results = {}
+    failures = len(verify())
+    for name, screens in ([] if check_only else LAYOUTS.items()):
+        index = ScreenIndex(screens)
+        far = (screens[-1].physical[0] + 10, screens[-1].physical[1] + 10)
+        results[name] = {
+            "point_same_screen_ns": bench(lambda: index.at(10, 10)),
+            "point_other_screen_ns": bench(lambda: (index.at(10, 10), index.at(*far))) / 2,
+            "rect_ns": bench(lambda: index.for_rect((100, 100, 900, 700))),
+            "build_us": bench(lambda: ScreenIndex(screens), 2000) / 1e3,
+        }
+        r = results[name]
+        print(f"{name:<14} point {r['point_same_screen_ns']:6.0f} ns (alternating {r['point_other_screen_ns']:6.0f} ns)  "
+              f"rect {r['rect_ns']:6.0f} ns  build {r['build_us']:5.2f} us")
+    results["failures"] = failures
+    print(f"{failures} 项核对失败")
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main("--check" in sys.argv[1:])["failures"] else 0)
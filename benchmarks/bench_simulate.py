@@ -0,0 +1,87 @@
+# 离线批量模拟 (global_mouse.simulate)：与逐个组合驱动 ScrollEngine 的结果逐项核对，并比较两者的吞吐量
+#   python benchmarks/bench_simulate.py        (与引擎结果不一致时退出码为 1；未安装 numpy 时跳过)
+import os
+import sys
+import math
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.config import ConfigStore, ConfigSnapshot, RuntimeState
+from global_mouse.engine import ScrollEngine, VirtualClock, BASE_MULTIPLIER
+
+
+def reference(trace, snapshot, target, spu, tail):
+    # 用真正的 ScrollEngine 在虚拟时钟上逐 tick 推进 (每次都在截止时间醒来)，作为对照
+    import numpy as np
+    clock = VirtualClock(0.0)
+    pos = [0.0, 0.0]
+    output = RecordingBackend(spu, clock=clock.now)
+    engine = ScrollEngine(ConfigStore(snapshot), RuntimeState(), lambda: (pos[0], pos[1]), output, clock=clock)
+    engine.reset()
+    end = trace.duration()
+    peak2, reached, now = 0.0, None, 0.0
+    while now <= end + tail:
+        dx, dy, active = trace.sample(np.array([now]))
+        if not active[0] and not engine.gliding() and now > end: break
+        pos[0], pos[1] = float(dx[0]), float(dy[0])
+        engine.advance((0.0, 0.0), now, bool(active[0]))
+        peak2 = max(peak2, engine.vx * engine.vx + engine.vy * engine.vy)
+        if reached is None and engine.emitted_x ** 2 + engine.emitted_y ** 2 >= (target * spu) ** 2: reached = now
+        now = engine.next_deadline
+    path = sum(abs(sx) + abs(sy) for _, sx, sy in output.records)
+    return {"distance": path / spu, "net_x": engine.emitted_x / spu, "net_y": engine.emitted_y / spu,
+            "time_to_target": reached, "peak_speed": math.sqrt(peak2), "events": engine.emits}
+
+
+def main(traces=30, presets=(4, 4, 4), check=24):
+    from global_mouse import simulate
+    if simulate.np is None:
+        print(f"跳过：{simulate.NUMPY_HINT}")
+        return {"skipped": simulate.NUMPY_HINT}
+
+    trace_list = simulate.synthetic_traces()[:traces]
+    base = ConfigSnapshot(inertia=True)
+    sensitivities = [1.5 + 0.25 * i for i in range(presets[0])]
+    candidates = simulate.preset_grid(base, sensitivity=sensitivities, speed_factor=[0.5 + 0.5 * i for i in range(presets[1])],
+                                      dead_zone=[5 + 10 * i for i in range(presets[2])])
+    # 混入不同 tick 频率、关闭惯性与水平滚动的预设，覆盖分组与各条分支
+    candidates["tick_rate=240 inertia=false"] = base.replace(tick_rate=240, inertia=False)
+    candidates["horizontal=false bezier"] = base.replace(enable_horizontal=False, curve_type="bezier")
+    combos = len(trace_list) * len(candidates)
+
+    start = time.perf_counter()
+    rows = simulate.simulate(trace_list, candidates)
+    batch_s = time.perf_counter() - start
+
+    # 抽查若干组合：与引擎逐项一致 (浮点量允许 1e-9 的相对误差)
+    names = list(candidates)
+    step = max(1, len(rows) // check)
+    sample = rows[::step]
+    mismatches = 0
+    start = time.perf_counter()
+    by_name = {trace.name: trace for trace in trace_list}
+    for row in sample:
+        expected = reference(by_name[row["trace"]], candidates[row["preset"]], simulate.DEFAULT_TARGET, 1, simulate.DEFAULT_TAIL)
+        for key, value in expected.items():
+            got = row[key]
+            same = got == value if value is None or got is None else math.isclose(got, value, rel_tol=1e-9, abs_tol=1e-9)
+            if not same:
+                mismatches += 1
+                print(f"不一致 {row['trace']} / {row['preset']} {key}: 模拟 {got} 引擎 {value}")
+    engine_s = (time.perf_counter() - start) / len(sample)
+
+    result = {"combos": combos, "presets": len(names), "traces": len(trace_list), "batch_s": batch_s,
+              "batch_us_per_combo": batch_s / combos * 1e6, "engine_ms_per_combo": engine_s * 1e3,
+              "speedup": engine_s * combos / batch_s, "checked": len(sample), "mismatches": mismatches,
+              "base_multiplier": BASE_MULTIPLIER}
+    print(f"{combos} 个组合 ({len(trace_list)} 条轨迹 × {len(names)} 个预设)  批量 {batch_s:6.2f} s "
+          f"({result['batch_us_per_combo']:.1f} us/组合)  逐个驱动引擎 {engine_s * 1e3:.1f} ms/组合  "
+          f"加速 {result['speedup']:.0f}x  抽查 {len(sample)} 个，不一致 {mismatches} 项")
+    return result
+
+
+if __name__ == "__main__":
+    result = main()
+    sys.exit(1 if result.get("mismatches") else 0)
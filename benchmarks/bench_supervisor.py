@@ -0,0 +1,146 @@
+# 输出/输入后端持续失败时引擎线程的 CPU 占用与唤醒频率：不带监督器 (每个 tick 重试) vs EngineSupervisor (指数退避、重建后端)
+# 同时核对 CPU 是否有界，以及健康状态的变化 (running -> degraded -> running)、输出后端重建与反复崩溃后的 stopped：
+#   python benchmarks/bench_supervisor.py        (有一项核对失败时退出码为 1)
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.config import ConfigStore, RuntimeState
+from global_mouse.engine import ScrollEngine
+from global_mouse.supervisor import EngineSupervisor, HEALTH_RUNNING, HEALTH_DEGRADED, HEALTH_STOPPED, MAX_CRASHES
+
+CPU_LIMIT = 0.05                # 故障期间引擎线程平均占用不得超过单核的 5%
+
+
+# 模拟 "与显示服务器的连接断开"：断开期间注入滚动抛出异常；重建的后端共享同一个连接状态
+class Display:
+    def __init__(self):
+        self.broken = False
+        self.opened = 0
+
+
+class FailingBackend(RecordingBackend):
+    def __init__(self, display):
+        super().__init__()
+        self.display = display
+        display.opened += 1
+
+    def inject(self, sx, sy):
+        if self.display.broken: raise OSError("display connection lost")
+        super().inject(sx, sy)
+
+
+def thread_cpu(thread_id):
+    # 只统计引擎线程的 CPU 时间 (Linux 上读取线程时钟；其他平台退回整个进程的 CPU 时间)
+    if hasattr(time, "pthread_getcpuclockid"):
+        return lambda: time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    return time.process_time
+
+
+def run_case(supervised, fault, seconds):
+    display = Display()
+    state = RuntimeState()
+    position_broken = [False]
+    def get_position():
+        if position_broken[0]: raise OSError("cursor query failed")
+        return 0, 300
+    engine = ScrollEngine(ConfigStore(), state, get_position, FailingBackend(display))
+    health = []
+    if supervised:
+        supervisor = EngineSupervisor(engine, lambda: FailingBackend(display), on_health=health.append, name="bench_scroller")
+        supervisor.start()
+        thread = supervisor.thread
+    else:
+        supervisor = None
+        thread = threading.Thread(target=engine.run, name="bench_scroller", daemon=True)
+        thread.start()
+    cpu = thread_cpu(thread.ident) if hasattr(time, "pthread_getcpuclockid") else time.process_time
+
+    state.origin_pos = (0, 0); state.active = True; engine.notify()
+    time.sleep(0.05)
+    if fault == "output": display.broken = True
+    else: position_broken[0] = True
+    wakeups, cpu_start, start = engine.wakeups.count, cpu(), time.perf_counter()
+    time.sleep(seconds)
+    elapsed = time.perf_counter() - start
+    cpu_fraction = (cpu() - cpu_start) / elapsed
+    wakeups_per_second = (engine.wakeups.count - wakeups) / elapsed
+    health_during_fault = supervisor.health if supervisor is not None else None
+
+    # 故障恢复：从恢复到下一次成功输出的时间
+    display.broken = False; position_broken[0] = False
+    emits, restored = engine.emits, time.perf_counter()
+    while engine.emits == emits and time.perf_counter() - restored < 3.0: time.sleep(0.001)
+    recovery_ms = (time.perf_counter() - restored) * 1e3
+    time.sleep(0.02)
+    state.active = False; engine.notify()
+
+    result = {"cpu_fraction": cpu_fraction, "wakeups_per_second": wakeups_per_second, "recovery_ms": recovery_ms,
+              "bounded": cpu_fraction <= CPU_LIMIT}
+    if supervisor is not None:
+        info = supervisor.to_dict()
+        result.update(failures=info["failures"], output_restarts=info["output_restarts"], backends_opened=display.opened,
+                      health_transitions=health, health_during_fault=health_during_fault, final_health=supervisor.health)
+    return result
+
+
+def run_crashing():
+    # 引擎自身反复抛出未分类的异常 (代码错误)：崩溃 MAX_CRASHES 次以上后放弃，报告 stopped 并结束线程
+    engine = ScrollEngine(ConfigStore(), RuntimeState(), lambda: (0, 0), RecordingBackend())
+    calls = [0]
+    def broken_run():
+        calls[0] += 1
+        raise ZeroDivisionError("curve bug")
+    engine.run = broken_run
+    health = []
+    supervisor = EngineSupervisor(engine, on_health=health.append, name="bench_crashing")
+    supervisor.start()
+    supervisor.thread.join(5.0)
+    return {"runs": calls[0], "health_transitions": health, "thread_exited": not supervisor.thread.is_alive(),
+            "failures": supervisor.to_dict()["failures"]}
+
+
+def main(seconds=2.0):
+    results = {}
+    failures = 0
+
+    def check(label, ok):
+        nonlocal failures
+        if not ok:
+            failures += 1
+            print(f"FAIL {label}")
+
+    for fault in ("output", "position"):
+        for supervised in (False, True):
+            key = f"{fault}_{'supervised' if supervised else 'unsupervised'}"
+            r = results[key] = run_case(supervised, fault, seconds)
+            print(f"{key:<24} cpu {r['cpu_fraction'] * 100:6.2f}%  wakeups {r['wakeups_per_second']:7.1f}/s  "
+                  f"recovery {r['recovery_ms']:7.1f} ms  {'ok' if r['bounded'] else 'OVER LIMIT'}"
+                  + (f"  failures {r['failures']}  restarts {r['output_restarts']}  health {r['health_transitions']}" if supervised else ""))
+            if not supervised: continue
+            check(f"{key}: cpu bounded", r["bounded"])
+            check(f"{key}: degraded during the fault", r["health_during_fault"] == HEALTH_DEGRADED)
+            check(f"{key}: running -> degraded -> running", r["health_transitions"] == [HEALTH_RUNNING, HEALTH_DEGRADED, HEALTH_RUNNING])
+            check(f"{key}: scrolls again after recovery", r["recovery_ms"] < 3000.0)
+            if fault == "output":
+                check(f"{key}: output backend rebuilt", r["output_restarts"] >= 1 and r["backends_opened"] == r["output_restarts"] + 1)
+            else:
+                check(f"{key}: output backend left alone", r["output_restarts"] == 0 and r["backends_opened"] == 1)
+    supervised = [r for key, r in results.items() if key.endswith("_supervised")]
+    results["supervised_bounded"] = all(r["bounded"] and r["final_health"] == HEALTH_RUNNING for r in supervised)
+
+    r = results["crashing"] = run_crashing()
+    print(f"crashing                 runs {r['runs']}  health {r['health_transitions']}  failures {r['failures']}")
+    check("crashing: gives up after MAX_CRASHES", r["runs"] == MAX_CRASHES + 1 and r["thread_exited"])
+    check("crashing: running -> degraded -> stopped", r["health_transitions"] == [HEALTH_RUNNING, HEALTH_DEGRADED, HEALTH_STOPPED])
+    results["failures"] = failures
+    print(f"{failures} 项核对失败")
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main()["failures"] else 0)
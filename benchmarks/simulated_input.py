@@ -0,0 +1,84 @@
+# 模拟的 pynput：不挂系统钩子、不注入事件，供无显示环境下的基准套件驱动 main.py
+# install() 必须在 import main 之前调用
+import sys
+import enum
+import types
+
+
+class Button(enum.Enum):
+    left = 1
+    right = 2
+    middle = 3
+
+
+class Controller:
+    def __init__(self):
+        self.pos = (0, 0)
+        self.queries = 0
+        self.scrolls = 0
+        self.total = [0.0, 0.0]
+
+    @property
+    def position(self):
+        self.queries += 1
+        return self.pos
+
+    @position.setter
+    def position(self, pos):
+        self.pos = pos
+
+    def scroll(self, dx, dy):
+        self.scrolls += 1
+        self.total[0] += dx
+        self.total[1] += dy
+
+
+# 监听器只保存回调；基准直接调用 on_click / on_move / on_press 模拟钩子线程
+class Listener:
+    def __init__(self, **callbacks):
+        self.callbacks = callbacks
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def join(self, timeout=None):
+        pass
+
+
+class Key(enum.Enum):
+    alt = 1; alt_l = 2; alt_r = 3; alt_gr = 4
+    ctrl = 5; ctrl_l = 6; ctrl_r = 7
+    shift = 8; shift_l = 9; shift_r = 10
+    cmd = 11; cmd_l = 12; cmd_r = 13
+    space = 14; enter = 15; backspace = 16; tab = 17; esc = 18
+    f1 = 21; f2 = 22; f3 = 23; f4 = 24; page_up = 25; page_down = 26
+
+
+class KeyCode:
+    def __init__(self, vk=None, char=None):
+        self.vk = vk
+        self.char = char
+
+    @classmethod
+    def from_char(cls, char):
+        return cls(vk=ord(char.upper()), char=char)
+
+    def __eq__(self, other):
+        return isinstance(other, KeyCode) and (self.vk, self.char) == (other.vk, other.char)
+
+    def __hash__(self):
+        return hash((self.vk, self.char))
+
+
+def install():
+    package = types.ModuleType("pynput")
+    mouse = types.ModuleType("pynput.mouse")
+    keyboard = types.ModuleType("pynput.keyboard")
+    mouse.Button, mouse.Controller, mouse.Listener = Button, Controller, Listener
+    keyboard.Key, keyboard.KeyCode, keyboard.Listener = Key, KeyCode, Listener
+    package.mouse, package.keyboard = mouse, keyboard
+    sys.modules.update({"pynput": package, "pynput.mouse": mouse, "pynput.keyboard": keyboard})
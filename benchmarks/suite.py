@@ -0,0 +1,559 @@
+# 无显示环境下的完整基准套件：Qt offscreen + 模拟 pynput 输入/输出，结果写成 JSON 便于版本间对比
+#   python benchmarks/suite.py -o results.json          # 全部测量
+#   python benchmarks/suite.py --quick --only engine,hooks
+#   python benchmarks/suite.py --compare old.json new.json
+import os
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.config import ConfigStore, RuntimeState
+from global_mouse.curves import CURVE_TYPES, DEFAULT_CURVE_PARAMS
+from global_mouse.diagnostics import wakeup_counts
+from global_mouse.engine import ScrollEngine, MonotonicClock, VirtualClock, TICK_RATES
+
+import bench_app_presets
+import bench_clicks
+import bench_config
+import bench_curve
+import bench_filter
+import bench_idle
+import bench_motion
+import bench_output
+import bench_pointer
+import bench_recorder
+import bench_screens
+import bench_simulate
+import bench_supervisor
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values: return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def summarize(samples, scale=1e6):
+    # 样本 (秒) -> 微秒统计
+    return {"mean": sum(samples) / len(samples) * scale, "p50": percentile(samples, 0.5) * scale,
+            "p99": percentile(samples, 0.99) * scale, "max": max(samples) * scale, "count": len(samples)}
+
+
+# --- 引擎：每 tick 开销 (虚拟时钟，不含睡眠) ---
+def bench_engine(quick):
+    ticks = 5000 if quick else 50000
+    result = {}
+    for curve_type in CURVE_TYPES:
+        for inertia in (False, True):
+            store = ConfigStore()
+            store.update(curve_type=curve_type, curve_params=DEFAULT_CURVE_PARAMS[curve_type], inertia=inertia)
+            clock = VirtualClock()
+            pos = [0.0, 300.0]
+            engine = ScrollEngine(store, RuntimeState(), lambda: pos, RecordingBackend(120, clock=clock.now), clock=clock)
+            start = time.perf_counter()
+            for i in range(ticks):
+                # 每 500 tick 回到死区一次，让惯性分支也被计入
+                pos[1] = 0.0 if i % 500 > 400 else 300.0
+                engine.advance((0, 0))
+                clock.sleep_until(engine.next_deadline)
+            key = f"{curve_type}_inertia" if inertia else curve_type
+            result[f"{key}_tick_us"] = (time.perf_counter() - start) / ticks * 1e6
+    return result
+
+
+# --- 引擎：真实时钟下各目标频率的唤醒迟到 (抖动) ---
+class LatenessClock(MonotonicClock):
+    def __init__(self):
+        self.lateness = []
+
+    def sleep_until(self, deadline):
+        MonotonicClock.sleep_until(self, deadline)
+        self.lateness.append(time.perf_counter() - deadline)
+
+
+def bench_jitter(quick):
+    seconds = 0.5 if quick else 2.0
+    result = {}
+    for rate in TICK_RATES:
+        store = ConfigStore()
+        store.update(tick_rate=rate)
+        state = RuntimeState()
+        clock = LatenessClock()
+        engine = ScrollEngine(store, state, lambda: (0, 300), RecordingBackend(), clock=clock)
+        threading.Thread(target=engine.run, daemon=True).start()
+        state.origin_pos = (0, 0); state.active = True; engine.notify()
+        time.sleep(seconds)
+        state.active = False
+        time.sleep(0.05)
+        lateness = clock.lateness[1:]
+        stats = summarize(lateness)
+        result[f"{rate}hz"] = {"lateness_p50_us": stats["p50"], "lateness_p99_us": stats["p99"],
+                               "lateness_max_us": stats["max"], "ticks": engine.ticks,
+                               "dropped_ticks": engine.dropped_ticks}
+    return result
+
+
+# --- 输入钩子与空闲开销：在 offscreen Qt 中构建真实的 MainWindow ---
+def make_gui():
+    import simulated_input
+    simulated_input.install()
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # 配置文件和控制通道都放进临时目录，不碰用户自己的预设，也不会连上正在运行的后台实例
+    home = tempfile.mkdtemp(prefix="global_mouse_bench_")
+    os.environ["HOME"] = os.environ["USERPROFILE"] = os.environ["XDG_RUNTIME_DIR"] = home
+    os.environ["USERNAME"] = "global_mouse_bench"
+
+    from PySide6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    import main as gui
+    from global_mouse.foreground import FakeForegroundProvider
+    provider = FakeForegroundProvider()
+    gui.default_provider = lambda: provider
+    gui.default_backend = lambda controller: RecordingBackend(120)
+    window = gui.MainWindow()
+    app.processEvents()
+    return app, gui, window, provider
+
+
+def run_in_hook_thread(fn):
+    # 真实回调运行在钩子线程里，跨线程发出的 Qt 信号走排队连接
+    box = []
+    thread = threading.Thread(target=lambda: box.append(fn()))
+    thread.start(); thread.join()
+    return box[0]
+
+
+def bench_hooks(quick, gui_parts):
+    app, gui, window, provider = gui_parts
+    clicks = 300 if quick else 3000
+    keystrokes = 5000 if quick else 50000
+    Button = gui.mouse.Button
+    rng = random.Random(42)
+    rules = bench_filter.make_rules(1000, rng)
+    result = {}
+
+    for rule_count in (0, 100, 1000):
+        gui.config.update(filter_mode=1 if rule_count else 0, filter_list=rules[:rule_count])
+        for cached in (True, False):
+            def clicks_loop():
+                samples = []
+                for i in range(clicks):
+                    title = "main.py - Visual Studio Code" if cached else f"Document {i} - Editor"
+                    provider.set_foreground(title, "Chrome_WidgetWin_1")
+                    start = time.perf_counter()
+                    window.on_click(400, 300, Button.middle, True)
+                    samples.append(time.perf_counter() - start)
+                    window.on_click(400, 300, Button.middle, False)
+                    window.on_click(400, 300, Button.middle, True)
+                    window.on_click(400, 300, Button.middle, False)
+                return samples
+            stats = summarize(run_in_hook_thread(clicks_loop))
+            app.processEvents()
+            result[f"on_click_{rule_count}_rules_{'cached' if cached else 'uncached'}"] = stats
+
+    def moves_loop():
+        samples = []
+        for i in range(clicks * 10):
+            start = time.perf_counter()
+            window.on_move(i % 1920, 300)
+            samples.append(time.perf_counter() - start)
+        return samples
+    result["on_move"] = summarize(run_in_hook_thread(moves_loop))
+
+    gui.config.update(hotkeys={"toggle_pause": "Ctrl+Alt+P", "cycle_curve": "Ctrl+Alt+C"})
+    window.refresh_hotkeys()
+    keys = window.key_manager
+    from pynput.keyboard import Key, KeyCode
+    letters = [KeyCode.from_char(ch) for ch in "abcdefghijklmnopqrstuvwxyz"]
+
+    def typing_loop():
+        samples = []
+        for i in range(keystrokes):
+            key = letters[i % len(letters)]
+            start = time.perf_counter()
+            keys.on_press(key)
+            samples.append(time.perf_counter() - start)
+            keys.on_release(key)
+        return samples
+
+    def chord_loop():
+        # 按住 Ctrl+Alt 再敲未绑定的字母：每次都要做一次完整的组合键查表
+        samples = []
+        keys.on_press(Key.ctrl_l); keys.on_press(Key.alt_l)
+        for i in range(keystrokes):
+            key = letters[i % len(letters)]
+            if key.char in "pc": continue
+            start = time.perf_counter()
+            keys.on_press(key)
+            samples.append(time.perf_counter() - start)
+            keys.on_release(key)
+        keys.on_release(Key.alt_l); keys.on_release(Key.ctrl_l)
+        return samples
+
+    result["on_press_typing"] = summarize(run_in_hook_thread(typing_loop))
+    result["on_press_chord"] = summarize(run_in_hook_thread(chord_loop))
+    app.processEvents()
+    return result
+
+
+# --- 悬浮图标：每次重绘耗时 (逐帧矢量绘制 vs 位图缓存) 与方向抖动时的重绘次数 ---
+def bench_overlay(quick, gui_parts):
+    app, gui = gui_parts[0], gui_parts[1]
+    paints = 200 if quick else 2000
+    seconds = 0.3 if quick else 1.0
+
+    class LegacyOverlay(gui.ResizableOverlay):
+        # 改动前的行为：每次 paintEvent 重新绘制路径，每次方向变化都请求重绘
+        def paintEvent(self, event):
+            self.repaints += 1
+            p = QPainter(self); self.draw_state(p, self.direction); p.end()
+
+        def set_direction(self, direction, immediate=False):
+            if self.direction != direction:
+                self.direction = direction; self.update()
+
+    from PySide6.QtGui import QPainter
+    directions = ("neutral", "up", "down", "left", "right")
+    result = {}
+    for name, cls in (("legacy", LegacyOverlay), ("cached", gui.ResizableOverlay)):
+        for size in (60, 120):
+            overlay = cls()
+            overlay.update_geometry(size)
+            overlay.show(); app.processEvents()
+            samples = []
+            for i in range(paints):
+                overlay.direction = directions[i % len(directions)]
+                start = time.perf_counter()
+                overlay.repaint()
+                samples.append(time.perf_counter() - start)
+            result[f"{name}_{size}px_paint"] = summarize(samples)
+            overlay.hide(); overlay.deleteLater()
+
+        # 方向每毫秒在上/右之间来回切换 (在对角线附近抖动)，统计实际重绘次数
+        overlay = cls()
+        overlay.show(); app.processEvents()
+        overlay.repaints = 0
+        changes, end = 0, time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            overlay.set_direction("up" if changes % 2 else "right")
+            changes += 1
+            app.processEvents()
+            time.sleep(0.001)
+        result[f"{name}_repaints_per_second"] = overlay.repaints / seconds
+        overlay.hide(); overlay.deleteLater()
+    result["direction_changes_per_second"] = changes / seconds
+    app.processEvents()
+    return result
+
+
+# --- 界面更新总线：脚本化会话中投递给 GUI 线程的事件数 ---
+# 钩子线程让光标在死区边界上、再在对角线附近抖动 (每毫秒一个样本)，随后在 GUI 线程拖动 "UI 大小" 滑块
+# 分别关闭/开启方向回差各跑一遍；posts 为旧版会逐个发出的信号数，metacall_events 为实际投递到 GUI 线程的排队事件
+def bench_uibus(quick, gui_parts):
+    app, gui, window = gui_parts[0], gui_parts[1], gui_parts[2]
+    from PySide6.QtCore import QObject, QEvent
+    samples = 500 if quick else 3000
+    Button = gui.mouse.Button
+    window.ensure_ui()
+    slider = window.ui_sliders["overlay_size"][0]
+    dead_zone = gui.config.snapshot.dead_zone
+
+    class EventCounter(QObject):
+        def __init__(self):
+            super().__init__(); self.count = 0
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.MetaCall: self.count += 1
+            return False
+
+    def hook_script(rng):
+        window.on_move(400, 300); window.on_click(400, 300, Button.middle, True)
+        for i in range(samples):
+            if i < samples // 2: dx, dy = rng.uniform(-1, 1), dead_zone + rng.uniform(-2, 2)
+            else: d = rng.uniform(-4, 4); dx, dy = 60 + d, 60 - d
+            window.on_move(400 + dx, 300 + dy)
+            time.sleep(0.001)
+        window.on_click(400, 300, Button.middle, True)
+
+    result = {}
+    for name, hysteresis, axis in (("no_hysteresis", 0.0, 1.0), ("hysteresis", window.engine.hysteresis, window.engine.axis_hysteresis)):
+        window.engine.hysteresis, window.engine.axis_hysteresis = hysteresis, axis
+        app.processEvents()
+        counter = EventCounter(); app.installEventFilter(counter)
+        bus_before = window.ui_bus.counts()
+        window.overlay.repaints = 0
+        thread = threading.Thread(target=hook_script, args=(random.Random(7),))
+        thread.start()
+        while thread.is_alive(): app.processEvents(); time.sleep(0.001)
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline: app.processEvents(); time.sleep(0.005)
+        hook_posts = window.ui_bus.posts - bus_before["posts"]
+        for value in list(range(30, 151)) + list(range(150, 59, -1)):
+            slider.setValue(value); app.processEvents(); time.sleep(0.001)
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline: app.processEvents(); time.sleep(0.005)
+        app.removeEventFilter(counter)
+        counts = {key: value - bus_before[key] for key, value in window.ui_bus.counts().items()}
+        result[name] = {"hook_posts": hook_posts, "slider_posts": counts["posts"] - hook_posts, "wakes": counts["wakes"],
+                        "applied": counts["takes"], "metacall_events": counter.count, "overlay_repaints": window.overlay.repaints}
+    window.overlay.hide(); app.processEvents()
+    return result
+
+
+# --- 界面繁忙时的 tick 抖动：引擎在界面进程的线程里 vs 独立引擎进程 ---
+# 负载在 GUI 线程上：整窗重绘 + 编码一份大配置 (与保存预设时相同的 JSON 序列化)，两者都要持有 GIL
+ENGINE_CHILD_SCRIPT = ("import sys; sys.path.insert(0, {bench!r}); sys.path.insert(0, {root!r}); import simulated_input; "
+                       "simulated_input.install(); import global_mouse.engine_process as ep\n"
+                       "class Child(ep.EngineChild):\n"
+                       "    def start(self):\n"
+                       "        super().start(); Button = sys.modules['pynput.mouse'].Button\n"
+                       "        self.on_move(400, 300); self.on_click(400, 300, Button.middle, True); self.on_move(400, 600)\n"
+                       "ep.EngineChild = Child\n"
+                       "sys.exit(ep.main([{name!r}]))")
+
+
+def gui_load(app, window, seconds, data):
+    from global_mouse.persistence import encode
+    window.show()
+    frames, deadline = 0, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        window.grab(); encode(data); app.processEvents()
+        frames += 1
+    return frames
+
+
+def jitter_summary(window, ticks_before, dropped_before, frames, seconds):
+    h = window.latency_stats.tick_jitter
+    if window.engine_process is not None:
+        window.sync_engine_stats(timeout=0.5)
+        counters = window.engine_process.read_stats(timeout=0.5)["counters"]
+        ticks, dropped = counters["ticks"], counters["dropped_ticks"]
+    else:
+        ticks, dropped = window.engine.ticks, window.engine.dropped_ticks
+    return {"jitter_p50_ms": h.percentile(0.5) * 1e3, "jitter_p99_ms": h.percentile(0.99) * 1e3, "jitter_max_ms": h.max * 1e3,
+            "samples": h.count, "ticks": ticks - ticks_before, "dropped_ticks": dropped - dropped_before,
+            "gui_frames_per_second": frames / seconds}
+
+
+def bench_process(quick, gui_parts):
+    app, gui, window = gui_parts[0], gui_parts[1], gui_parts[2]
+    import global_mouse.engine_process as engine_process
+    seconds = 1.0 if quick else 5.0
+    data = bench_config.make_config(200, 100, random.Random(42))
+    Button = gui.mouse.Button
+    result = {}
+
+    def measure(target, loaded, counters):
+        target.latency_stats.reset()
+        if target.engine_process is not None: target.engine_process.reset_stats()
+        frames = gui_load(app, target, seconds, data) if loaded else 0
+        if not loaded:
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline: app.processEvents(); time.sleep(0.01)
+        return jitter_summary(target, *counters(), frames, seconds)
+
+    # 引擎线程与 GUI 在同一进程
+    window.set_instrumentation(True)
+    window.on_move(400, 300); window.on_click(400, 300, Button.middle, True); window.on_move(400, 600)
+    time.sleep(0.05)
+    counters = lambda: (window.engine.ticks, window.engine.dropped_ticks)
+    for loaded in (False, True):
+        before = counters()
+        result[f"threaded_{'loaded' if loaded else 'idle'}"] = measure(window, loaded, lambda: before)
+    window.on_click(400, 600, Button.middle, True)
+    window.set_instrumentation(False)
+    window.hide(); app.processEvents()
+
+    # 独立引擎进程：子进程使用模拟输入，启动后自行激活滚动
+    bench_dir = os.path.dirname(os.path.abspath(__file__))
+    default_command = engine_process.default_command
+    engine_process.default_command = lambda name: [sys.executable, "-c", ENGINE_CHILD_SCRIPT.format(bench=bench_dir, root=ROOT, name=name)]
+    load_presets = gui.MainWindow.load_presets_from_file
+    gui.MainWindow.load_presets_from_file = lambda self: None
+    gui.config.update(engine_process=True)
+    try:
+        split = gui.MainWindow()
+        deadline = time.perf_counter() + 10.0
+        while not gui.state.active and time.perf_counter() < deadline: app.processEvents(); time.sleep(0.01)
+        split.set_instrumentation(True)
+        time.sleep(0.05)
+        def counters():
+            values = split.engine_process.read_stats(timeout=0.5)["counters"]
+            return values["ticks"], values["dropped_ticks"]
+        for loaded in (False, True):
+            before = counters()
+            result[f"process_{'loaded' if loaded else 'idle'}"] = measure(split, loaded, lambda: before)
+        split.hide()
+        split.engine_process.close(); split.engine_process = None
+    finally:
+        engine_process.default_command = default_command
+        gui.MainWindow.load_presets_from_file = load_presets
+        gui.config.update(engine_process=False)
+        gui.state.active = False
+    app.processEvents()
+    return result
+
+
+def bench_gui_idle(quick, gui_parts):
+    # 运行真实的 Qt 事件循环一段时间，统计各线程唤醒次数与进程 CPU 占用
+    from PySide6.QtCore import QTimer
+    app = gui_parts[0]
+    seconds = 2.0 if quick else 10.0
+    before_counts, before_cpu, before_wall = wakeup_counts(), time.process_time(), time.perf_counter()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+    wall = time.perf_counter() - before_wall
+    counts = wakeup_counts()
+    rates = {name: (count - before_counts.get(name, 0)) * 60.0 / wall for name, count in counts.items()}
+    return {"cpu_percent": (time.process_time() - before_cpu) / wall * 100.0,
+            "wakeups_per_minute": rates, "total_wakeups_per_minute": sum(rates.values()), "seconds": wall}
+
+
+# --- 启动耗时与内存：在子进程中运行 --startup-report，分别测正常启动、最小化启动与无界面后台实例 ---
+STARTUP_SCRIPT = ("import sys, runpy; sys.path.insert(0, {bench!r}); import simulated_input; simulated_input.install(); "
+                  "sys.argv = ['main.py', '--startup-report']; runpy.run_path({main!r}, run_name='__main__')")
+HEADLESS_SCRIPT = ("import sys, runpy; sys.path.insert(0, {bench!r}); import simulated_input; simulated_input.install(); "
+                   "sys.argv = ['daemon', '--startup-report']; runpy.run_module('global_mouse.daemon', run_name='__main__')")
+
+
+def bench_startup(quick):
+    runs = 3 if quick else 10
+    bench_dir = os.path.dirname(os.path.abspath(__file__))
+    variants = (("shown", STARTUP_SCRIPT, False), ("minimized", STARTUP_SCRIPT, True), ("headless", HEADLESS_SCRIPT, True))
+    result = {}
+    for name, template, minimized in variants:
+        script = template.format(bench=bench_dir, main=os.path.join(ROOT, "main.py"))
+        home = tempfile.mkdtemp(prefix="global_mouse_startup_")
+        with open(os.path.join(home, ".global_mouse_config.json"), "w", encoding="utf-8") as f:
+            json.dump({"presets": {"默认": {"start_minimized": minimized}}, "last_used": "默认"}, f)
+        env = dict(os.environ, HOME=home, USERPROFILE=home, XDG_RUNTIME_DIR=home, USERNAME="global_mouse_bench",
+                   QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+        reports, walls = [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            proc = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+            walls.append(time.perf_counter() - start)
+            reports.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        phases = {name: percentile([r["phases"][name] for r in reports], 0.5) * 1e3 for name in reports[0]["phases"]}
+        deferred = {name: percentile([r["deferred"][name] for r in reports], 0.5) * 1e3 for name in reports[0]["deferred"]}
+        result[name] = {
+            "phases_ms": phases, "deferred_ms": deferred,
+            "total_ms": percentile([r["total"] for r in reports], 0.5) * 1e3,
+            "process_wall_ms": percentile(walls, 0.5) * 1e3,
+            "max_rss_kb": percentile([r["max_rss_kb"] or 0 for r in reports], 0.5)}
+    return result
+
+
+# --- 原有的单项基准 (安静运行，只收集返回值) ---
+def legacy_sections(quick):
+    return {
+        "curve": lambda: bench_curve.main(number=20000 if quick else 200000),
+        "filter": lambda: bench_filter.main(),
+        "motion": lambda: bench_motion.main(ticks=2000 if quick else 20000),
+        "output": lambda: bench_output.main(),
+        "recorder": lambda: bench_recorder.main(seconds=5.0 if quick else 30.0),
+        "config": lambda: bench_config.main(sizes=((10, 100), (200, 100)) if quick else ((10, 100), (200, 100), (500, 1000))),
+        "clicks": lambda: bench_clicks.main(clicks=300 if quick else 2000),
+        "supervisor": lambda: bench_supervisor.main(seconds=0.5 if quick else 2.0),
+        "app_presets": lambda: bench_app_presets.main(sizes=(10,) if quick else (10, 100)),
+        "screens": lambda: bench_screens.main(),
+        "pointer": lambda: bench_pointer.main(),
+        "simulate": lambda: bench_simulate.main(traces=10 if quick else 30, check=8 if quick else 24),
+        "engine_idle": lambda: bench_idle.main(idle_seconds=0.5 if quick else 2.0, activations=10 if quick else 50),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run(only=None, quick=False):
+    sections = dict(legacy_sections(quick))
+    sections["engine"] = lambda: bench_engine(quick)
+    sections["jitter"] = lambda: bench_jitter(quick)
+    sections["startup"] = lambda: bench_startup(quick)
+    gui_parts = []
+
+    def with_gui(fn):
+        def call():
+            if not gui_parts: gui_parts.extend(make_gui())
+            return fn(quick, gui_parts)
+        return call
+    sections["hooks"] = with_gui(bench_hooks)
+    sections["overlay"] = with_gui(bench_overlay)
+    sections["uibus"] = with_gui(bench_uibus)
+    sections["process"] = with_gui(bench_process)
+    sections["gui_idle"] = with_gui(bench_gui_idle)
+
+    results = {}
+    for name, fn in sections.items():
+        if only and name not in only: continue
+        print(f"running {name} ...", file=sys.stderr)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = fn()
+    return {"meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": git_revision(), "quick": quick,
+                     "python": platform.python_version(), "platform": platform.platform(),
+                     "machine": platform.machine()},
+            "results": results}
+
+
+def flatten(data, prefix=""):
+    items = {}
+    for key, value in data.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict): items.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool): items[name] = value
+    return items
+
+
+def compare(old_path, new_path, threshold):
+    # 数值全部是 "越小越好" 的耗时/次数；变化超过阈值的行加上标记
+    with open(old_path, encoding="utf-8") as f: old = flatten(json.load(f)["results"])
+    with open(new_path, encoding="utf-8") as f: new = flatten(json.load(f)["results"])
+    regressions = 0
+    for name in sorted(set(old) & set(new)):
+        a, b = old[name], new[name]
+        ratio = b / a if a else (1.0 if not b else float("inf"))
+        mark = "  REGRESSION" if ratio > 1 + threshold else ("  improved" if ratio < 1 - threshold else "")
+        regressions += mark == "  REGRESSION"
+        print(f"{name:<60} {a:12.3f} {b:12.3f} {ratio:7.2f}x{mark}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Global Mouse 基准套件")
+    parser.add_argument("-o", "--output", help="结果 JSON 路径 (默认输出到 stdout)")
+    parser.add_argument("--quick", action="store_true", help="缩短每项测量，用于快速检查")
+    parser.add_argument("--only", help="只运行指定的项，逗号分隔")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="对比两份结果 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="对比时标记的变化比例 (默认 0.2)")
+    args = parser.parse_args(argv)
+
+    if args.compare: return 1 if compare(*args.compare, args.threshold) else 0
+    report = run(set(args.only.split(",")) if args.only else None, args.quick)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f: f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# 与 Qt / pynput 无关的核心逻辑，可在无显示环境下导入、测试与基准测量
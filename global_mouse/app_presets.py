@@ -0,0 +1,119 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import threading
+from collections import OrderedDict
+
+from global_mouse.config import CURVE_FIELDS
+from global_mouse.filters import AppFilter, FILTER_WHITELIST, VERDICT_CACHE_SIZE
+
+# 按应用切换时只替换与滚动手感有关的参数；过滤名单、快捷键、界面设置等仍以手动选择的预设为准
+PROFILE_FIELDS = CURVE_FIELDS + ("tick_rate", "pacing", "inertia", "friction", "glide_cutoff", "enable_horizontal", "pointer_mode")
+RULE_SEPARATOR = "=>"
+APP_PRESET_HELP = ("每行一条：规则 => 预设名，从上到下第一条匹配的生效\n"
+                   "class:Code.exe => 编程\n"
+                   "glob:*AutoCAD* => CAD\n"
+                   "规则语法与过滤名单相同；都不匹配时使用手动选择的预设")
+
+
+def parse_app_rules(lines):
+    # 返回 [(规则, 预设名)]；格式不对的行跳过
+    rules = []
+    for line in lines:
+        rule, sep, name = line.partition(RULE_SEPARATOR)
+        rule, name = rule.strip(), name.strip()
+        if sep and rule and name: rules.append((rule, name))
+    return rules
+
+
+def preset_profiles(presets):
+    # {预设名: 预设 dict} -> {预设名: 只含 PROFILE_FIELDS 的 dict}，引擎子进程与界面进程之间只传这一份
+    return {name: {field: data[field] for field in PROFILE_FIELDS if field in data} for name, data in presets.items()}
+
+
+# --- 规则查找 ---
+# 每条规则编译成一个只含该规则的白名单过滤器，按顺序取第一条匹配；结果按窗口 (标题, 类名) 缓存，切回同一窗口只查一次字典
+class PresetRules:
+    def __init__(self, rules=(), cache_size=VERDICT_CACHE_SIZE):
+        self.rules = [(AppFilter(FILTER_WHITELIST, [rule], False, False, cache_size=0), name) for rule, name in rules]
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, title, window_class):
+        key = (title, window_class)
+        cache = self.cache
+        if key in cache:
+            self.hits += 1
+            cache.move_to_end(key)
+            return cache[key]
+        self.misses += 1
+        name = next((name for rule, name in self.rules if rule.matches(title, window_class)), None)
+        cache[key] = name
+        if len(cache) > self.cache_size: cache.popitem(last=False)
+        return name
+
+
+# --- 按前台应用切换预设 ---
+# 作为引擎的配置来源 (.snapshot)：没有规则命中时就是 store.snapshot，命中时是 "当前配置 + 该预设的滚动参数" 合成的快照
+# 只在前台窗口变化 (WindowMonitor 回调线程) 与配置/规则/预设变化时重新解析，点击与 tick 只读 .snapshot 引用
+# 合成的快照按预设名缓存，基础配置变化时清空；不写配置文件，也不碰界面控件
+# on_switch(name) 在解析结果变化时调用，name 为 None 表示回到手动选择的预设
+class AppPresetSwitcher:
+    def __init__(self, store, state, on_switch=None):
+        self.store = store
+        self.state = state
+        self.on_switch = on_switch
+        self.lock = threading.Lock()
+        self.rules = PresetRules()
+        self.rule_lines = ()
+        self.profiles = {}
+        self.merged = {}
+        self.base = store.snapshot
+        self.snapshot = store.snapshot
+        self.active = None
+        self.switches = 0
+        self.on_config_changed(None, store.snapshot)
+        store.subscribe(self.on_config_changed)
+
+    def set_profiles(self, profiles):
+        # profiles 由 preset_profiles() 生成；预设保存/删除/重新加载后调用
+        with self.lock:
+            self.profiles = dict(profiles)
+            self.merged = {}
+        self.apply()
+
+    def on_config_changed(self, old, new):
+        with self.lock:
+            if new.app_presets != self.rule_lines:
+                self.rule_lines = new.app_presets
+                self.rules = PresetRules(parse_app_rules(new.app_presets))
+        self.apply()
+
+    def on_foreground_changed(self, window):
+        self.apply(window)
+
+    def apply(self, window=None):
+        if window is None: window = self.state.window
+        with self.lock:
+            base = self.store.snapshot
+            if base is not self.base:
+                self.base = base
+                self.merged = {}
+            name = self.rules.resolve(window.title, window.window_class)
+            if name not in self.profiles: name = None
+            snapshot = base
+            if name is not None:
+                snapshot = self.merged.get(name)
+                if snapshot is None:
+                    snapshot = self.merged[name] = base.replace(**self.profiles[name])
+            self.snapshot = snapshot
+            changed, self.active = name != self.active, name
+            if changed: self.switches += 1
+        if changed and self.on_switch is not None: self.on_switch(name)
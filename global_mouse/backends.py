@@ -0,0 +1,171 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import math
+import time
+import platform
+
+OS_NAME = platform.system()
+
+# 平台滚动单位：Windows 以 WHEEL_DELTA(120) 为一格，可输出 1/120 格；macOS / X11 只接受整数
+STEPS_PER_UNIT = 120 if OS_NAME == "Windows" else 1
+# uinput 高精度滚轮同样以 120 为一格
+HI_RES_STEPS = 120
+
+# Windows 上合并到至少 1/15 格、或最多攒 8ms 再注入一次；整数平台每一步本身就是一格，无需合并
+COALESCE_STEPS = 8 if STEPS_PER_UNIT > 1 else 1
+COALESCE_DELAY = 0.008
+
+
+# --- 滚动输出后端 ---
+# 引擎只调用 scroll(sx, sy) (整数步，单位 1/steps_per_unit 格) 与 flush()；除 set_quantum 外所有方法都在引擎线程中调用
+# 合并：未达到 min_steps 的增量先攒着，超过 max_delay 仍未达到也照样输出，保证慢速滚动不卡住
+# 量化：quantum 步为一个输出单位 (按前台应用设置，例如不认小数滚轮的程序只收整格)，不足一个单位的部分留到下次
+class OutputBackend:
+    steps_per_unit = 1
+
+    def __init__(self, min_steps=1, max_delay=0.0, clock=time.perf_counter):
+        self.min_steps = min_steps
+        self.max_delay = max_delay
+        self.clock = clock
+        self.quantum = 1
+        self.pending_x = 0
+        self.pending_y = 0
+        self.holding = False    # 有尚未注入的增量
+        self.held_since = 0.0
+        self.events = 0         # 实际注入的事件数
+
+    def set_quantum(self, steps):
+        # 每次激活时由 click_dispatch 线程调用 (按前台应用决定)，监督器重建后端时在引擎线程沿用旧值；
+        # 只是整体替换一个整数，引擎下一次 scroll 时生效
+        self.quantum = max(1, int(steps))
+
+    def _take(self, force):
+        px, py, q = self.pending_x, self.pending_y, self.quantum
+        ox = int(px / q) * q if q > 1 else px
+        oy = int(py / q) * q if q > 1 else py
+        if not (ox or oy): return 0, 0
+        if not force and abs(ox) < self.min_steps and abs(oy) < self.min_steps:
+            if self.clock() - self.held_since < self.max_delay: return 0, 0
+        self.pending_x = px - ox
+        self.pending_y = py - oy
+        return ox, oy
+
+    def scroll(self, sx, sy):
+        if not self.holding:
+            self.holding = True
+            self.held_since = self.clock()
+        self.pending_x += sx
+        self.pending_y += sy
+        ox, oy = self._take(False)
+        if ox or oy:
+            self.events += 1
+            self.inject(ox, oy)
+            self.holding = bool(self.pending_x or self.pending_y)
+            self.held_since = self.clock()
+
+    def flush(self):
+        # 滚动停止时调用：输出剩余的整单位部分，丢弃不足一个量化单位的零头
+        ox, oy = self._take(True)
+        if ox or oy:
+            self.events += 1
+            self.inject(ox, oy)
+        self.pending_x = self.pending_y = 0
+        self.holding = False
+
+    def inject(self, sx, sy):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PynputBackend(OutputBackend):
+    steps_per_unit = STEPS_PER_UNIT
+
+    def __init__(self, controller, min_steps=COALESCE_STEPS, max_delay=COALESCE_DELAY, clock=time.perf_counter):
+        super().__init__(min_steps, max_delay, clock)
+        self.controller = controller
+
+    def inject(self, sx, sy):
+        # pynput 在 Windows 上做 int(v * 120)，加半步防止浮点误差截掉一格
+        spu = self.steps_per_unit
+        if spu == 1:
+            self.controller.scroll(sx, sy)
+            return
+        fx = (sx + math.copysign(0.5, sx)) / spu if sx else 0
+        fy = (sy + math.copysign(0.5, sy)) / spu if sy else 0
+        self.controller.scroll(fx, fy)
+
+
+# Linux：通过 /dev/uinput 创建虚拟鼠标，输出高精度滚轮事件 (1/120 格)，并按内核约定每满一格补发一次旧式 REL_WHEEL
+# 依赖 python-evdev 且需要 /dev/uinput 写权限，缺一不可时构造函数抛出异常，由调用方回退到 pynput
+class UInputBackend(OutputBackend):
+    steps_per_unit = HI_RES_STEPS
+
+    def __init__(self, min_steps=1, max_delay=0.0, clock=time.perf_counter):
+        super().__init__(min_steps, max_delay, clock)
+        from evdev import UInput, ecodes
+        self.ecodes = ecodes
+        # 带上指针轴和按键，libinput 才会把它识别成鼠标
+        capabilities = {
+            ecodes.EV_REL: [ecodes.REL_X, ecodes.REL_Y, ecodes.REL_WHEEL, ecodes.REL_HWHEEL,
+                            ecodes.REL_WHEEL_HI_RES, ecodes.REL_HWHEEL_HI_RES],
+            ecodes.EV_KEY: [ecodes.BTN_LEFT, ecodes.BTN_RIGHT, ecodes.BTN_MIDDLE],
+        }
+        self.device = UInput(capabilities, name="Global Mouse Scroll")
+        self.notch_x = 0
+        self.notch_y = 0
+
+    def inject(self, sx, sy):
+        ec, write = self.ecodes, self.device.write
+        # pynput 约定与 evdev 相同：正数为向上 / 向右
+        if sy:
+            write(ec.EV_REL, ec.REL_WHEEL_HI_RES, sy)
+            self.notch_y += sy
+            notches = int(self.notch_y / HI_RES_STEPS)
+            if notches:
+                self.notch_y -= notches * HI_RES_STEPS
+                write(ec.EV_REL, ec.REL_WHEEL, notches)
+        if sx:
+            write(ec.EV_REL, ec.REL_HWHEEL_HI_RES, sx)
+            self.notch_x += sx
+            notches = int(self.notch_x / HI_RES_STEPS)
+            if notches:
+                self.notch_x -= notches * HI_RES_STEPS
+                write(ec.EV_REL, ec.REL_HWHEEL, notches)
+        self.device.syn()
+
+    def close(self):
+        self.device.close()
+
+
+# 只在内存中记录输出 (时间, sx, sy)，用于测试、基准与回放对比
+class RecordingBackend(OutputBackend):
+    def __init__(self, steps_per_unit=1, min_steps=1, max_delay=0.0, clock=time.perf_counter):
+        super().__init__(min_steps, max_delay, clock)
+        self.steps_per_unit = steps_per_unit
+        self.records = []
+        self.total_x = 0
+        self.total_y = 0
+
+    def inject(self, sx, sy):
+        self.records.append((self.clock(), sx, sy))
+        self.total_x += sx
+        self.total_y += sy
+
+    def clear(self):
+        self.records.clear()
+        self.total_x = self.total_y = 0
+
+
+def default_backend(controller):
+    if OS_NAME == "Linux":
+        try: return UInputBackend()
+        except Exception: pass
+    return PynputBackend(controller)
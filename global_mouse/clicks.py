@@ -0,0 +1,106 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import time
+import threading
+from array import array
+
+from global_mouse.diagnostics import wakeup_counter
+
+DEFAULT_CAPACITY = 64           # 必须是 2 的幂；人手连点远达不到，溢出时丢弃最旧的事件
+
+# 钩子写入队列的事件码：中键切换滚动，左/右键取消
+CLICK_TOGGLE, CLICK_CANCEL = 1, 2
+
+
+def button_codes(Button):
+    # 钩子里只查这张表，其余按键 (侧键等) 直接忽略
+    return {Button.middle: CLICK_TOGGLE, Button.left: CLICK_CANCEL, Button.right: CLICK_CANCEL}
+
+
+# --- 点击事件队列 ---
+# 单写者 (鼠标钩子线程) / 单读者 (click_dispatch 线程) 的预分配环形缓冲，写入路径不加锁、不分配内存
+# 写者先写数据再递增 head；读者已经醒着时不再 set()，连点风暴中钩子线程基本碰不到 Event 的内部锁
+class ClickQueue:
+    def __init__(self, capacity=DEFAULT_CAPACITY, clock=time.perf_counter):
+        if capacity & (capacity - 1): raise ValueError("capacity 必须是 2 的幂")
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.clock = clock
+        self.ts = array('d', bytes(8 * capacity))
+        self.xs = array('d', bytes(8 * capacity))
+        self.ys = array('d', bytes(8 * capacity))
+        self.codes = array('b', bytes(capacity))
+        self.head = 0       # 已写入的事件总数
+        self.tail = 0       # 已取出的事件总数 (只由读者修改)
+        self.dropped = 0
+        self.ready = threading.Event()
+
+    def push(self, code, x, y):
+        i = self.head & self.mask
+        self.ts[i] = self.clock()
+        self.xs[i] = x
+        self.ys[i] = y
+        self.codes[i] = code
+        self.head += 1
+        if not self.ready.is_set(): self.ready.set()
+
+    def drain(self, handler):
+        # 按顺序把积压的事件交给 handler(code, x, y, t)；读取期间被写者覆盖的槽位按丢弃计
+        tail, capacity, mask = self.tail, self.capacity, self.mask
+        while True:
+            head = self.head
+            if tail == head: break
+            if head - tail > capacity:
+                self.dropped += head - capacity - tail
+                tail = head - capacity
+            i = tail & mask
+            event = (self.codes[i], self.xs[i], self.ys[i], self.ts[i])
+            if self.head - tail > capacity: continue
+            tail += 1
+            self.tail = tail
+            handler(*event)
+
+
+# --- 点击处理线程 ---
+# 过滤判定、状态切换与界面通知都在这里做，钩子回调只负责入队；没有点击时阻塞在 Event 上，空闲零唤醒
+class ClickDispatcher:
+    def __init__(self, queue, handler, name="click_dispatch"):
+        self.queue = queue
+        self.handler = handler
+        self.name = name
+        self.wakeups = wakeup_counter(name)
+        self.errors = 0
+        self.last_error = None
+        self.closing = False
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.closing = True
+        self.queue.ready.set()
+
+    def handle(self, code, x, y, t):
+        # 单个事件出错不能让线程退出 (之后的点击会全部积压)
+        try:
+            self.handler(code, x, y, t)
+        except Exception as e:
+            self.errors += 1; self.last_error = e
+
+    def run(self):
+        queue = self.queue
+        while True:
+            queue.ready.wait()
+            if self.closing: return
+            self.wakeups.hit()
+            # 先清标志再取事件：取完之后才写入的事件会重新 set()，不会漏掉
+            queue.ready.clear()
+            queue.drain(self.handle)
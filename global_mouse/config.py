@@ -0,0 +1,217 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import math
+import threading
+from contextlib import contextmanager
+
+from global_mouse.curves import CURVE_TYPES
+from global_mouse.engine import TICK_RATES, DEFAULT_TICK_RATE, PACING_MODES, PACING_FIXED, POINTER_MODES, POINTER_ABSOLUTE
+from global_mouse.engine import DEFAULT_FRICTION, DEFAULT_GLIDE_CUTOFF
+from global_mouse.filters import FILTER_MODES
+from global_mouse.foreground import EMPTY_WINDOW
+
+# 可调参数及默认值 (顺序即 to_dict 的键顺序，与旧版配置文件兼容)
+DEFAULTS = {
+    "sensitivity": 2.0,
+    "speed_factor": 2.0,
+    "dead_zone": 20.0,
+    "overlay_size": 60.0,
+    "tick_rate": DEFAULT_TICK_RATE,
+    "pacing": PACING_FIXED,
+    "inertia": False,
+    "friction": DEFAULT_FRICTION,
+    "glide_cutoff": DEFAULT_GLIDE_CUTOFF,
+    "curve_type": "power",
+    "curve_params": (),
+    "enable_horizontal": True,
+    "start_minimized": False,
+    "engine_process": False,
+    "horizontal_hotkey": "",
+    "hotkeys": (),
+    "filter_mode": 0,
+    "filter_list": (),
+    "disable_fullscreen": False,
+    "disable_desktop": True,
+    "quantize_list": (),
+    "app_presets": (),              # "规则 => 预设名"，见 app_presets.py
+    "pointer_mode": POINTER_ABSOLUTE,
+}
+FIELDS = tuple(DEFAULTS)
+CURVE_FIELDS = ("curve_type", "curve_params", "sensitivity", "speed_factor", "dead_zone")
+FILTER_FIELDS = ("filter_mode", "filter_list", "disable_fullscreen", "disable_desktop")
+
+# 取值范围：引擎无法运行的值 (tick_rate=0、负摩擦等) 在进入快照之前拒绝
+CHOICES = {"tick_rate": TICK_RATES, "pacing": PACING_MODES, "pointer_mode": POINTER_MODES,
+           "curve_type": CURVE_TYPES, "filter_mode": FILTER_MODES}
+POSITIVE_FIELDS = ("sensitivity", "speed_factor", "overlay_size")
+NON_NEGATIVE_FIELDS = ("dead_zone", "friction", "glide_cutoff")
+
+
+def validate(name, value):
+    # 类型已经正确的值做范围检查，不合法时抛 ValueError
+    if name in CHOICES and value not in CHOICES[name]: raise ValueError(f"{name} 不支持 {value!r}")
+    if name in POSITIVE_FIELDS and not (math.isfinite(value) and value > 0): raise ValueError(f"{name} 需要大于 0")
+    if name in NON_NEGATIVE_FIELDS and not (math.isfinite(value) and value >= 0): raise ValueError(f"{name} 不能为负数")
+    return value
+
+
+def coerce_value(name, value):
+    # 控制通道、配置文件与预设传入的值按默认值的类型检查/转换，再检查取值范围，错误的值不会进入引擎线程
+    if name not in DEFAULTS: raise KeyError(f"未知配置项: {name}")
+    default = DEFAULTS[name]
+    if isinstance(default, bool):
+        if not isinstance(value, bool): raise ValueError(f"{name} 需要 true/false")
+        return value
+    if isinstance(default, (int, float)):
+        if isinstance(value, bool) or not isinstance(value, (int, float)): raise ValueError(f"{name} 需要数值")
+        return validate(name, type(default)(value))
+    if isinstance(default, str):
+        if not isinstance(value, str): raise ValueError(f"{name} 需要字符串")
+        return validate(name, value)
+    if name == "hotkeys":
+        if not isinstance(value, dict): raise ValueError("hotkeys 需要 {动作: 快捷键} 对象")
+        return {str(k): str(v) for k, v in value.items()}
+    if not isinstance(value, (list, tuple)): raise ValueError(f"{name} 需要列表")
+    if name == "curve_params": return [float(v) for v in value]
+    return [str(v) for v in value]
+
+
+def valid_presets(presets):
+    # {预设名: 预设 dict} -> (能加载的预设, [(预设名, 错误)])；配置文件被外部程序改坏时跳过坏的预设，而不是发布给引擎
+    if not isinstance(presets, dict): return {}, [("presets", "需要 {预设名: 预设} 对象")]
+    valid, errors = {}, []
+    for name, data in presets.items():
+        try:
+            ConfigSnapshot.from_dict(data)
+            valid[name] = data
+        except (KeyError, ValueError, TypeError) as e:
+            errors.append((name, str(e)))
+    return valid, errors
+
+
+def _freeze(name, value):
+    # 容器字段统一转成不可变且可哈希的形式
+    if name == "hotkeys":
+        items = value.items() if isinstance(value, dict) else value
+        return tuple(sorted((str(k), str(v)) for k, v in items if v))
+    if name in ("curve_params", "filter_list", "quantize_list", "app_presets"): return tuple(value)
+    return value
+
+
+# --- 不可变配置快照 ---
+# UI 每次修改都生成新快照并整体替换引用；引擎每个 tick 只读取一次引用，不会看到改了一半的参数
+class ConfigSnapshot:
+    __slots__ = FIELDS
+
+    def __init__(self, **values):
+        for name in FIELDS:
+            object.__setattr__(self, name, _freeze(name, values.get(name, DEFAULTS[name])))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot 不可修改，请使用 replace()")
+
+    def __eq__(self, other):
+        return isinstance(other, ConfigSnapshot) and self.values() == other.values()
+
+    def __hash__(self):
+        return hash(self.values())
+
+    def values(self):
+        return tuple(getattr(self, name) for name in FIELDS)
+
+    def replace(self, **changes):
+        unknown = set(changes) - set(FIELDS)
+        if unknown: raise KeyError(f"未知配置项: {', '.join(sorted(unknown))}")
+        values = {name: getattr(self, name) for name in FIELDS}
+        values.update(changes)
+        return ConfigSnapshot(**values)
+
+    def curve_key(self):
+        return tuple(getattr(self, name) for name in CURVE_FIELDS)
+
+    def filter_key(self):
+        return tuple(getattr(self, name) for name in FILTER_FIELDS)
+
+    def hotkey_bindings(self):
+        return [("toggle_horizontal", self.horizontal_hotkey)] + list(self.hotkeys)
+
+    def to_dict(self):
+        data = {name: getattr(self, name) for name in FIELDS}
+        data["curve_params"] = list(self.curve_params)
+        data["filter_list"] = list(self.filter_list)
+        data["quantize_list"] = list(self.quantize_list)
+        data["app_presets"] = list(self.app_presets)
+        data["hotkeys"] = dict(self.hotkeys)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        # 外部数据 (配置文件、控制通道、录制文件) 的入口：逐项检查类型与范围，不合法时抛 ValueError，未知键忽略
+        if not isinstance(data, dict): raise ValueError("配置需要对象")
+        return cls(**{name: coerce_value(name, data[name]) for name in FIELDS if name in data})
+
+
+# --- 配置发布点 ---
+class ConfigStore:
+    def __init__(self, snapshot=None):
+        self.snapshot = snapshot or ConfigSnapshot()
+        self.revision = 0
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._pending = None
+
+    def subscribe(self, listener):
+        # listener(old, new) 在发布线程中调用 (通常是 GUI 线程)
+        self.listeners.append(listener)
+
+    def _swap(self, make):
+        # 在锁内基于当前快照生成新快照，避免两个线程同时修改时丢失更新
+        with self._lock:
+            old = self.snapshot
+            new = make(old)
+            if new == old: return old
+            self.snapshot = new
+            self.revision += 1
+        for listener in self.listeners: listener(old, new)
+        return new
+
+    def publish(self, snapshot):
+        return self._swap(lambda old: snapshot)
+
+    def update(self, **changes):
+        # 事务进行中只累积修改，结束时一次性发布
+        if self._pending is not None:
+            self._pending.update(changes)
+            return self.snapshot
+        return self._swap(lambda old: old.replace(**changes))
+
+    @contextmanager
+    def transaction(self):
+        outer = self._pending is not None
+        if not outer: self._pending = {}
+        try:
+            yield self
+        except BaseException:
+            if not outer: self._pending = None
+            raise
+        if not outer:
+            changes, self._pending = self._pending, None
+            if changes: self._swap(lambda old: old.replace(**changes))
+
+
+# --- 运行时状态 (非预设内容) ---
+# active / origin_pos 由输入钩子线程写入；前台窗口 (标题/类名/全屏) 整体替换为一个 ForegroundWindow 元组
+class RuntimeState:
+    __slots__ = ("active", "paused", "origin_pos", "window")
+
+    def __init__(self):
+        self.active = False
+        self.paused = False
+        self.origin_pos = (0, 0)
+        self.window = EMPTY_WINDOW
@@ -0,0 +1,116 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import math
+
+# 旧版 scroll_loop 每 10ms 输出一次 speed_scalar，曲线速度统一按此换算为 "单位/秒"
+LEGACY_TICK = 0.01
+
+# 所有曲线都以 "死区外 CURVE_RANGE 像素处的幂律速度" 为 1 做归一化：
+# 形状只决定 0..1 之间怎么走，灵敏度/基础速度仍然决定整体快慢
+CURVE_RANGE = 400.0
+# 查表覆盖死区外 4096px (1px 分辨率)，更远的距离走解析计算
+TABLE_SPAN = 4096
+
+CURVE_TYPES = ("power", "capped", "bezier", "linear")
+CURVE_NAMES = {"power": "幂函数 (经典)", "capped": "饱和封顶", "bezier": "贝塞尔缓动", "linear": "分段线性"}
+DEFAULT_CURVE_PARAMS = {
+    "power": [],
+    "capped": [2.0],                           # 速度上限 (相对 CURVE_RANGE 处的速度)
+    "bezier": [0.4, 0.0, 0.6, 1.0],            # 与 CSS cubic-bezier 相同的 x1, y1, x2, y2
+    "linear": [0.0, 0.0, 0.3, 0.1, 1.0, 1.0],  # x0, y0, x1, y1, ... (x 升序)
+}
+
+
+# --- 归一化形状 g(x)：x = 死区外距离 / CURVE_RANGE，g(1) 约为 1 ---
+def _power_shape(sensitivity, params):
+    return lambda x: math.pow(x, sensitivity)
+
+
+def _capped_shape(sensitivity, params):
+    cap = params[0] if params and params[0] > 0 else DEFAULT_CURVE_PARAMS["capped"][0]
+    return lambda x: cap * math.tanh(math.pow(x, sensitivity) / cap)
+
+
+def _bezier_shape(sensitivity, params):
+    if len(params) != 4: params = DEFAULT_CURVE_PARAMS["bezier"]
+    x1, y1, x2, y2 = (min(max(params[0], 0.0), 1.0), params[1], min(max(params[2], 0.0), 1.0), params[3])
+
+    def bx(t): return 3 * (1 - t) ** 2 * t * x1 + 3 * (1 - t) * t * t * x2 + t ** 3
+    def by(t): return 3 * (1 - t) ** 2 * t * y1 + 3 * (1 - t) * t * t * y2 + t ** 3
+
+    # 超出 1 以后沿终点切线延伸
+    end_slope = (1.0 - y2) / (1.0 - x2) if x2 < 1.0 else 1.0
+
+    def shape(x):
+        if x >= 1.0: return 1.0 + (x - 1.0) * end_slope
+        lo, hi = 0.0, 1.0
+        for _ in range(40):
+            mid = (lo + hi) / 2
+            if bx(mid) < x: lo = mid
+            else: hi = mid
+        return max(0.0, by((lo + hi) / 2))
+    return shape
+
+
+def _linear_shape(sensitivity, params):
+    pts = sorted(zip(params[0::2], params[1::2]))
+    if len(pts) < 2: pts = sorted(zip(DEFAULT_CURVE_PARAMS["linear"][0::2], DEFAULT_CURVE_PARAMS["linear"][1::2]))
+    if pts[0][0] > 0: pts.insert(0, (0.0, 0.0))
+
+    def shape(x):
+        for (x0, y0), (x1, y1) in zip(pts, pts[1:]):
+            if x <= x1 or (x1, y1) == pts[-1]:
+                if x1 == x0: return max(0.0, y1)
+                return max(0.0, y0 + (y1 - y0) * (x - x0) / (x1 - x0))
+        return max(0.0, pts[-1][1])
+    return shape
+
+
+SHAPES = {"power": _power_shape, "capped": _capped_shape, "bezier": _bezier_shape, "linear": _linear_shape}
+
+
+def parse_curve_params(text):
+    return [float(v) for v in text.replace("，", ",").replace(" ", ",").split(",") if v.strip()]
+
+
+def format_curve_params(params):
+    return ", ".join(f"{v:g}" for v in params)
+
+
+# --- 编译后的曲线：距离 -> 速度 查找表 ---
+class CompiledCurve:
+    __slots__ = ("key", "dead_zone", "limit", "table", "shape", "scale")
+
+    def __init__(self, curve_type, params, sensitivity, speed_factor, dead_zone, base_multiplier):
+        self.key = (curve_type, tuple(params), sensitivity, speed_factor, dead_zone, base_multiplier)
+        self.dead_zone = dead_zone
+        self.shape = SHAPES.get(curve_type, _power_shape)(sensitivity, list(params))
+        self.scale = math.pow(CURVE_RANGE, sensitivity) * base_multiplier * speed_factor / LEGACY_TICK
+
+        # table[i] = 距原点 i 像素时的速度；死区内为 0，死区边界之后逐像素线性插值
+        size = int(dead_zone) + TABLE_SPAN + 2
+        self.table = [self.evaluate(i) for i in range(size)]
+        self.limit = float(size - 1)
+
+    def evaluate(self, dist):
+        if dist <= self.dead_zone: return 0.0
+        return self.shape((dist - self.dead_zone) / CURVE_RANGE) * self.scale
+
+    def speed(self, dist):
+        if dist <= self.dead_zone: return 0.0
+        if dist < self.limit:
+            i = int(dist)
+            a = self.table[i]
+            return a + (self.table[i + 1] - a) * (dist - i)
+        return self.evaluate(dist)
+
+
+def compile_curve(config, base_multiplier):
+    return CompiledCurve(config.curve_type, config.curve_params, config.sensitivity,
+                         config.speed_factor, config.dead_zone, base_multiplier)
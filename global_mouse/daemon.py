@@ -0,0 +1,470 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import time
+started = time.perf_counter()   # 以模块方式运行时启动耗时报告的起点
+import os
+import sys
+import json
+import errno
+import platform
+import threading
+
+from global_mouse.backends import default_backend
+from global_mouse.config import ConfigStore, ConfigSnapshot, RuntimeState, coerce_value, valid_presets
+from global_mouse.app_presets import AppPresetSwitcher, preset_profiles
+from global_mouse.curves import CURVE_TYPES, DEFAULT_CURVE_PARAMS
+from global_mouse.diagnostics import wakeup_counter, wakeup_counts, StartupProfile, peak_rss_kb
+from global_mouse.engine import ScrollEngine
+from global_mouse.supervisor import EngineSupervisor
+from global_mouse.filters import AppFilter
+from global_mouse.foreground import WindowMonitor, default_provider
+from global_mouse.screens import system_screens
+from global_mouse.hotkeys import KeyboardManager
+from global_mouse.motion import MotionRing
+from global_mouse.pointer import RelativePointer
+from global_mouse.clicks import ClickQueue, ClickDispatcher, button_codes, CLICK_TOGGLE
+from global_mouse.persistence import ConfigFile, default_config_path
+
+OS_NAME = platform.system()
+PROTOCOL_VERSION = 1
+REQUEST_TIMEOUT = 2.0
+COMMANDS = ("toggle", "preset", "set", "stats", "config", "shutdown")
+
+
+# --- 本地控制通道 ---
+# Unix 域套接字 (创建时即为 0600) 或 Windows 命名管道，每条消息是一个 UTF-8 JSON 对象：
+#   请求 {"cmd": "toggle", "paused": true}      应答 {"ok": true, "paused": true}
+#   出错时应答 {"ok": false, "error": "..."}
+def default_address():
+    if OS_NAME == "Windows":
+        return r"\\.\pipe\global_mouse-" + (os.environ.get("USERNAME") or "user")
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    base = runtime if runtime and os.path.isdir(runtime) else os.path.expanduser("~")
+    return os.path.join(base, ".global_mouse.sock")
+
+
+def address_family(address):
+    return "AF_PIPE" if address.startswith("\\\\") else "AF_UNIX"
+
+
+class ControlServer:
+    def __init__(self, handler, address=None):
+        self.handler = handler
+        self.address = address or default_address()
+        self.wakeups = wakeup_counter("control")
+        self.listener = None
+        self.running = False
+
+    def start(self):
+        family = address_family(self.address)
+        client = DaemonClient.connect(self.address)
+        if client is not None:
+            client.close()
+            raise OSError(f"已有后台实例在监听 {self.address}")
+        # 上次异常退出留下的套接字文件
+        if family == "AF_UNIX" and os.path.exists(self.address): os.unlink(self.address)
+        from multiprocessing.connection import Listener
+        # 套接字文件一创建就是 0600 (bind 之后再 chmod 会留下一段其他用户可连接的窗口)；此时其他线程尚未启动
+        umask = os.umask(0o177) if family == "AF_UNIX" else None
+        try:
+            self.listener = Listener(self.address, family)
+        finally:
+            if umask is not None: os.umask(umask)
+        self.running = True
+        threading.Thread(target=self._serve, name="control", daemon=True).start()
+
+    def close(self):
+        if not self.running: return
+        self.running = False
+        # accept() 阻塞时关闭监听套接字不一定能唤醒它，先连一次让循环退出
+        client = DaemonClient.connect(self.address)
+        if client is not None: client.close()
+        self.listener.close()
+
+    def _serve(self):
+        delay = 0.0
+        while self.running:
+            try:
+                conn = self.listener.accept()
+            except OSError as e:
+                if not self.running: return
+                # 监听套接字已失效时退出；其余错误 (文件描述符耗尽、客户端握手中断等) 退避后重试，不空转
+                if e.errno in (errno.EBADF, errno.EINVAL, errno.ENOTSOCK):
+                    print(f"Control Server Failed: {e}")
+                    self.running = False
+                    return
+                delay = min(max(delay * 2, 0.01), 1.0)
+                time.sleep(delay)
+                continue
+            delay = 0.0
+            if not self.running:
+                conn.close(); return
+            threading.Thread(target=self._client, args=(conn,), daemon=True).start()
+
+    def _client(self, conn):
+        with conn:
+            while True:
+                try:
+                    raw = conn.recv_bytes()
+                except (EOFError, OSError):
+                    return
+                self.wakeups.hit()
+                try:
+                    request = json.loads(raw.decode("utf-8"))
+                    reply = dict(self.handler(request), ok=True)
+                except Exception as e:
+                    reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                try:
+                    conn.send_bytes(json.dumps(reply, ensure_ascii=False).encode("utf-8"))
+                except OSError:
+                    return
+
+
+class DaemonClient:
+    def __init__(self, address=None, timeout=REQUEST_TIMEOUT):
+        self.address = address or default_address()
+        self.timeout = timeout
+        from multiprocessing.connection import Client
+        self.conn = Client(self.address, address_family(self.address))
+        self.lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, address=None, timeout=REQUEST_TIMEOUT):
+        # 没有后台实例在运行时返回 None；套接字文件不存在时连 multiprocessing 都不导入 (界面每次启动都会探测一次)
+        address = address or default_address()
+        if address_family(address) == "AF_UNIX" and not os.path.exists(address): return None
+        try:
+            return cls(address, timeout)
+        except (OSError, EOFError):
+            return None
+
+    def request(self, cmd, **args):
+        # 通道断开或超时抛 ConnectionError，后台拒绝请求时抛 ValueError
+        with self.lock:
+            try:
+                self.conn.send_bytes(json.dumps(dict(args, cmd=cmd), ensure_ascii=False).encode("utf-8"))
+                if not self.conn.poll(self.timeout): raise ConnectionError("后台服务无响应")
+                reply = json.loads(self.conn.recv_bytes().decode("utf-8"))
+            except (EOFError, OSError) as e:
+                raise ConnectionError(f"与后台服务的连接已断开: {e}") from e
+        if not reply.pop("ok", False): raise ValueError(reply.get("error", "未知错误"))
+        return reply
+
+    def close(self):
+        try: self.conn.close()
+        except OSError: pass
+
+
+# --- 滚动服务 ---
+# 滚动引擎 + 鼠标钩子 + 点击处理线程 + 前台窗口侦听，不含 Qt；无界面后台实例与独立引擎进程 (engine_process.py) 共用
+class ScrollService:
+    def __init__(self, config=None):
+        self.config = config or ConfigStore()
+        self.state = RuntimeState()
+        self.stopped = threading.Event()
+        self.click_wakeups = wakeup_counter("mouse_hook")
+        self.motion = MotionRing()
+        self.clicks = ClickQueue()
+        self.click_codes = {}
+        self.stats = None
+        self.engine = None
+        self.supervisor = None
+        self.window_monitor = None
+        self.app_filter = AppFilter.from_config(self.config.snapshot)
+        self.quantize_filter = AppFilter.for_quantization(self.config.snapshot)
+        # 引擎读取 app_presets.snapshot：前台应用命中规则时是合成了对应预设滚动参数的快照
+        self.app_presets = AppPresetSwitcher(self.config, self.state)
+        self.config.subscribe(self.on_config_changed)
+
+    def on_config_changed(self, old, new):
+        if new.filter_key() != old.filter_key(): self.app_filter = AppFilter.from_config(new)
+        if new.quantize_list != old.quantize_list: self.quantize_filter = AppFilter.for_quantization(new)
+
+    def start_input(self, on_direction=None, get_refresh_rate=None, on_health=None):
+        from pynput import mouse
+        self.mouse = mouse
+        self.controller = mouse.Controller()
+        self.output = default_backend(self.controller)
+        self.engine = ScrollEngine(self.app_presets, self.state, self.read_position, self.output,
+                                   on_direction=on_direction, get_refresh_rate=get_refresh_rate)
+        self.engine.stats = self.stats
+        self.engine.pointer = RelativePointer(self.controller, self.screen_index)
+        self.supervisor = EngineSupervisor(self.engine, lambda: default_backend(self.controller), self.on_output_restarted, on_health)
+        self.supervisor.start()
+        self.click_codes = button_codes(mouse.Button)
+        self.click_dispatcher = ClickDispatcher(self.clicks, self.handle_click)
+        self.click_dispatcher.start()
+        self.listener = mouse.Listener(on_click=self.on_click, on_move=self.on_move)
+        self.listener.start()
+
+    def screen_index(self):
+        # 前台窗口每次变化时 (没有全屏标志的平台据此判断全屏) 与相对位移模式每次激活时调用
+        return system_screens()
+
+    def start_window_monitor(self):
+        try:
+            self.window_monitor = WindowMonitor(self.state, default_provider(), self.screen_index, self.app_presets.on_foreground_changed)
+            self.window_monitor.start()
+        except Exception: pass
+
+    def stop_input(self):
+        self.listener.stop()
+        self.click_dispatcher.close()
+        self.state.active = False
+        self.engine.notify()
+
+    def wait(self):
+        # macOS 的前台窗口通知需要主线程 RunLoop，其余平台主线程只等待退出
+        if OS_NAME == "Darwin":
+            try:
+                from PyObjCTools import AppHelper
+            except ImportError:
+                AppHelper = None
+            if AppHelper is not None:
+                threading.Thread(target=lambda: (self.stopped.wait(), AppHelper.callAfter(AppHelper.stopEventLoop)),
+                                 daemon=True).start()
+                AppHelper.runConsoleEventLoop(installInterrupt=True)
+                return
+        try:
+            self.stopped.wait()
+        except KeyboardInterrupt:
+            pass
+
+    def on_output_restarted(self, output):
+        self.output = output
+
+    def set_stats(self, stats):
+        # LatencyStats 或 None (关闭测量)
+        self.stats = stats
+        if self.engine is not None: self.engine.stats = stats
+
+    # --- 输入钩子 (与 MainWindow 相同的判定，但没有悬浮图标) ---
+    def is_current_app_allowed(self):
+        window = self.state.window
+        return self.app_filter.allowed(window.title, window.window_class, window.fullscreen)
+
+    def on_move(self, x, y):
+        self.motion.push(x, y)
+
+    def read_position(self):
+        pos = self.motion.position()
+        return pos if pos is not None else self.controller.position
+
+    def on_click(self, x, y, button, pressed):
+        # 钩子线程只入队，判定与状态切换在 click_dispatch 线程 (见 global_mouse/clicks.py)
+        stats = self.stats
+        if stats is not None: started = time.perf_counter()
+        self.click_wakeups.hit()
+        self.motion.push(x, y)
+        if pressed:
+            code = self.click_codes.get(button)
+            if code: self.clicks.push(code, x, y)
+        if stats is not None: stats.on_click.record(time.perf_counter() - started)
+
+    def handle_click(self, code, x, y, t):
+        state = self.state
+        if code == CLICK_TOGGLE:
+            if not state.paused and self.is_current_app_allowed():
+                if not state.active:
+                    state.origin_pos = (x, y)
+                    window = state.window
+                    whole = self.quantize_filter.allowed(window.title, window.window_class, window.fullscreen)
+                    self.output.set_quantum(self.output.steps_per_unit if whole else 1)
+                    state.active = True
+                    self.engine.notify(t)
+                else:
+                    state.active = False
+        else:
+            state.active = False
+            if self.engine.gliding(): self.engine.stop_glide()
+        stats = self.stats
+        if stats is not None: stats.click_dispatch.record(time.perf_counter() - t)
+
+    def set_paused(self, paused):
+        self.state.paused = paused
+        if paused: self.state.active = False
+
+
+# --- 无界面后台实例 ---
+# 只运行滚动引擎、鼠标/键盘钩子、前台窗口侦听与配置读写，整个进程不导入 Qt；没有悬浮图标
+class HeadlessDaemon(ScrollService):
+    def __init__(self, config_path=None, address=None, startup=None):
+        super().__init__()
+        self.startup = startup or StartupProfile()
+        self.config_file = ConfigFile(config_path or default_config_path())
+        self.presets = {"默认": self.config.snapshot.to_dict()}
+        self.current_preset_name = "默认"
+        self.lock = threading.RLock()
+        self.server = ControlServer(self.handle, address)
+        self.started_at = time.time()
+        self.key_manager = None
+        self.load_presets()
+
+    def load_presets(self):
+        data = self.config_file.load()
+        if isinstance(data, dict): self.apply_presets_data(data)
+
+    def apply_presets_data(self, data):
+        presets, errors = valid_presets(data.get("presets") or {})
+        for name, error in errors: print(f"Preset Skipped: {name}: {error}")
+        self.presets = presets or {"默认": self.config.snapshot.to_dict()}
+        self.app_presets.set_profiles(preset_profiles(self.presets))
+        last_used = data.get("last_used", "默认")
+        if last_used in self.presets:
+            self.current_preset_name = last_used
+            self.config.publish(ConfigSnapshot.from_dict(self.presets[last_used]))
+
+    def save_presets(self):
+        self.config_file.save({"presets": dict(self.presets), "last_used": self.current_preset_name})
+
+    def on_config_changed(self, old, new):
+        super().on_config_changed(old, new)
+        if new.hotkey_bindings() != old.hotkey_bindings() and self.key_manager is not None:
+            self.key_manager.set_bindings(new.hotkey_bindings())
+
+    def start(self):
+        # 先占用控制通道：已有实例在运行时直接失败，避免两套钩子同时滚动
+        self.server.start()
+        self.start_input()
+        try:
+            self.key_manager = KeyboardManager(self.on_hotkey)
+            self.key_manager.set_bindings(self.config.snapshot.hotkey_bindings())
+        except Exception as e:
+            self.key_manager = None
+            print(f"Keyboard Hook Failed: {e}")
+        self.start_window_monitor()
+
+    def stop(self):
+        self.stopped.set()
+        self.server.close()
+        self.stop_input()
+        if self.key_manager is not None: self.key_manager.set_bindings(())
+        self.config_file.close()
+
+    def on_hotkey(self, action):
+        with self.lock:
+            if action == "toggle_horizontal": self.config.update(enable_horizontal=not self.config.snapshot.enable_horizontal)
+            elif action == "toggle_pause": self.set_paused(not self.state.paused)
+            elif action == "cycle_curve":
+                current = self.config.snapshot.curve_type
+                curve_type = CURVE_TYPES[(CURVE_TYPES.index(current) + 1) % len(CURVE_TYPES) if current in CURVE_TYPES else 0]
+                self.config.update(curve_type=curve_type, curve_params=DEFAULT_CURVE_PARAMS[curve_type])
+            elif action.startswith("preset:"):
+                names = list(self.presets.keys())
+                index = int(action.split(":", 1)[1]) - 1
+                if 0 <= index < len(names): self.switch_preset(names[index])
+
+    def switch_preset(self, name):
+        if name not in self.presets:
+            # 可能是界面或部署脚本刚写入的新预设
+            data = self.config_file.reload()
+            if isinstance(data, dict): self.apply_presets_data(data)
+        if name not in self.presets: raise KeyError(f"没有名为 {name} 的预设")
+        self.config.publish(ConfigSnapshot.from_dict(self.presets[name]))
+        self.current_preset_name = name
+        self.save_presets()
+
+    # --- 控制命令 ---
+    def handle(self, request):
+        cmd = request.get("cmd")
+        with self.lock:
+            if cmd == "toggle":
+                self.set_paused(bool(request.get("paused", not self.state.paused)))
+                return {"paused": self.state.paused}
+            if cmd == "preset":
+                self.switch_preset(str(request["name"]))
+                return {"preset": self.current_preset_name, "config": self.config.snapshot.to_dict()}
+            if cmd == "set":
+                values = request.get("values") or {}
+                self.config.update(**{name: coerce_value(name, value) for name, value in values.items()})
+                return {"config": self.config.snapshot.to_dict()}
+            if cmd == "stats":
+                return self.collect_stats()
+            if cmd == "config":
+                return {"config": self.config.snapshot.to_dict(), "presets": list(self.presets),
+                        "preset": self.current_preset_name, "paused": self.state.paused, "version": PROTOCOL_VERSION}
+            if cmd == "shutdown":
+                self.stopped.set()
+                return {}
+        raise ValueError(f"未知命令: {cmd} (可用: {', '.join(COMMANDS)})")
+
+    def collect_stats(self):
+        engine = self.engine
+        return {"active": self.state.active, "paused": self.state.paused, "preset": self.current_preset_name,
+                "app_preset": self.app_presets.active,
+                "uptime": time.time() - self.started_at, "ticks": engine.ticks, "dropped_ticks": engine.dropped_ticks,
+                "glide_ticks": engine.glide_ticks, "emits": engine.emits, "activations": engine.activations,
+                "dropped_clicks": self.clicks.dropped, "click_errors": self.click_dispatcher.errors,
+                "engine": self.supervisor.to_dict(),
+                "config_revision": self.config.revision, "wakeups": wakeup_counts(), "max_rss_kb": peak_rss_kb(),
+                "startup": self.startup.to_dict()}
+
+
+def parse_value(text):
+    try: return json.loads(text)
+    except ValueError: return text
+
+
+def control(argv, address=None):
+    # python -m global_mouse.daemon ctl toggle [pause|resume] | preset <名称> | set 配置项=值 ... | stats | config | shutdown
+    if not argv:
+        print("用法: ctl toggle [pause|resume] | preset <名称> | set 配置项=值 ... | stats | config | shutdown")
+        return 2
+    cmd, args = argv[0], {}
+    if cmd == "toggle" and len(argv) > 1: args["paused"] = argv[1] == "pause"
+    elif cmd == "preset" and len(argv) > 1: args["name"] = " ".join(argv[1:])
+    elif cmd == "set":
+        args["values"] = {name: parse_value(value) for name, _, value in (item.partition("=") for item in argv[1:])}
+    client = DaemonClient.connect(address)
+    if client is None:
+        print("后台服务没有运行")
+        return 1
+    try:
+        reply = client.request(cmd, **args)
+    except (ConnectionError, ValueError) as e:
+        print(e)
+        return 1
+    finally:
+        client.close()
+    print(json.dumps(reply, ensure_ascii=False, indent=2))
+    return 0
+
+
+def main(argv=None, started_at=None):
+    # python -m global_mouse.daemon [--startup-report] [--address 路径]    启动后台实例
+    # python -m global_mouse.daemon ctl <命令> ...                         向运行中的实例发送命令
+    argv = sys.argv[1:] if argv is None else list(argv)
+    address = None
+    if "--address" in argv:
+        i = argv.index("--address")
+        address = argv[i + 1]
+        del argv[i:i + 2]
+    if argv and argv[0] == "ctl": return control(argv[1:], address)
+
+    startup = StartupProfile(started if started_at is None else started_at)
+    startup.mark("import")
+    daemon = HeadlessDaemon(address=address, startup=startup)
+    startup.mark("config_load")
+    try:
+        daemon.start()
+    except OSError as e:
+        print(e)
+        return 1
+    startup.mark("hooks")
+    if "--startup-report" in argv:
+        print(json.dumps(startup.to_dict(), ensure_ascii=False))
+        daemon.stop()
+        return 0
+    daemon.wait()
+    daemon.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
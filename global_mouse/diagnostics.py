@@ -0,0 +1,216 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import sys
+import json
+import time
+import threading
+from bisect import bisect_left
+
+# --- 线程唤醒计数 ---
+# 每个后台线程每醒来一次就 hit() 一次；只由所属线程写入，读取方容忍轻微不一致
+class WakeupCounter:
+    __slots__ = ("name", "count")
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+
+    def hit(self):
+        self.count += 1
+
+
+_counters = {}
+_lock = threading.Lock()
+
+
+def wakeup_counter(name):
+    with _lock:
+        counter = _counters.get(name)
+        if counter is None: counter = _counters[name] = WakeupCounter(name)
+        return counter
+
+
+def wakeup_counts():
+    with _lock: return {name: c.count for name, c in _counters.items()}
+
+
+# 两次采样之间每个线程的唤醒速率 (次/分钟)，用于检查空闲开销
+class WakeupSampler:
+    def __init__(self, clock=time.monotonic, counts=wakeup_counts):
+        self.clock = clock
+        self.counts = counts
+        self.last_time = clock()
+        self.last_counts = counts()
+
+    def sample(self):
+        now = self.clock()
+        counts = self.counts()
+        elapsed = max(now - self.last_time, 1e-9)
+        rates = {name: (count - self.last_counts.get(name, 0)) * 60.0 / elapsed for name, count in counts.items()}
+        self.last_time, self.last_counts = now, counts
+        return rates
+
+
+# --- 固定桶直方图 ---
+# 桶边界按 1-2-5 递增 (1µs ~ 10s)，record() 只做一次二分查找和几次加法；单写者，读取方容忍轻微不一致
+LATENCY_BOUNDS = tuple(float(f"{m}e{e}") for e in range(-6, 1) for m in (1, 2, 5)) + (10.0,)
+
+
+class Histogram:
+    def __init__(self, name, help_text, bounds=LATENCY_BOUNDS):
+        self.name = name
+        self.help = help_text
+        self.bounds = bounds
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(self.bounds) + 1)    # 最后一个桶是 +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max: self.max = value
+
+    def percentile(self, q):
+        # 返回所在桶的上界 (+Inf 桶返回观测到的最大值)
+        if not self.count: return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n: return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        cumulative, buckets = 0, []
+        for i, n in enumerate(self.counts):
+            cumulative += n
+            buckets.append(["+Inf" if i == len(self.bounds) else self.bounds[i], cumulative])
+        return {"help": self.help, "unit": "seconds", "count": self.count, "sum": self.total, "max": self.max,
+                "p50": self.percentile(0.5), "p90": self.percentile(0.9), "p99": self.percentile(0.99),
+                "buckets": buckets}
+
+
+# 开启测量时才创建并挂到引擎 / 主窗口 / 键盘管理器上；关闭时这些属性为 None，热路径只多一次 None 判断
+class LatencyStats:
+    def __init__(self):
+        self.click_to_scroll = Histogram("click_to_scroll", "中键激活到第一次滚动输出")
+        self.tick_jitter = Histogram("tick_jitter", "引擎线程实际醒来时间晚于计划的时长")
+        self.on_click = Histogram("on_click", "pynput 鼠标点击回调耗时")
+        self.click_dispatch = Histogram("click_dispatch", "点击入队到处理完成的延迟")
+        self.on_press = Histogram("on_press", "pynput 键盘按下回调耗时")
+        self.overlay_signal = Histogram("overlay_signal", "show_overlay 跨线程送达 GUI 线程的延迟")
+        self.direction_signal = Histogram("direction_signal", "update_direction 跨线程送达 GUI 线程的延迟")
+        self.started = time.time()
+
+    def histograms(self):
+        return [self.click_to_scroll, self.tick_jitter, self.on_click, self.click_dispatch, self.on_press,
+                self.overlay_signal, self.direction_signal]
+
+    def reset(self):
+        for h in self.histograms(): h.reset()
+        self.started = time.time()
+
+    def to_dict(self):
+        return {"started": self.started, "exported": time.time(), "wakeups": wakeup_counts(),
+                "histograms": {h.name: h.snapshot() for h in self.histograms()}}
+
+    def to_prometheus(self, prefix="global_mouse"):
+        lines = []
+        for h in self.histograms():
+            metric = f"{prefix}_{h.name}_seconds"
+            lines.append(f"# HELP {metric} {h.help}")
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for i, n in enumerate(h.counts):
+                cumulative += n
+                le = "+Inf" if i == len(h.bounds) else repr(h.bounds[i])
+                lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+            lines.append(f"{metric}_sum {h.total!r}")
+            lines.append(f"{metric}_count {h.count}")
+        lines.append(f"# HELP {prefix}_thread_wakeups_total 后台线程唤醒次数")
+        lines.append(f"# TYPE {prefix}_thread_wakeups_total counter")
+        for name, count in sorted(wakeup_counts().items()):
+            lines.append(f'{prefix}_thread_wakeups_total{{thread="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        # 按扩展名选择格式：.json 为 JSON，其余为 Prometheus 文本格式
+        text = json.dumps(self.to_dict(), indent=2, ensure_ascii=False) if path.lower().endswith(".json") else self.to_prometheus()
+        with open(path, "w", encoding="utf-8") as f: f.write(text)
+
+
+# --- 启动耗时 ---
+# 按顺序记录启动各阶段 (导入 / Qt 初始化 / 读取配置 / 启动钩子 ...) 的耗时；设置窗口等延迟构建的部分单独记录
+STARTUP_PHASE_NAMES = {
+    "import": "导入模块", "qt_init": "Qt 初始化", "main_window": "创建主窗口与悬浮图标", "config_load": "读取配置", "hooks": "启动输入钩子与引擎",
+    "tray": "托盘图标", "window_show": "显示设置窗口", "event_loop": "进入事件循环",
+    "settings_window": "构建设置窗口 (首次打开时)",
+}
+
+
+class StartupProfile:
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.last = self.started
+        self.phases = []
+        self.deferred = []
+
+    def mark(self, name):
+        # 记录从上一次 mark 到现在的耗时
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def record(self, name, seconds):
+        self.deferred.append((name, seconds))
+
+    def total(self):
+        return self.last - self.started
+
+    def to_dict(self):
+        return {"phases": dict(self.phases), "total": self.total(), "deferred": dict(self.deferred),
+                "max_rss_kb": peak_rss_kb()}
+
+    def rows(self):
+        # (说明, 秒) 列表，供诊断面板与命令行报告使用
+        rows = [(STARTUP_PHASE_NAMES.get(name, name), seconds) for name, seconds in self.phases]
+        rows.append(("启动合计", self.total()))
+        rows.extend((STARTUP_PHASE_NAMES.get(name, name), seconds) for name, seconds in self.deferred)
+        return rows
+
+
+def peak_rss_kb():
+    # 进程峰值常驻内存 (KB)；取不到时返回 None
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss // 1024 if sys.platform == "darwin" else rss     # macOS 单位是字节
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + \
+                       [(name, ctypes.c_size_t) for name in ("PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                                                             "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                                                             "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize // 1024
+    except Exception:
+        return None
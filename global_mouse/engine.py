@@ -0,0 +1,335 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import math
+import time
+import platform
+import threading
+
+from global_mouse.curves import compile_curve
+from global_mouse.diagnostics import wakeup_counter
+from global_mouse.supervisor import EngineFailure, FAILURE_POSITION, FAILURE_OUTPUT
+
+OS_NAME = platform.system()
+
+TICK_RATES = (60, 100, 120, 240, 1000)
+DEFAULT_TICK_RATE = 120
+CURVE_CACHE_SIZE = 8            # 按应用切换预设时来回切换的曲线不必重新编译查找表
+# 迟到时最多补算 100ms 的 tick，更久的停顿 (休眠/卡死) 直接丢弃，避免恢复时猛冲
+MAX_CATCH_UP_SECONDS = 0.1
+
+# 输出节奏：按固定 tick 频率输出，或按原点所在屏幕的刷新率输出 (物理仍按固定步长积分，输出按帧抽取)
+PACING_FIXED, PACING_DISPLAY = "fixed", "display"
+PACING_MODES = (PACING_FIXED, PACING_DISPLAY)
+# 指针模式：按指针与原点的绝对距离，或按相对位移累积的虚拟距离 (指针每 tick 移回 / 快到屏幕边缘才移回，见 pointer.py)
+POINTER_ABSOLUTE, POINTER_RECENTER, POINTER_CONFINE = "absolute", "recenter", "confine"
+POINTER_MODES = (POINTER_ABSOLUTE, POINTER_RECENTER, POINTER_CONFINE)
+DEFAULT_FRICTION = 4.0          # 滑行时速度按 e^(-friction·t) 衰减
+DEFAULT_GLIDE_CUTOFF = 1.0      # 速度低于该值 (滚动单位/秒) 时滑行结束
+# 方向回差：已有方向时要退回死区内这么多像素才回到 neutral；换轴时另一轴的位移要超出当前轴这个比例
+DIRECTION_HYSTERESIS = 3.0
+AXIS_HYSTERESIS = 1.2
+
+BASE_MULTIPLIER = 0.0001 if OS_NAME == "Darwin" else 0.00005
+
+
+# --- 时钟 ---
+class MonotonicClock:
+    def now(self):
+        return time.perf_counter()
+
+    def sleep_until(self, deadline):
+        delay = deadline - time.perf_counter()
+        if delay > 0: time.sleep(delay)
+
+
+# 虚拟时钟：sleep_until 直接跳到截止时间，用于测试、基准与离线回放
+class VirtualClock:
+    def __init__(self, start=0.0):
+        self.t = start
+
+    def now(self):
+        return self.t
+
+    def sleep_until(self, deadline):
+        if deadline > self.t: self.t = deadline
+
+    def advance(self, seconds):
+        self.t += seconds
+
+
+# --- 固定步长滚动引擎 ---
+# store 提供 .snapshot (ConfigSnapshot)，state 提供 .active / .origin_pos，output 为 backends 中的输出后端
+# get_refresh_rate(origin) 返回原点所在屏幕的刷新率 (Hz)，未知时返回 None，仅 "display" 节奏使用
+class ScrollEngine:
+    def __init__(self, store, state, get_position, output, on_direction=None, clock=None,
+                 base_multiplier=BASE_MULTIPLIER, get_refresh_rate=None):
+        self.store = store
+        self.state = state
+        self.get_position = get_position
+        self.output = output
+        self.on_direction = on_direction
+        self.get_refresh_rate = get_refresh_rate
+        self.clock = clock or MonotonicClock()
+        self.steps_per_unit = output.steps_per_unit
+        self.base_multiplier = base_multiplier
+
+        self.ticks = 0
+        self.dropped_ticks = 0
+        self.glide_ticks = 0
+        self.emits = 0
+        self.wakeup = threading.Event()
+        self.wakeups = wakeup_counter("scroller")
+        self.activations = 0
+        self.activated_at = None
+        self.first_tick_latency = None
+        self.halt = False
+        self.recorder = None    # 可选的 recorder.SessionRecorder，只在引擎线程中调用
+        self.stats = None       # 可选的 diagnostics.LatencyStats，开启测量时才挂上
+        self.supervisor = None  # 可选的 supervisor.EngineSupervisor，决定失败后的退避时间
+        self.pointer = None     # 可选的 pointer.RelativePointer，相对位移模式下代替 get_position 给出虚拟位置
+        self.relative = False
+        self.first_emit_pending = False
+        self.snapshot = None
+        self.curve = None
+        self.curves = {}
+        self.enable_horizontal = True
+        self.pacing = PACING_FIXED
+        self.inertia = False
+        self.friction = 0.0
+        self.cutoff = 0.0
+        self.hysteresis = DIRECTION_HYSTERESIS
+        self.axis_hysteresis = AXIS_HYSTERESIS
+        self.tick_rate = None
+        self.set_tick_rate(DEFAULT_TICK_RATE)
+        self.apply_snapshot(store.snapshot)
+        self.reset()
+
+    def set_tick_rate(self, tick_rate):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_catch_up = max(1, int(tick_rate * MAX_CATCH_UP_SECONDS))
+        self.decay = math.exp(-self.friction * self.dt)
+
+    def reset(self):
+        # 每次激活/滑行结束时清空：速度、余量、方向与调度基准；后端里攒着的增量一并输出 (最后输出，失败时状态已清空)
+        self.vx = 0.0
+        self.vy = 0.0
+        self.integrated_x = 0.0
+        self.integrated_y = 0.0
+        self.emitted_x = 0
+        self.emitted_y = 0
+        self.direction = 'neutral'
+        self.relative = False
+        self.next_deadline = None
+        self.next_frame = None
+        self.frame_interval = None
+        try: self.output.flush()
+        except Exception as e: raise EngineFailure(FAILURE_OUTPUT, e)
+
+    def apply_snapshot(self, snapshot):
+        # 新快照到来时才取出所需字段；曲线只在曲线参数真正变化时重新编译查找表
+        if self.curve is None or self.snapshot is None or snapshot.curve_key() != self.snapshot.curve_key():
+            key = snapshot.curve_key()
+            curve = self.curves.get(key)
+            if curve is None:
+                if len(self.curves) >= CURVE_CACHE_SIZE: self.curves.clear()
+                curve = self.curves[key] = compile_curve(snapshot, self.base_multiplier)
+            self.curve = curve
+        self.enable_horizontal = snapshot.enable_horizontal
+        self.pacing = snapshot.pacing
+        self.inertia = snapshot.inertia
+        self.friction = max(0.0, snapshot.friction)
+        self.cutoff = max(0.0, snapshot.glide_cutoff)
+        self.set_tick_rate(snapshot.tick_rate)
+        self.snapshot = snapshot
+
+    def velocity(self, dx, dy):
+        # 返回 (vx, vy, direction)，速度单位为 "滚动单位/秒"
+        # 方向带回差 (只影响上报给界面的方向，不影响速度)：在死区边界或对角线附近抖动时不会来回切换
+        if not self.enable_horizontal: dx = 0
+        dist = math.hypot(dx, dy)
+        curve = self.curve
+        current = self.direction
+        if dist <= curve.dead_zone:
+            if current != 'neutral' and dist > curve.dead_zone - self.hysteresis: return 0.0, 0.0, current
+            return 0.0, 0.0, 'neutral'
+
+        ax, ay = abs(dx), abs(dy)
+        if current == 'left' or current == 'right': horizontal = ay <= ax * self.axis_hysteresis
+        elif current == 'neutral': horizontal = ax > ay
+        else: horizontal = ax > ay * self.axis_hysteresis
+        if horizontal: direction = 'right' if dx > 0 else 'left'
+        else: direction = 'down' if dy > 0 else 'up'
+
+        if dist < curve.limit:
+            table = curve.table; i = int(dist); a = table[i]
+            speed = (a + (table[i + 1] - a) * (dist - i)) / dist
+        else:
+            speed = curve.evaluate(dist) / dist
+        return dx * speed, dy * speed * -1, direction
+
+    def gliding(self):
+        return bool(self.vx or self.vy)
+
+    def stop_glide(self):
+        # 由输入钩子调用 (例如滑行中点击左/右键)，引擎线程在下一次醒来时清零速度
+        self.halt = True
+
+    def tick(self, tx, ty):
+        # 积分一个固定步长。tx/ty 为目标速度：非零时直接跟随；为零 (死区内或已松开) 时按摩擦衰减当前速度，
+        # 低于截止速度即停止；关闭惯性时立即停止
+        vx, vy = self.vx, self.vy
+        if tx or ty:
+            vx, vy = tx, ty
+        elif vx or vy:
+            if self.inertia:
+                vx *= self.decay; vy *= self.decay
+                self.glide_ticks += 1
+                if vx * vx + vy * vy < self.cutoff * self.cutoff: vx = vy = 0.0
+            else:
+                vx = vy = 0.0
+        self.vx, self.vy = vx, vy
+        self.integrated_x += vx * self.dt
+        self.integrated_y += vy * self.dt
+        self.ticks += 1
+
+    def flush(self, lead=0.0):
+        # 把已积分但尚未输出的整数步发出去；lead 为积分领先于当前时刻的时间，按当前速度扣除 (帧对齐插值)
+        spu = self.steps_per_unit
+        sx = int((self.integrated_x - self.vx * lead) * spu - self.emitted_x)
+        sy = int((self.integrated_y - self.vy * lead) * spu - self.emitted_y)
+        if sx or sy:
+            try: self.output.scroll(sx, sy)
+            except Exception as e: raise EngineFailure(FAILURE_OUTPUT, e)
+            self.emitted_x += sx
+            self.emitted_y += sy
+            self.emits += 1
+            if self.recorder is not None: self.recorder.output(sx, sy)
+            if self.first_emit_pending:
+                self.first_emit_pending = False
+                if self.stats is not None: self.stats.click_to_scroll.record(self.clock.now() - self.activated_at)
+        elif self.output.holding:
+            # 没有新增量时也要让后端有机会输出超时的合并增量
+            try: self.output.scroll(0, 0)
+            except Exception as e: raise EngineFailure(FAILURE_OUTPUT, e)
+
+    def advance(self, origin, now=None, active=True):
+        # 执行所有已到期的 tick (物理始终按固定步长)，迟到时补算，超过上限的部分丢弃并重新对齐；
+        # 随后输出一次。active=False 表示已松开，只剩惯性滑行
+        if now is None: now = self.clock.now()
+        if self.next_deadline is None: self.next_deadline = now
+
+        recorder = self.recorder
+        due = 0
+        x = y = 0.0
+        if now >= self.next_deadline:
+            due = int((now - self.next_deadline) / self.dt) + 1
+            if due > self.max_catch_up:
+                self.dropped_ticks += due - self.max_catch_up
+                self.next_deadline += (due - self.max_catch_up) * self.dt
+                due = self.max_catch_up
+
+            snapshot = self.store.snapshot
+            if snapshot is not self.snapshot:
+                self.apply_snapshot(snapshot)
+                if recorder is not None: recorder.config(snapshot)
+            if active:
+                try: x, y = self.pointer.position(self.curve.limit) if self.relative else self.get_position()
+                except Exception as e: raise EngineFailure(FAILURE_POSITION, e)
+                tx, ty, direction = self.velocity(x - origin[0], y - origin[1])
+                if direction != self.direction:
+                    self.direction = direction
+                    if self.on_direction: self.on_direction(direction)
+            else:
+                tx = ty = 0.0
+
+            for _ in range(due): self.tick(tx, ty)
+            self.next_deadline += due * self.dt
+
+        # 录制每一次调用 (包括没有到期 tick、只做帧对齐输出的调用)，回放时按同样的调用序列重现
+        if recorder is not None: recorder.sample(now, x, y, active)
+        # 按屏幕刷新率输出时，物理状态最多领先一个 tick，扣掉领先部分使每帧输出与帧时间对应
+        self.flush(self.next_deadline - now if self.frame_interval else 0.0)
+        return due
+
+    def begin_pointer(self, origin):
+        # 每次激活时调用 (在 reset 之后)：按当前配置决定本次是否使用相对位移
+        pointer = self.pointer
+        if pointer is None: return
+        try: self.relative = pointer.begin(origin, self.store.snapshot.pointer_mode)
+        except Exception as e: raise EngineFailure(FAILURE_POSITION, e)
+
+    def frame_interval_at(self, origin):
+        if self.pacing != PACING_DISPLAY or self.get_refresh_rate is None: return None
+        try: rate = self.get_refresh_rate(origin)
+        except Exception: rate = None
+        return 1.0 / rate if rate and rate > 1 else None
+
+    def next_wake(self, now):
+        # 固定节奏：下一个 tick 的截止时间；屏幕节奏：下一帧 (只知道刷新周期，无法对齐垂直同步的相位)
+        interval = self.frame_interval
+        if not interval: return self.next_deadline
+        if self.next_frame is None: self.next_frame = now
+        self.next_frame += interval
+        if self.next_frame < now: self.next_frame = now + interval
+        return self.next_frame
+
+    def set_output(self, output):
+        # 由监督器在重建输出后端后调用 (引擎线程)；新后端的单位可能不同，已积分未输出的余量直接丢弃
+        self.output = output
+        self.steps_per_unit = output.steps_per_unit
+        self.integrated_x = self.integrated_y = 0.0
+        self.emitted_x = self.emitted_y = 0
+
+    def notify(self, at=None):
+        # 由点击处理线程在激活滚动时调用，立即唤醒阻塞中的引擎线程；at 为钩子记录的点击时间 (与 clock 同一时基)
+        self.activated_at = self.clock.now() if at is None else at
+        self.activations += 1
+        self.wakeup.set()
+
+    def run(self):
+        # 线程主循环：激活或滑行时按截止时间调度；其余时间阻塞在事件上，空闲时零唤醒
+        state = self.state
+        seen = self.activations
+        while True:
+            self.wakeups.hit()
+            recorder = self.recorder
+            if self.halt:
+                self.halt = False
+                self.vx = self.vy = 0.0
+                if recorder is not None: recorder.halt()
+            if not state.active and not self.gliding():
+                if recorder is not None: recorder.end()
+                if self.direction != 'neutral' or self.next_deadline is not None: self.reset()
+                self.wakeup.clear()
+                if not state.active: self.wakeup.wait()
+                continue
+
+            now = self.clock.now()
+            try:
+                if seen != self.activations:
+                    # 新的一次激活 (可能发生在两个 tick 之间或滑行途中)：清空速度与余量，从现在重新计时
+                    seen = self.activations
+                    self.reset()
+                    self.begin_pointer(state.origin_pos)
+                    self.frame_interval = self.frame_interval_at(state.origin_pos)
+                    self.first_tick_latency = now - self.activated_at
+                    self.first_emit_pending = True
+                    if recorder is not None: recorder.begin(self, state.origin_pos, state.window)
+                self.advance(state.origin_pos, now, state.active)
+            except Exception as e:
+                # 失败后按退避时间休眠再重试 (不会空转)，恢复时重新对齐调度基准，不补算失败期间的 tick
+                delay = self.supervisor.failed(e) if self.supervisor is not None else self.dt
+                self.next_deadline = None
+                self.clock.sleep_until(now + delay)
+                continue
+            if self.supervisor is not None and self.supervisor.consecutive: self.supervisor.succeeded()
+            wake = self.next_wake(now)
+            self.clock.sleep_until(wake)
+            if self.stats is not None: self.stats.tick_jitter.record(self.clock.now() - wake)
@@ -0,0 +1,425 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import os
+import sys
+import json
+import time
+import struct
+import platform
+import threading
+import subprocess
+
+from global_mouse.config import ConfigSnapshot
+from global_mouse.daemon import ScrollService
+from global_mouse.diagnostics import LatencyStats, LATENCY_BOUNDS, wakeup_counter, wakeup_counts
+from global_mouse.screens import ScreenIndex
+from global_mouse.supervisor import HEALTH_RUNNING, HEALTH_DEGRADED, HEALTH_STOPPED
+
+OS_NAME = platform.system()
+
+# --- 共享内存布局 (固定，小端) ---
+# 头部 | 控制区 (界面进程写) | 状态区 (引擎进程写) | 统计区 (引擎进程写)
+# 每个区开头是一个 8 字节序号 (顺序锁)：写者写前把序号加到奇数、写完加到偶数；读者看到奇数或前后序号不同就重读
+# 每个区只有一个写者，读写双方都不加锁；区之间按 64 字节对齐，避免两个进程的写入落在同一缓存行
+MAGIC = b"GMSE"
+LAYOUT_VERSION = 3
+MAX_SCREENS = 16
+CONFIG_CAPACITY = 1 << 20       # 配置快照与各预设滚动参数 JSON 的上限 (1000 条过滤规则约 20 KB)
+DIRECTIONS = ('neutral', 'up', 'down', 'left', 'right')
+HEALTH = (HEALTH_STOPPED, HEALTH_RUNNING, HEALTH_DEGRADED)
+COUNTERS = ("ticks", "dropped_ticks", "glide_ticks", "emits", "activations", "dropped_clicks", "click_errors",
+            "engine_failures", "output_restarts")
+CHILD_WAKEUPS = ("scroller", "mouse_hook", "click_dispatch", "foreground", "engine_control")
+SHARED_HISTOGRAMS = ("click_to_scroll", "tick_jitter", "on_click", "click_dispatch")
+FLAG_PAUSED, FLAG_STATS = 1, 2
+STATS_MAX_AGE = 0.25            # 界面一次刷新里的几处读取 (唤醒次数、失败计数、直方图) 共用同一份统计
+READ_TIMEOUT = 0.05             # 写者只在一个区内停留几十微秒；超过这个时长仍读不到完整内容，视为写者在写入中途退出了
+
+SEQ = struct.Struct("<Q")
+HEADER = struct.Struct("<4sII")                                 # magic, 布局版本, 总大小
+CONTROL = struct.Struct("<II" + "5d" * MAX_SCREENS + "I")       # flags, 屏幕数, 屏幕 (x, y, 宽, 高, 刷新率), 配置长度
+STATUS = struct.Struct("<BBBBH2x2d")                            # active, paused, 方向, 引擎健康状态, 按应用切换的预设序号+1 (0 为无), 原点
+STATS = struct.Struct("<" + "Q" * (len(COUNTERS) + len(CHILD_WAKEUPS)))
+HISTOGRAM = struct.Struct("<" + "Q" * (len(LATENCY_BOUNDS) + 1) + "Qdd")   # 各桶计数, 总数, 总和, 最大值
+
+
+def align(n):
+    return (n + 63) & ~63
+
+
+CONTROL_OFFSET = align(HEADER.size)
+STATUS_OFFSET = align(CONTROL_OFFSET + SEQ.size + CONTROL.size + CONFIG_CAPACITY)
+STATS_OFFSET = align(STATUS_OFFSET + SEQ.size + STATUS.size)
+BLOCK_SIZE = align(STATS_OFFSET + SEQ.size + STATS.size + HISTOGRAM.size * len(SHARED_HISTOGRAMS))
+
+# 两个进程之间的 "门铃"：单字节命令，只用于唤醒对方，数据全部在共享内存里
+#   界面 -> 引擎 (子进程 stdin)：c 控制区已更新  r 请求刷新统计区  z 清零统计；stdin 关闭即退出
+#   引擎 -> 界面 (子进程 stdout)：s 状态区已更新  r 统计区已刷新
+BELL_CONTROL, BELL_STATS, BELL_RESET, BELL_STATUS = b"c", b"r", b"z", b"s"
+
+
+def attach_shared_memory(name):
+    # 子进程只是打开界面进程创建的内存块：不能登记到自己的 resource_tracker，否则子进程退出时它会被提前删除
+    # (并且会为此多启动一个跟踪进程)；3.13 起有 track 参数，之前的版本在打开期间临时跳过登记
+    from multiprocessing import shared_memory, resource_tracker
+    if sys.version_info >= (3, 13): return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args: None
+    try: return shared_memory.SharedMemory(name=name)
+    finally: resource_tracker.register = register
+
+
+class SharedBlock:
+    def __init__(self, name=None):
+        from multiprocessing import shared_memory
+        create = name is None
+        self.shm = shared_memory.SharedMemory(create=True, size=BLOCK_SIZE) if create else attach_shared_memory(name)
+        self.buf = self.shm.buf
+        if create:
+            HEADER.pack_into(self.buf, 0, MAGIC, LAYOUT_VERSION, BLOCK_SIZE)
+        elif HEADER.unpack_from(self.buf, 0) != (MAGIC, LAYOUT_VERSION, BLOCK_SIZE):
+            self.shm.close()
+            raise ValueError(f"共享内存 {name} 的布局与当前版本不一致")
+        self.last = {}          # 每个区最近一次读到的完整内容
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self, unlink=False):
+        self.buf = None
+        self.shm.close()
+        if unlink: self.shm.unlink()
+
+    # --- 顺序锁 ---
+    def _write(self, offset, fill):
+        seq = SEQ.unpack_from(self.buf, offset)[0] + 1
+        SEQ.pack_into(self.buf, offset, seq)
+        try: fill(self.buf, offset + SEQ.size)
+        finally: SEQ.pack_into(self.buf, offset, seq + 1)
+
+    def _read(self, offset, extract, timeout=READ_TIMEOUT):
+        # 写者被结束在写入中途时序号会一直是奇数：超时后返回该区上一次读到的内容，从没读到过则抛出 TimeoutError
+        buf = self.buf
+        deadline = None
+        while True:
+            seq = SEQ.unpack_from(buf, offset)[0]
+            if not seq & 1:
+                result = extract(buf, offset + SEQ.size)
+                if SEQ.unpack_from(buf, offset)[0] == seq:
+                    self.last[offset] = result
+                    return result
+            now = time.monotonic()
+            if deadline is None: deadline = now + timeout
+            elif now > deadline:
+                if offset in self.last: return self.last[offset]
+                raise TimeoutError(f"共享内存区 {offset} 的写入没有完成 (写者可能已退出)")
+            time.sleep(0)
+
+    # --- 控制区：配置快照、暂停与测量开关、屏幕刷新率 ---
+    def write_control(self, flags, screens, raw):
+        if len(raw) > CONFIG_CAPACITY: raise ValueError(f"配置超过共享内存容量 ({len(raw)} > {CONFIG_CAPACITY} 字节)")
+        screens = list(screens)[:MAX_SCREENS]
+        values = [v for screen in screens for v in screen] + [0.0] * (5 * (MAX_SCREENS - len(screens)))
+        def fill(buf, at):
+            CONTROL.pack_into(buf, at, flags, len(screens), *values, len(raw))
+            start = at + CONTROL.size
+            buf[start:start + len(raw)] = raw
+        self._write(CONTROL_OFFSET, fill)
+
+    def read_control(self):
+        def extract(buf, at):
+            values = CONTROL.unpack_from(buf, at)
+            flags, count, length = values[0], min(values[1], MAX_SCREENS), min(values[-1], CONFIG_CAPACITY)
+            screens = tuple(tuple(values[2 + 5 * i:7 + 5 * i]) for i in range(count))
+            start = at + CONTROL.size
+            return flags, screens, bytes(buf[start:start + length])
+        return self._read(CONTROL_OFFSET, extract)
+
+    # --- 状态区：悬浮图标所需的 active / 方向，以及托盘显示的引擎健康状态与按应用生效的预设 ---
+    # 预设只传序号 (控制区 profiles 中的顺序)，名字由界面进程对照自己写入的那一份取得
+    def write_status(self, active, paused, direction, origin, health=HEALTH_RUNNING, preset=0):
+        index = DIRECTIONS.index(direction) if direction in DIRECTIONS else 0
+        code = HEALTH.index(health) if health in HEALTH else 0
+        self._write(STATUS_OFFSET, lambda buf, at: STATUS.pack_into(buf, at, active, paused, index, code, preset, origin[0], origin[1]))
+
+    def read_status(self):
+        active, paused, index, code, preset, x, y = self._read(STATUS_OFFSET, STATUS.unpack_from)
+        return (bool(active), bool(paused), DIRECTIONS[index if index < len(DIRECTIONS) else 0], (x, y),
+                HEALTH[code if code < len(HEALTH) else 0], preset)
+
+    # --- 统计区：计数器、线程唤醒次数与延迟直方图 ---
+    def write_stats(self, counters, wakeups, histograms):
+        def fill(buf, at):
+            STATS.pack_into(buf, at, *[counters.get(name, 0) for name in COUNTERS], *[wakeups.get(name, 0) for name in CHILD_WAKEUPS])
+            at += STATS.size
+            for name in SHARED_HISTOGRAMS:
+                h = histograms.get(name)
+                if h is None: HISTOGRAM.pack_into(buf, at, *[0] * (len(LATENCY_BOUNDS) + 2), 0.0, 0.0)
+                else: HISTOGRAM.pack_into(buf, at, *h.counts, h.count, h.total, h.max)
+                at += HISTOGRAM.size
+        self._write(STATS_OFFSET, fill)
+
+    def read_stats(self):
+        def extract(buf, at):
+            values = STATS.unpack_from(buf, at)
+            at += STATS.size
+            histograms = {}
+            for name in SHARED_HISTOGRAMS:
+                h = HISTOGRAM.unpack_from(buf, at)
+                histograms[name] = (list(h[:-3]), h[-3], h[-2], h[-1])
+                at += HISTOGRAM.size
+            return values, histograms
+        values, histograms = self._read(STATS_OFFSET, extract)
+        return {"counters": dict(zip(COUNTERS, values)), "wakeups": dict(zip(CHILD_WAKEUPS, values[len(COUNTERS):])),
+                "histograms": histograms}
+
+
+# --- 引擎子进程 ---
+# 运行滚动引擎、鼠标钩子、点击处理与前台窗口侦听；配置从共享内存读取，不读写配置文件，不处理快捷键 (仍在界面进程)
+# 控制区的 JSON 为 {"config": 配置快照, "profiles": 各预设的滚动参数}，按应用切换预设在本进程内完成
+class EngineChild(ScrollService):
+    def __init__(self, block, bell_in=0, bell_out=1):
+        super().__init__()
+        self.block = block
+        self.bell_in = bell_in
+        self.bell_out = bell_out
+        self.wakeups = wakeup_counter("engine_control")
+        self.status_lock = threading.Lock()
+        self.config_raw = None
+        self.screens = ScreenIndex()
+        self.flags = 0
+        self.status = None
+        self.profile_names = []
+        self.app_presets.on_switch = self.on_preset_switched
+        self.apply_control()
+
+    def start(self):
+        self.start_input(on_direction=self.on_direction, get_refresh_rate=self.refresh_rate_at, on_health=self.on_health)
+        self.start_window_monitor()
+        threading.Thread(target=self.serve, name="engine_control", daemon=True).start()
+        # 第一次统计即就绪通知：此前界面进程读统计时不等待
+        self.publish_stats()
+        self.ring(BELL_STATS)
+
+    def stop(self):
+        self.stopped.set()
+        self.stop_input()
+
+    def ring(self, bell):
+        try: os.write(self.bell_out, bell)
+        except OSError: self.stopped.set()
+
+    def serve(self):
+        # 阻塞读门铃，空闲时零唤醒；界面进程退出 (stdin 关闭) 时本进程随之退出
+        while True:
+            try: data = os.read(self.bell_in, 64)
+            except OSError: data = b""
+            if not data:
+                self.stopped.set(); return
+            self.wakeups.hit()
+            if BELL_CONTROL in data: self.apply_control()
+            if BELL_RESET in data and self.stats is not None: self.stats.reset()
+            if BELL_STATS in data:
+                self.publish_stats()
+                self.ring(BELL_STATS)
+
+    def apply_control(self):
+        flags, screens, raw = self.block.read_control()
+        if screens != self.screens.rates():
+            self.screens = ScreenIndex.from_rates(screens)
+            if self.window_monitor is not None: self.window_monitor.refresh()
+        if raw and raw != self.config_raw:
+            self.config_raw = raw
+            data = json.loads(raw.decode("utf-8"))
+            self.config.publish(ConfigSnapshot.from_dict(data["config"]))
+            self.profile_names = list(data["profiles"])
+            self.app_presets.set_profiles(data["profiles"])
+        changed = flags ^ self.flags
+        self.flags = flags
+        if changed & FLAG_STATS: self.set_stats(LatencyStats() if flags & FLAG_STATS else None)
+        if changed & FLAG_PAUSED or self.state.paused != bool(flags & FLAG_PAUSED):
+            self.set_paused(bool(flags & FLAG_PAUSED))
+            self.publish_status()
+
+    def refresh_rate_at(self, pos):
+        return self.screens.refresh_rate(pos)
+
+    def screen_index(self):
+        # 屏幕布局由界面进程经控制区传来 (Qt 的屏幕信息，随热插拔更新)
+        return self.screens
+
+    def handle_click(self, code, x, y, t):
+        super().handle_click(code, x, y, t)
+        self.publish_status()
+
+    def on_direction(self, direction):
+        self.publish_status(direction)
+
+    def on_health(self, health):
+        self.publish_status()
+
+    def on_preset_switched(self, name):
+        self.publish_status()
+
+    def publish_status(self, direction=None):
+        # 三个线程 (点击处理 / 引擎 / 门铃) 都可能调用，状态区只能有一个写者，因此加进程内锁
+        state = self.state
+        with self.status_lock:
+            # 激活/停止时方向归零；滚动中的方向变化由引擎线程通过 on_direction 传入
+            if direction is None: direction = self.status[2] if state.active and self.status is not None and self.status[0] else 'neutral'
+            health = self.supervisor.health if self.supervisor is not None else HEALTH_STOPPED
+            active_preset = self.app_presets.active
+            preset = self.profile_names.index(active_preset) + 1 if active_preset in self.profile_names else 0
+            status = (state.active, state.paused, direction, health, preset)
+            if status == self.status: return
+            self.status = status
+            self.block.write_status(state.active, state.paused, direction, state.origin_pos, health, preset)
+            self.ring(BELL_STATUS)
+
+    def publish_stats(self):
+        engine = self.engine
+        counters = {"ticks": engine.ticks, "dropped_ticks": engine.dropped_ticks, "glide_ticks": engine.glide_ticks,
+                    "emits": engine.emits, "activations": engine.activations,
+                    "dropped_clicks": self.clicks.dropped, "click_errors": self.click_dispatcher.errors,
+                    "engine_failures": sum(self.supervisor.failures.values()), "output_restarts": self.supervisor.restarts}
+        stats = self.stats
+        histograms = {} if stats is None else {name: getattr(stats, name) for name in SHARED_HISTOGRAMS}
+        self.block.write_stats(counters, wakeup_counts(), histograms)
+
+
+# --- 界面进程一侧的句柄 ---
+# on_status(active, paused, direction, origin, health, preset) 与 on_exit() 在读门铃的线程中调用；preset 为按应用生效的预设名或 None
+class EngineProcess:
+    def __init__(self, on_status, on_exit, command=None):
+        self.on_status = on_status
+        self.on_exit = on_exit
+        self.command = command or default_command
+        self.block = None
+        self.proc = None
+        self.flags = 0
+        self.screens = ()
+        self.config = None
+        self.profiles = {}
+        self.profile_names = []
+        self.raw = b""
+        self.closing = False
+        self.ready = False
+        self.stats_ready = threading.Event()
+        self.stats_cache = None
+        self.stats_at = 0.0
+        self.lock = threading.Lock()
+
+    def start(self, snapshot, paused=False, screens=(), profiles=None):
+        self.block = SharedBlock()
+        try:
+            self.write_control(snapshot, paused=paused, screens=screens, profiles=profiles, ring=False)
+            flags = subprocess.CREATE_NO_WINDOW if OS_NAME == "Windows" else 0
+            self.proc = subprocess.Popen(self.command(self.block.name), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         bufsize=0, creationflags=flags)
+        except Exception:
+            self.block.close(unlink=True); self.block = None
+            raise
+        threading.Thread(target=self.serve, name="engine_process", daemon=True).start()
+
+    def ring(self, bell):
+        with self.lock:
+            try: self.proc.stdin.write(bell)
+            except (OSError, ValueError): pass
+
+    def write_control(self, snapshot=None, paused=None, stats=None, screens=None, profiles=None, ring=True):
+        # 只由界面线程调用 (控制区唯一的写者)；profiles 由 app_presets.preset_profiles() 生成
+        if snapshot is not None: self.config = snapshot.to_dict()
+        if profiles is not None: self.profiles = dict(profiles)
+        if snapshot is not None or profiles is not None:
+            self.profile_names = list(self.profiles)
+            self.raw = json.dumps({"config": self.config, "profiles": self.profiles}, ensure_ascii=False).encode("utf-8")
+        if paused is not None: self.flags = (self.flags | FLAG_PAUSED) if paused else (self.flags & ~FLAG_PAUSED)
+        if stats is not None: self.flags = (self.flags | FLAG_STATS) if stats else (self.flags & ~FLAG_STATS)
+        if screens is not None: self.screens = tuple(screens)
+        self.block.write_control(self.flags, self.screens, self.raw)
+        if ring: self.ring(BELL_CONTROL)
+
+    def serve(self):
+        fd = self.proc.stdout.fileno()
+        while True:
+            try: data = os.read(fd, 64)
+            except OSError: data = b""
+            if not data: break
+            self.ready = True
+            if BELL_STATUS in data:
+                try: self.on_status(*self.read_status())
+                except TimeoutError as e: print(f"Engine Status Failed: {e}")
+            if BELL_STATS in data: self.stats_ready.set()
+        if not self.closing: self.on_exit()
+
+    def read_status(self):
+        active, paused, direction, origin, health, preset = self.block.read_status()
+        names = self.profile_names
+        return active, paused, direction, origin, health, names[preset - 1] if 0 < preset <= len(names) else None
+
+    def read_stats(self, timeout=0.0):
+        # 界面线程调用：请求子进程刷新统计区，默认不等待，直接读子进程上一次发布的内容 (下一次刷新时就是这次请求的结果)，
+        # 子进程卡住或已退出时界面不会跟着卡；STATS_MAX_AGE 内的重复读取返回同一份结果。timeout > 0 时最多等这么久拿到最新的
+        now = time.monotonic()
+        if not timeout and self.stats_cache is not None and now - self.stats_at < STATS_MAX_AGE: return self.stats_cache
+        if self.ready and self.alive():
+            self.stats_ready.clear()
+            self.ring(BELL_STATS)
+            if timeout: self.stats_ready.wait(timeout)
+        self.stats_cache, self.stats_at = self.block.read_stats(), now
+        return self.stats_cache
+
+    def reset_stats(self):
+        self.stats_cache = None
+        self.ring(BELL_RESET)
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def close(self, timeout=1.0):
+        if self.proc is None: return
+        self.closing = True
+        try: self.proc.stdin.close()
+        except OSError: pass
+        try: self.proc.wait(timeout)
+        except subprocess.TimeoutExpired: self.proc.kill()
+        self.block.close(unlink=True)
+        self.proc = None
+
+
+def default_command(name):
+    # 源码运行时以模块方式启动；打包后的可执行文件由 main.py 开头的 --engine-process 分支接管 (不导入 Qt)
+    if getattr(sys, "frozen", False): return [sys.executable, "--engine-process", name]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return [sys.executable, "-c", f"import sys; sys.path.insert(0, {root!r}); from global_mouse.engine_process import main; "
+                                  f"sys.exit(main([{name!r}]))"]
+
+
+def main(argv=None):
+    # python -m global_mouse.engine_process <共享内存名>    由界面进程启动，stdin/stdout 是门铃管道
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv:
+        print("用法: python -m global_mouse.engine_process <共享内存名>", file=sys.stderr)
+        return 2
+    # stdout 留给门铃，print 等输出改写到 stderr
+    bell_out = os.dup(1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    block = SharedBlock(argv[0])
+    child = EngineChild(block, bell_in=0, bell_out=bell_out)
+    child.start()
+    child.wait()
+    child.stop()
+    block.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
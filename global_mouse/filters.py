@@ -0,0 +1,126 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import re
+import fnmatch
+import platform
+from collections import OrderedDict
+
+OS_NAME = platform.system()
+
+FILTER_OFF, FILTER_BLACKLIST, FILTER_WHITELIST = 0, 1, 2
+FILTER_MODES = (FILTER_OFF, FILTER_BLACKLIST, FILTER_WHITELIST)
+DESKTOP_CLASSES = ("Progman", "WorkerW") if OS_NAME == "Windows" else ()
+VERDICT_CACHE_SIZE = 256
+
+# 每行一条规则；不带前缀的行沿用旧版语义 (标题包含关键词，不区分大小写)
+RULE_PREFIXES = ("exact:", "glob:", "re:", "class:")
+RULE_HELP = ("关键词          标题包含该词\n"
+             "exact:标题      标题完全相同\n"
+             "glob:*.pdf*     通配符匹配标题\n"
+             "re:^Blender     正则匹配标题\n"
+             "class:Notepad   匹配窗口类名 (macOS 为 Bundle ID，支持通配符)")
+
+
+def parse_rule(line):
+    for prefix in RULE_PREFIXES:
+        if line[:len(prefix)].lower() == prefix: return prefix[:-1], line[len(prefix):].strip()
+    return "keyword", line
+
+
+def _trie_pattern(words):
+    # 把关键词合并成前缀树形式的正则，避免上千个分支在每个位置逐一回溯
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word: node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        if "" in node and len(node) == 1: return ""
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+    return build(trie)
+
+
+# --- 预编译的应用过滤器 ---
+# 每次规则/预设变化时整体重建并替换引用；allowed() 在输入钩子线程中调用，只读不写 (LRU 除外)
+class AppFilter:
+    def __init__(self, filter_mode=FILTER_OFF, filter_list=(), disable_fullscreen=False, disable_desktop=True,
+                 desktop_classes=DESKTOP_CLASSES, cache_size=VERDICT_CACHE_SIZE):
+        self.filter_mode = filter_mode
+        self.disable_fullscreen = disable_fullscreen
+        self.desktop_classes = frozenset(desktop_classes) if disable_desktop else frozenset()
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalid_rules = []
+
+        keywords, title_patterns, class_exact, class_patterns = [], [], set(), []
+        for line in filter_list:
+            line = line.strip()
+            if not line: continue
+            kind, value = parse_rule(line)
+            if not value: continue
+            if kind == "keyword": keywords.append(value.lower())
+            elif kind == "exact": title_patterns.append(r"\A" + re.escape(value.lower()) + r"\Z")
+            elif kind == "glob": title_patterns.append(r"\A" + fnmatch.translate(value.lower()))
+            elif kind == "re":
+                try: re.compile("(?i:" + value + ")")
+                except re.error: self.invalid_rules.append(line); continue
+                title_patterns.append("(?i:" + value + ")")
+            elif kind == "class":
+                if any(ch in value for ch in "*?["): class_patterns.append(r"\A" + fnmatch.translate(value.lower()))
+                else: class_exact.add(value.lower())
+
+        # 关键词 + 其他标题规则合并成一条正则，对小写标题做一次 search (只有用户正则局部忽略大小写)
+        parts = ([_trie_pattern(keywords)] if keywords else []) + title_patterns
+        self.title_re = re.compile("|".join(parts), re.DOTALL) if parts else None
+        self.class_exact = frozenset(class_exact)
+        self.class_re = re.compile("|".join(class_patterns), re.DOTALL) if class_patterns else None
+        self.rule_count = len(keywords) + len(title_patterns) + len(class_exact) + len(class_patterns)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.filter_mode, config.filter_list, config.disable_fullscreen, config.disable_desktop)
+
+    @classmethod
+    def for_quantization(cls, config):
+        # 同一套规则语法；allowed() 为 True 表示该应用只接受整格滚动
+        return cls(FILTER_WHITELIST, config.quantize_list, False, False)
+
+    def matches(self, title, window_class):
+        if self.title_re is not None and self.title_re.search(title.lower()): return True
+        if window_class:
+            window_class = window_class.lower()
+            if window_class in self.class_exact: return True
+            if self.class_re is not None and self.class_re.match(window_class): return True
+        return False
+
+    def evaluate(self, title, window_class, is_fullscreen):
+        if self.disable_fullscreen and is_fullscreen: return False
+        if window_class in self.desktop_classes: return False
+        if self.filter_mode == FILTER_BLACKLIST: return not self.matches(title, window_class)
+        if self.filter_mode == FILTER_WHITELIST: return self.matches(title, window_class)
+        return True
+
+    def allowed(self, title, window_class, is_fullscreen):
+        key = (title, window_class, is_fullscreen)
+        cache = self.cache
+        verdict = cache.get(key)
+        if verdict is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return verdict
+        self.misses += 1
+        verdict = self.evaluate(title, window_class, is_fullscreen)
+        cache[key] = verdict
+        if len(cache) > self.cache_size: cache.popitem(last=False)
+        return verdict
@@ -0,0 +1,362 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import threading
+import platform
+import subprocess
+from collections import namedtuple
+
+from global_mouse.diagnostics import wakeup_counter
+
+OS_NAME = platform.system()
+
+# rect = (left, top, right, bottom)，拿不到时为 None
+# fullscreen 为 None 表示后端不知道，由监视器按窗口矩形与屏幕尺寸判断
+ForegroundWindow = namedtuple("ForegroundWindow", "title window_class rect fullscreen")
+EMPTY_WINDOW = ForegroundWindow("", "", None, False)
+
+
+# --- 前台窗口提供者 (推送式) ---
+# start(callback) 之后，仅在前台窗口 (标题/类名/全屏状态) 真正变化时回调 callback(ForegroundWindow)
+class ForegroundProvider:
+    def __init__(self):
+        self.callback = None
+        self.window = EMPTY_WINDOW
+        self.changes = 0
+
+    def start(self, callback):
+        self.callback = callback
+
+    def stop(self):
+        pass
+
+    def publish(self, window):
+        if window == self.window: return
+        self.window = window
+        self.changes += 1
+        if self.callback: self.callback(window)
+
+
+# 内存假后端：测试与基准中手动切换 "前台窗口"
+class FakeForegroundProvider(ForegroundProvider):
+    def start(self, callback):
+        super().start(callback)
+        if self.window != EMPTY_WINDOW: callback(self.window)
+
+    def set_foreground(self, title, window_class="", rect=None, fullscreen=None):
+        self.publish(ForegroundWindow(title, window_class, rect, fullscreen))
+
+
+# 兜底：没有事件接口可用时退回旧版的定时轮询，但只在结果变化时回调
+class PollingProvider(ForegroundProvider):
+    def __init__(self, query, interval=0.5):
+        super().__init__()
+        self.query = query
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def start(self, callback):
+        super().start(callback)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        wakeups = wakeup_counter("foreground")
+        while not self._stop.is_set():
+            wakeups.hit()
+            try: self.publish(self.query())
+            except Exception: pass
+            self._stop.wait(self.interval)
+
+
+def query_osascript():
+    script = 'tell application "System Events" to get name of first application process whose frontmost is true'
+    res = subprocess.run(['osascript', '-e', script], capture_output=True, text=True)
+    return ForegroundWindow(res.stdout.strip(), "", None, False)
+
+
+def query_win32():
+    # 与旧版轮询相同：GetForegroundWindow + 标题/类名/窗口矩形，全屏由监视器按屏幕布局判断
+    import ctypes
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    hwnd = user32.GetForegroundWindow()
+    if not hwnd: return EMPTY_WINDOW
+    title = ctypes.create_unicode_buffer(user32.GetWindowTextLengthW(hwnd) + 1)
+    user32.GetWindowTextW(hwnd, title, len(title))
+    window_class = ctypes.create_unicode_buffer(256)
+    user32.GetClassNameW(hwnd, window_class, 256)
+    r = wintypes.RECT()
+    user32.GetWindowRect(hwnd, ctypes.byref(r))
+    return ForegroundWindow(title.value, window_class.value, (r.left, r.top, r.right, r.bottom), None)
+
+
+# --- Windows: SetWinEventHook ---
+class WinEventProvider(ForegroundProvider):
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_SYSTEM_MINIMIZEEND = 0x0017
+    EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    OBJID_WINDOW = 0
+    WM_QUIT = 0x0012
+
+    def __init__(self):
+        super().__init__()
+        import ctypes
+        from ctypes import wintypes
+        self.ctypes = ctypes
+        self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
+        self.proc_type = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        self.user32.SetWinEventHook.restype = wintypes.HANDLE
+        self.user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+        # 缓冲区只分配一次，标题过长时再扩容
+        self.title_buf = ctypes.create_unicode_buffer(512)
+        self.class_buf = ctypes.create_unicode_buffer(256)
+        self.rect = wintypes.RECT()
+        self.pid = wintypes.DWORD()
+        self.hwnd = None
+        self.window_hook = None
+        self.thread_id = None
+        self.wakeups = wakeup_counter("foreground")
+
+    def start(self, callback):
+        super().start(callback)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        if self.thread_id: self.user32.PostThreadMessageW(self.thread_id, self.WM_QUIT, 0, 0)
+
+    def _run(self):
+        ctypes = self.ctypes
+        from ctypes import wintypes
+        user32 = self.user32
+        self.thread_id = self.kernel32.GetCurrentThreadId()
+        # 回调对象必须保持引用，否则会被回收导致崩溃
+        self.proc = self.proc_type(self._on_event)
+        fg_hook = user32.SetWinEventHook(self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_FOREGROUND, 0, self.proc, 0, 0, self.WINEVENT_OUTOFCONTEXT)
+        min_hook = user32.SetWinEventHook(self.EVENT_SYSTEM_MINIMIZEEND, self.EVENT_SYSTEM_MINIMIZEEND, 0, self.proc, 0, 0, self.WINEVENT_OUTOFCONTEXT)
+        self._focus(user32.GetForegroundWindow())
+
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        for hook in (fg_hook, min_hook, self.window_hook):
+            if hook: user32.UnhookWinEvent(hook)
+
+    def _focus(self, hwnd):
+        # 前台窗口切换：只对新前台窗口所在进程挂 位置/标题 变化钩子，避免接收全局光标移动事件
+        user32 = self.user32
+        self.hwnd = hwnd
+        if self.window_hook: user32.UnhookWinEvent(self.window_hook); self.window_hook = None
+        if hwnd:
+            user32.GetWindowThreadProcessId(hwnd, self.ctypes.byref(self.pid))
+            self.window_hook = user32.SetWinEventHook(self.EVENT_OBJECT_LOCATIONCHANGE, self.EVENT_OBJECT_NAMECHANGE, 0, self.proc,
+                                                      self.pid.value, 0, self.WINEVENT_OUTOFCONTEXT)
+        self._refresh()
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread, time_ms):
+        self.wakeups.hit()
+        try:
+            if event in (self.EVENT_SYSTEM_FOREGROUND, self.EVENT_SYSTEM_MINIMIZEEND):
+                if hwnd != self.hwnd: self._focus(hwnd)
+                else: self._refresh()
+            elif hwnd == self.hwnd and id_object == self.OBJID_WINDOW and id_child == 0:
+                self._refresh()
+        except Exception: pass
+
+    def _refresh(self):
+        ctypes = self.ctypes
+        user32 = self.user32
+        hwnd = self.hwnd
+        if not hwnd:
+            self.publish(EMPTY_WINDOW); return
+
+        length = user32.GetWindowTextLengthW(hwnd)
+        if length + 1 > len(self.title_buf): self.title_buf = ctypes.create_unicode_buffer(length + 1)
+        user32.GetWindowTextW(hwnd, self.title_buf, len(self.title_buf))
+        user32.GetClassNameW(hwnd, self.class_buf, len(self.class_buf))
+        user32.GetWindowRect(hwnd, ctypes.byref(self.rect))
+        r = self.rect
+        self.publish(ForegroundWindow(self.title_buf.value, self.class_buf.value, (r.left, r.top, r.right, r.bottom), None))
+
+
+# --- macOS: NSWorkspace 激活通知 ---
+class MacWorkspaceProvider(ForegroundProvider):
+    def __init__(self):
+        super().__init__()
+        from AppKit import NSWorkspace, NSWorkspaceDidActivateApplicationNotification
+        self.workspace = NSWorkspace.sharedWorkspace()
+        self.notification = NSWorkspaceDidActivateApplicationNotification
+        self.observer = None
+
+    def start(self, callback):
+        super().start(callback)
+        # queue=None：通知在发送线程 (主线程 RunLoop，由 Qt 事件循环驱动) 上同步回调
+        self.observer = self.workspace.notificationCenter().addObserverForName_object_queue_usingBlock_(
+            self.notification, None, None, self._on_activate)
+        self._publish_app(self.workspace.frontmostApplication())
+
+    def stop(self):
+        if self.observer is not None:
+            self.workspace.notificationCenter().removeObserver_(self.observer)
+            self.observer = None
+
+    def _on_activate(self, note):
+        wakeup_counter("foreground").hit()
+        try: self._publish_app(note.userInfo()["NSWorkspaceApplicationKey"])
+        except Exception: pass
+
+    def _publish_app(self, app):
+        if app is None:
+            self.publish(EMPTY_WINDOW); return
+        self.publish(ForegroundWindow(str(app.localizedName() or ""), str(app.bundleIdentifier() or ""), None, False))
+
+
+# --- Linux / X11: EWMH _NET_ACTIVE_WINDOW 的 PropertyNotify ---
+class X11ActiveWindowProvider(ForegroundProvider):
+    def __init__(self):
+        super().__init__()
+        from Xlib import X, display
+        self.X = X
+        self.display = display.Display()
+        self.root = self.display.screen().root
+        atom = self.display.intern_atom
+        self.NET_ACTIVE_WINDOW = atom("_NET_ACTIVE_WINDOW")
+        self.NET_WM_NAME = atom("_NET_WM_NAME")
+        self.NET_WM_STATE = atom("_NET_WM_STATE")
+        self.NET_WM_STATE_FULLSCREEN = atom("_NET_WM_STATE_FULLSCREEN")
+        self.UTF8_STRING = atom("UTF8_STRING")
+        self.WM_NAME = atom("WM_NAME")
+        self.WAKEUP = atom("_GLOBAL_MOUSE_WAKEUP")
+        self.active = None
+        self.running = False
+
+    def start(self, callback):
+        super().start(callback)
+        self.root.change_attributes(event_mask=self.X.PropertyChangeMask)
+        # 一个不映射的小窗口，仅用于 stop() 时投递事件唤醒阻塞中的 next_event
+        self.wakeup_window = self.root.create_window(0, 0, 1, 1, 0, self.X.CopyFromParent)
+        self.display.flush()
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        if not self.running: return
+        self.running = False
+        from Xlib import display, protocol
+        d = display.Display()
+        w = d.create_resource_object("window", self.wakeup_window.id)
+        w.send_event(protocol.event.ClientMessage(window=w, client_type=self.WAKEUP, data=(32, [0, 0, 0, 0, 0])))
+        d.flush(); d.close()
+
+    def _run(self):
+        X = self.X
+        wakeups = wakeup_counter("foreground")
+        self._track()
+        while self.running:
+            ev = self.display.next_event()
+            wakeups.hit()
+            try:
+                if ev.type != X.PropertyNotify: continue
+                if ev.window == self.root:
+                    if ev.atom == self.NET_ACTIVE_WINDOW: self._track()
+                elif self.active is not None and ev.window.id == self.active.id \
+                        and ev.atom in (self.NET_WM_NAME, self.WM_NAME, self.NET_WM_STATE):
+                    self._refresh()
+            except Exception: pass
+        self.display.close()
+
+    def _track(self):
+        # 把 PropertyChangeMask 从旧的活动窗口移到新窗口上，以便感知标题与全屏变化
+        try:
+            prop = self.root.get_full_property(self.NET_ACTIVE_WINDOW, self.X.AnyPropertyType)
+            wid = prop.value[0] if prop and len(prop.value) else 0
+        except Exception: wid = 0
+        if self.active is not None and self.active.id != wid:
+            try: self.active.change_attributes(event_mask=self.X.NoEventMask)
+            except Exception: pass
+        self.active = self.display.create_resource_object("window", wid) if wid else None
+        if self.active is not None:
+            try: self.active.change_attributes(event_mask=self.X.PropertyChangeMask)
+            except Exception: self.active = None
+        self._refresh()
+
+    def _refresh(self):
+        w = self.active
+        if w is None:
+            self.publish(EMPTY_WINDOW); return
+        try:
+            prop = w.get_full_property(self.NET_WM_NAME, self.UTF8_STRING)
+            title = prop.value.decode("utf-8", "replace") if prop else (w.get_wm_name() or "")
+            wm_class = w.get_wm_class()
+            state = w.get_full_property(self.NET_WM_STATE, self.X.AnyPropertyType)
+            fullscreen = bool(state) and self.NET_WM_STATE_FULLSCREEN in state.value
+        except Exception:
+            return
+        self.publish(ForegroundWindow(str(title), wm_class[1] if wm_class else "", None, fullscreen))
+
+
+def default_provider():
+    # 按平台挑选事件驱动后端，依赖不可用时退回轮询
+    try:
+        if OS_NAME == "Windows": return WinEventProvider()
+        if OS_NAME == "Darwin": return MacWorkspaceProvider()
+        if OS_NAME == "Linux": return X11ActiveWindowProvider()
+    except Exception as e:
+        print(f"Foreground Provider Failed: {e}")
+    return fallback_provider()
+
+
+def fallback_provider():
+    # 旧版的定时轮询；没有任何查询方式的平台 (例如 Wayland) 只能不跟踪前台窗口：
+    # 按应用过滤、全屏判断与按应用切换预设都不生效，因此明确打印出来
+    if OS_NAME == "Windows": return PollingProvider(query_win32)
+    if OS_NAME == "Darwin": return PollingProvider(query_osascript)
+    print("Foreground Tracking Unavailable: 按应用过滤、全屏判断与按应用切换预设不会生效")
+    return ForegroundProvider()
+
+
+# --- 窗口侦听器 ---
+# 由前台窗口提供者推送变化，焦点不变时不做任何工作
+# screens() 返回当前的 screens.ScreenIndex，用于没有全屏标志的平台：窗口完整覆盖它所在的那块屏幕即为全屏
+class WindowMonitor:
+    def __init__(self, state, provider=None, screens=None, on_change=None):
+        self.state = state
+        self.provider = provider or default_provider()
+        self.screens = screens
+        self.on_change = on_change      # on_change(window)：前台窗口变化后在侦听线程调用 (按应用切换预设)
+        self.window = EMPTY_WINDOW      # 提供者给出的原始信息，屏幕布局变化后据此重新判断全屏
+
+    def start(self):
+        # 事件后端在启动时才挂钩子 (SetWinEventHook / X11 事件掩码)，这里失败同样退回轮询
+        try:
+            self.provider.start(self.on_foreground_changed)
+        except Exception as e:
+            print(f"Foreground Provider Failed: {e}")
+            self.provider = fallback_provider()
+            self.provider.start(self.on_foreground_changed)
+
+    def refresh(self):
+        # 屏幕增减或分辨率/缩放变化后调用
+        if self.window.fullscreen is None: self.on_foreground_changed(self.window)
+
+    def on_foreground_changed(self, window):
+        # 标题/类名/全屏作为一个元组整体替换，点击时读到的永远是同一个窗口的信息
+        self.window = window
+        if window.fullscreen is None:
+            screens = self.screens() if self.screens is not None else None
+            window = window._replace(fullscreen=bool(screens) and screens.covers(window.rect))
+        self.state.window = window
+        if self.on_change is not None: self.on_change(window)
@@ -0,0 +1,117 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import time
+
+from global_mouse.diagnostics import wakeup_counter
+
+# Qt 快捷键文本 (QKeySequence.toString) 与 pynput 键名的差异
+QT_TO_PYNPUT = {
+    'pgup': 'page_up', 'pgdown': 'page_down', 'ins': 'insert',
+    'del': 'delete', 'esc': 'esc', 'return': 'enter'
+}
+# pynput 的左右修饰键统一成 Qt 的写法
+MODIFIER_NAMES = {
+    'ctrl': 'ctrl', 'ctrl_l': 'ctrl', 'ctrl_r': 'ctrl',
+    'alt': 'alt', 'alt_l': 'alt', 'alt_r': 'alt', 'alt_gr': 'alt',
+    'shift': 'shift', 'shift_l': 'shift', 'shift_r': 'shift',
+    'cmd': 'meta', 'cmd_l': 'meta', 'cmd_r': 'meta',
+}
+
+# 可绑定的动作："preset:N" 表示切换到预设下拉框中的第 N 个预设
+PRESET_HOTKEY_SLOTS = 5
+HOTKEY_ACTIONS = ["toggle_pause", "cycle_curve"] + [f"preset:{i}" for i in range(1, PRESET_HOTKEY_SLOTS + 1)]
+HOTKEY_ACTION_NAMES = dict({"toggle_horizontal": "横向滚动开关", "toggle_pause": "暂停/恢复滚动", "cycle_curve": "循环切换曲线形状"},
+                           **{f"preset:{i}": f"切换到预设 {i}" for i in range(1, PRESET_HOTKEY_SLOTS + 1)})
+
+
+def parse_sequence(text):
+    # "Ctrl+Shift+H" -> frozenset({'ctrl', 'shift', 'h'})；空串或无法解析返回 None
+    if not text: return None
+    text = text.lower()
+    keys = [k for k in text.split('+') if k]
+    if text.endswith('++') or text == '+': keys.append('+')
+    if not keys: return None
+    return frozenset(QT_TO_PYNPUT.get(k, k) for k in keys)
+
+
+def key_to_name(key):
+    # pynput 的 Key / KeyCode -> 与 parse_sequence 同一套键名
+    name = getattr(key, 'name', None)
+    if name is not None: return MODIFIER_NAMES.get(name, name)
+    char = getattr(key, 'char', None)
+    if char and char >= ' ': return char.lower()
+    # Windows 上按住 Ctrl 时 char 是控制字符，退回虚拟键码
+    vk = getattr(key, 'vk', None)
+    if vk is not None and (0x41 <= vk <= 0x5A or 0x30 <= vk <= 0x39): return chr(vk).lower()
+    return None
+
+
+# --- 快捷键注册表 ---
+# 绑定变化时整体重建 frozenset -> 动作 的分发表 (引用替换)，按键时只做一次字典查找
+class HotkeyRegistry:
+    def __init__(self):
+        self.table = {}
+        self.names = {}
+
+    def compile(self, bindings):
+        # bindings: [(action, "Ctrl+Alt+P"), ...]；同一组合键绑定多次时以后者为准
+        table = {}
+        for action, sequence in bindings:
+            chord = parse_sequence(sequence)
+            if chord: table[chord] = action
+        self.table = table
+        return table
+
+    def key_name(self, key):
+        # 键名换算结果按键对象缓存，同一个键只换算一次
+        try: return self.names[key]
+        except KeyError: pass
+        except TypeError: return key_to_name(key)
+        name = self.names[key] = key_to_name(key)
+        return name
+
+    def lookup(self, pressed):
+        return self.table.get(frozenset(pressed))
+
+
+# --- 全局键盘监听器 ---
+# 没有任何快捷键绑定时彻底卸载键盘钩子，打字零开销；bridge_callback(action) 在钩子线程中调用
+class KeyboardManager:
+    def __init__(self, bridge_callback):
+        self.listener = None
+        self.registry = HotkeyRegistry()
+        self.wakeups = wakeup_counter("keyboard_hook")
+        self.current_keys = set()
+        self.bridge_callback = bridge_callback
+        self.stats = None
+
+    def set_bindings(self, bindings):
+        self.registry.compile(bindings)
+        if self.registry.table and self.listener is None:
+            from pynput import keyboard
+            self.current_keys.clear()
+            self.listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
+            self.listener.start()
+        elif not self.registry.table and self.listener is not None:
+            self.listener.stop(); self.listener = None
+
+    def on_press(self, key):
+        stats = self.stats
+        if stats is not None: started = time.perf_counter()
+        self.wakeups.hit()
+        key_name = self.registry.key_name(key)
+        # 按住不放时的系统连发不重复触发
+        if key_name is not None and key_name not in self.current_keys:
+            self.current_keys.add(key_name)
+            action = self.registry.lookup(self.current_keys)
+            if action: self.bridge_callback(action)
+        if stats is not None: stats.on_press.record(time.perf_counter() - started)
+
+    def on_release(self, key):
+        self.current_keys.discard(self.registry.key_name(key))
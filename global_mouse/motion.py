@@ -0,0 +1,76 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import time
+from array import array
+
+DEFAULT_CAPACITY = 256          # 必须是 2 的幂
+VELOCITY_WINDOW = 0.05          # 计算指针速度时回看的时间窗口 (秒)
+
+
+# --- 指针移动环形缓冲 ---
+# 鼠标钩子线程 (单写者) 在 on_move 里 push，引擎线程只读；预分配数组，运行中不再分配内存
+class MotionRing:
+    def __init__(self, capacity=DEFAULT_CAPACITY, clock=time.perf_counter):
+        if capacity & (capacity - 1): raise ValueError("capacity 必须是 2 的幂")
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.clock = clock
+        self.ts = array('d', bytes(8 * capacity))
+        self.xs = array('d', bytes(8 * capacity))
+        self.ys = array('d', bytes(8 * capacity))
+        self.head = 0   # 已写入的样本总数，写完数据后才递增
+
+    def push(self, x, y, t=None):
+        i = self.head & self.mask
+        self.ts[i] = self.clock() if t is None else t
+        self.xs[i] = x
+        self.ys[i] = y
+        self.head += 1
+
+    def clear(self):
+        self.head = 0
+
+    def latest(self):
+        # 返回 (t, x, y)；读取期间若写者绕了一整圈则重读
+        while True:
+            head = self.head
+            if not head: return None
+            i = (head - 1) & self.mask
+            sample = (self.ts[i], self.xs[i], self.ys[i])
+            if self.head - head < self.capacity - 1: return sample
+
+    def position(self):
+        head = self.head
+        if not head: return None
+        i = (head - 1) & self.mask
+        return self.xs[i], self.ys[i]
+
+    def history(self, count):
+        # 最近 count 个样本，按时间从旧到新
+        head = self.head
+        count = min(count, head, self.capacity - 1)
+        mask = self.mask
+        return [(self.ts[j & mask], self.xs[j & mask], self.ys[j & mask]) for j in range(head - count, head)]
+
+    def velocity(self, window=VELOCITY_WINDOW, now=None):
+        # 窗口内样本做最小二乘拟合得到平滑速度 (像素/秒)；样本不足时返回 (0, 0)
+        head = self.head
+        if head < 2: return 0.0, 0.0
+        mask = self.mask
+        t_end = self.ts[(head - 1) & mask] if now is None else now
+        n = 0; st = sx = sy = stt = stx = sty = 0.0
+        for j in range(head - 1, max(head - self.capacity + 1, 0) - 1, -1):
+            i = j & mask
+            t = self.ts[i] - t_end
+            if t < -window: break
+            x = self.xs[i]; y = self.ys[i]
+            n += 1; st += t; sx += x; sy += y; stt += t * t; stx += t * x; sty += t * y
+        denom = n * stt - st * st
+        if n < 2 or denom <= 0: return 0.0, 0.0
+        return (n * stx - st * sx) / denom, (n * sty - st * sy) / denom
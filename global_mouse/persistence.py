@@ -0,0 +1,167 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import os
+import json
+import time
+import tempfile
+import threading
+
+from global_mouse.diagnostics import wakeup_counter
+
+SAVE_DELAY = 0.5            # 最后一次修改后安静多久再写盘 (秒)
+SAVE_MAX_DELAY = 2.0        # 连续不断修改时最多推迟多久 (秒)
+
+
+def default_config_path():
+    # 调用时才展开用户目录 (基准与测试会在导入后改写 HOME)
+    return os.path.join(os.path.expanduser("~"), ".global_mouse_config.json")
+
+
+def encode(data):
+    # 保持缩进格式，方便手工编辑与部署脚本修改
+    return json.dumps(data, ensure_ascii=False, indent=4).encode("utf-8")
+
+
+# --- 配置文件读写 ---
+# save() 只登记最新数据并唤醒写线程，GUI 线程不做序列化和磁盘 IO；短时间内的多次修改合并成一次写入
+# 写入走 "临时文件 + fsync + rename"，中途崩溃或断电时磁盘上要么是旧文件要么是新文件
+# reload() 用于热加载：文件内容和自己上次读/写的一致时返回 None，外部修改时返回解析后的数据
+class ConfigFile:
+    def __init__(self, path, delay=SAVE_DELAY, max_delay=SAVE_MAX_DELAY):
+        self.path = path
+        self.delay = delay
+        self.max_delay = max_delay
+        self.wakeups = wakeup_counter("config_writer")
+        self.contents = None        # 最近一次读到或写出的文件字节
+        self.stamp = None           # 对应的 (mtime_ns, size)
+        self.writes = 0
+        self.requests = 0
+        self.errors = 0
+        self.last_error = None
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending = None
+        self._first_at = 0.0
+        self._changed_at = 0.0
+        self._closing = False
+        self._thread = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read(self):
+        stamp = self._stat()
+        if stamp is None: return None, None
+        with open(self.path, "rb") as f: return f.read(), stamp
+
+    def load(self):
+        # 文件不存在返回 None；内容损坏时报告错误并返回 None，下次保存会覆盖
+        try:
+            raw, stamp = self._read()
+            if raw is None: return None
+            data = json.loads(raw.decode("utf-8"))
+        except (OSError, ValueError) as e:
+            self.errors += 1; self.last_error = e
+            print(f"Config Load Failed: {e}")
+            return None
+        self.contents, self.stamp = raw, stamp
+        return data
+
+    def reload(self):
+        if self._stat() == self.stamp: return None
+        with self._write_lock:
+            try:
+                raw, stamp = self._read()
+            except OSError:
+                return None
+            if raw is None or raw == self.contents:
+                self.stamp = stamp
+                return None
+            try:
+                data = json.loads(raw.decode("utf-8"))
+            except ValueError:
+                # 外部程序可能还没写完 (非原子写入)，等下一次变化通知
+                return None
+            self.contents, self.stamp = raw, stamp
+        return data
+
+    def save(self, data):
+        # data 交给写线程后不得再被修改，调用方传入浅拷贝
+        with self._cond:
+            now = time.monotonic()
+            if self._pending is None: self._first_at = now
+            self._pending = data
+            self._changed_at = now
+            self.requests += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="config_writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self):
+        # 立即写出尚未落盘的修改 (退出前调用)
+        with self._cond:
+            data, self._pending = self._pending, None
+        if data is not None: self.write(data)
+
+    def close(self):
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                # 没有待写数据时无限期等待，空闲时该线程零唤醒
+                while self._pending is None and not self._closing: self._cond.wait()
+                if self._pending is None: return
+                while not self._closing:
+                    now = time.monotonic()
+                    due = min(self._changed_at + self.delay, self._first_at + self.max_delay)
+                    if now >= due: break
+                    self._cond.wait(due - now)
+                data, self._pending = self._pending, None
+            if data is None: continue
+            self.wakeups.hit()
+            self.write(data)
+
+    def write(self, data):
+        raw = encode(data)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with self._write_lock:
+            tmp = None
+            try:
+                fd, tmp = tempfile.mkstemp(prefix=".global_mouse_config.", suffix=".tmp", dir=directory)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(raw); f.flush(); os.fsync(f.fileno())
+                # 先登记内容再替换，监视器随后看到的变化能被识别为自己写的
+                self.contents = raw
+                os.replace(tmp, self.path)
+            except OSError as e:
+                if tmp is not None:
+                    try: os.unlink(tmp)
+                    except OSError: pass
+                self.errors += 1; self.last_error = e
+                print(f"Config Save Failed: {e}")
+                return False
+            if hasattr(os, "O_DIRECTORY"):
+                # rename 本身也要落盘 (POSIX)；Windows 上 os.replace 返回即已持久
+                try:
+                    dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                    try: os.fsync(dir_fd)
+                    finally: os.close(dir_fd)
+                except OSError: pass
+            self.stamp = self._stat()
+            self.writes += 1
+        return True
@@ -0,0 +1,75 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import math
+
+from global_mouse.engine import POINTER_ABSOLUTE, POINTER_CONFINE
+from global_mouse.screens import contains
+
+# 锚点离屏幕边缘至少这么多像素 (物理)：一个 tick 内的移动不会撞上边缘被系统截断
+EDGE_MARGIN = 100
+
+
+# --- 相对位移指针 ---
+# 绝对模式下速度取决于指针离原点的距离，在屏幕边缘附近激活时指针撞到边缘就再也快不起来。
+# 相对模式下引擎看到的是虚拟位置 = 原点 + 累积位移：指针每次被移回锚点前，把它离开锚点的位移记入虚拟偏移，
+# 虚拟偏移不受屏幕边缘限制，最高速度只由曲线决定。
+#   recenter：每个 tick 都把指针移回锚点 (指针看上去停在原处)
+#   confine：指针在所在屏幕内 (留出边距) 自由移动，快到边缘时才移回锚点
+# controller 为 pynput 的 mouse.Controller (读写 .position，与钩子同一坐标系)，screens() 返回 ScreenIndex；
+# 所有方法都在引擎线程中调用
+class RelativePointer:
+    def __init__(self, controller, screens=None, margin=EDGE_MARGIN):
+        self.controller = controller
+        self.screens = screens
+        self.margin = margin
+        self.mode = POINTER_ABSOLUTE
+        self.origin = (0, 0)
+        self.anchor = (0, 0)
+        self.bounds = None      # confine 模式下指针可自由移动的区域 (left, top, width, height)，None 表示每次都移回
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.warps = 0
+
+    def begin(self, origin, mode):
+        # 新的一次激活；返回是否使用相对位移。锚点为原点，原点离屏幕边缘太近时挪到边距以内并把指针移过去
+        self.mode = mode
+        if mode == POINTER_ABSOLUTE: return False
+        self.origin = origin
+        self.offset_x = self.offset_y = 0.0
+        self.anchor, self.bounds = origin, None
+        screen = self.screens().screen_at(*origin) if self.screens is not None else None
+        if screen is not None:
+            left, top, width, height = screen.physical
+            m = min(self.margin, width // 4, height // 4)
+            inner = (left + m, top + m, width - 2 * m, height - 2 * m)
+            self.anchor = (min(max(origin[0], inner[0]), inner[0] + inner[2] - 1), min(max(origin[1], inner[1]), inner[1] + inner[3] - 1))
+            if mode == POINTER_CONFINE: self.bounds = inner
+        if self.anchor != tuple(origin): self.move_to(self.anchor)
+        return True
+
+    def move_to(self, pos):
+        self.controller.position = pos
+        self.warps += 1
+
+    def position(self, limit):
+        # 虚拟位置；limit 为曲线查表覆盖的距离，超出的部分不再累积 (往回拉时立即减速，而不是先退回多余的位移)
+        x, y = self.controller.position
+        ax, ay = self.anchor
+        dx, dy = x - ax, y - ay
+        if (dx or dy) and (self.bounds is None or not contains(self.bounds, x, y)):
+            self.offset_x += dx; self.offset_y += dy
+            dx = dy = 0
+            self.move_to(self.anchor)
+        vx, vy = self.offset_x + dx, self.offset_y + dy
+        dist = math.hypot(vx, vy)
+        if dist > limit:
+            k = limit / dist
+            vx *= k; vy *= k
+            self.offset_x, self.offset_y = vx - dx, vy - dy
+        return self.origin[0] + vx, self.origin[1] + vy
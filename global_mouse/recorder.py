@@ -0,0 +1,249 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import sys
+import json
+import time
+import struct
+from array import array
+from collections import deque
+
+import zstandard
+
+from global_mouse.backends import RecordingBackend
+from global_mouse.config import ConfigStore, ConfigSnapshot, RuntimeState
+from global_mouse.engine import ScrollEngine, VirtualClock
+
+FORMAT_VERSION = 1
+FILE_MAGIC = b"GMREC\x00\x01\x00"
+DEFAULT_SAMPLES = 65536         # 单次会话最多记录的 advance 次数 (1000Hz 约 65 秒)，超出后截断
+DEFAULT_SESSIONS = 32           # 内存中保留最近多少个压缩后的会话
+ZSTD_LEVEL = 9
+
+FLAG_ACTIVE = 1                 # 该次 advance 时仍处于激活状态 (否则为惯性滑行)
+FLAG_HALT = 2                   # 该次 advance 之前滑行被左/右键打断
+
+# 会话按列存储：advance 时刻 / 读到的指针位置 / 标志，以及每次输出的 (advance 序号, sx, sy)
+SAMPLE_COLUMNS = (("t", "d"), ("x", "d"), ("y", "d"), ("flags", "B"))
+OUTPUT_COLUMNS = (("index", "I"), ("sx", "i"), ("sy", "i"))
+
+
+# --- 会话录制器 ---
+# 所有 begin/sample/output/end 调用都在引擎线程中；数组在构造时一次性分配，录制过程中不再分配内存
+# 会话结束时打包压缩成 bytes 放进有界队列，save() 可在任意线程调用
+class SessionRecorder:
+    def __init__(self, capacity=DEFAULT_SAMPLES, max_sessions=DEFAULT_SESSIONS, level=ZSTD_LEVEL):
+        self.capacity = capacity
+        self.samples = {name: array(code, bytes(array(code).itemsize * capacity)) for name, code in SAMPLE_COLUMNS}
+        self.outputs = {name: array(code, bytes(array(code).itemsize * capacity)) for name, code in OUTPUT_COLUMNS}
+        self.sessions = deque(maxlen=max_sessions)
+        self.compressor = zstandard.ZstdCompressor(level=level)
+        self.recording = False
+        self.header = None
+        self.n = 0
+        self.m = 0
+        self.pending_flags = 0
+        self.truncated = False
+
+    def begin(self, engine, origin, window=None):
+        # 新的一次激活：上一个会话 (滑行途中再次激活) 先收尾
+        if self.recording: self.end()
+        snap = engine.snapshot
+        self.header = {
+            "version": FORMAT_VERSION, "started": time.time(), "origin": list(origin),
+            "config": snap.to_dict(), "config_changes": [],
+            "steps_per_unit": engine.steps_per_unit, "base_multiplier": engine.base_multiplier,
+            "frame_interval": engine.frame_interval, "platform": sys.platform, "byteorder": sys.byteorder,
+            "window": [window.title, window.window_class] if window is not None else None,
+        }
+        self.n = self.m = 0
+        self.pending_flags = 0
+        self.truncated = False
+        self.recording = True
+
+    def halt(self):
+        self.pending_flags |= FLAG_HALT
+
+    def config(self, snapshot):
+        if self.recording: self.header["config_changes"].append([self.n, snapshot.to_dict()])
+
+    def sample(self, now, x, y, active):
+        n = self.n
+        if n >= self.capacity:
+            self.truncated = True
+            return
+        s = self.samples
+        s["t"][n] = now; s["x"][n] = x; s["y"][n] = y
+        s["flags"][n] = (FLAG_ACTIVE if active else 0) | self.pending_flags
+        self.pending_flags = 0
+        self.n = n + 1
+
+    def output(self, sx, sy):
+        m = self.m
+        if m >= self.capacity or self.truncated: return
+        o = self.outputs
+        o["index"][m] = self.n - 1; o["sx"][m] = sx; o["sy"][m] = sy
+        self.m = m + 1
+
+    def end(self):
+        if not self.recording: return None
+        self.recording = False
+        if not self.n: return None
+        header = dict(self.header, samples=self.n, outputs=self.m, truncated=self.truncated)
+        blob = self.compressor.compress(pack(header, self.samples, self.outputs, self.n, self.m))
+        self.sessions.append(blob)
+        return blob
+
+    def save(self, path):
+        blobs = list(self.sessions)
+        with open(path, "wb") as f:
+            f.write(FILE_MAGIC)
+            for blob in blobs:
+                f.write(struct.pack("<I", len(blob)))
+                f.write(blob)
+        return len(blobs)
+
+
+def shuffle(data, itemsize):
+    # 按字节位置重排 (所有元素的第 0 字节、第 1 字节……)，相邻时间戳/坐标的高位字节几乎不变，zstd 压缩率大幅提高
+    if itemsize == 1: return data
+    return b"".join(data[i::itemsize] for i in range(itemsize))
+
+
+def unshuffle(data, itemsize):
+    if itemsize == 1: return data
+    count = len(data) // itemsize
+    out = bytearray(len(data))
+    for i in range(itemsize): out[i::itemsize] = data[i * count:(i + 1) * count]
+    return bytes(out)
+
+
+def pack(header, samples, outputs, n, m):
+    # [头部长度 uint32][头部 JSON][各列数组按顺序首尾相接，每列按字节重排]；按列排放压缩率更高
+    head = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    parts = [struct.pack("<I", len(head)), head]
+    for columns, count, names in ((samples, n, SAMPLE_COLUMNS), (outputs, m, OUTPUT_COLUMNS)):
+        for name, _ in names:
+            column = columns[name]
+            parts.append(shuffle(memoryview(column)[:count].tobytes(), column.itemsize))
+    return b"".join(parts)
+
+
+# --- 读取 ---
+class Session:
+    def __init__(self, header, columns):
+        self.header = header
+        self.columns = columns
+
+    @classmethod
+    def unpack(cls, blob):
+        data = zstandard.ZstdDecompressor().decompress(blob)
+        size, = struct.unpack_from("<I", data)
+        header = json.loads(data[4:4 + size].decode("utf-8"))
+        offset = 4 + size
+        columns = {}
+        for names, count in ((SAMPLE_COLUMNS, header["samples"]), (OUTPUT_COLUMNS, header["outputs"])):
+            for name, code in names:
+                column = array(code)
+                nbytes = column.itemsize * count
+                column.frombytes(unshuffle(data[offset:offset + nbytes], column.itemsize))
+                if header["byteorder"] != sys.byteorder: column.byteswap()
+                columns[name] = column
+                offset += nbytes
+        return cls(header, columns)
+
+    def output_bytes(self):
+        return b"".join(self.columns[name].tobytes() for name, _ in OUTPUT_COLUMNS)
+
+    def duration(self):
+        t = self.columns["t"]
+        return t[-1] - t[0] if len(t) > 1 else 0.0
+
+
+def load_sessions(path):
+    with open(path, "rb") as f: data = f.read()
+    if not data.startswith(FILE_MAGIC): raise ValueError("不是 Global Mouse 会话录制文件")
+    sessions, offset = [], len(FILE_MAGIC)
+    while offset < len(data):
+        size, = struct.unpack_from("<I", data, offset)
+        offset += 4
+        sessions.append(Session.unpack(data[offset:offset + size]))
+        offset += size
+    return sessions
+
+
+# --- 确定性回放 ---
+# 用录下的 advance 时刻驱动虚拟时钟，用录下的指针读数代替 get_position；overrides 可替换配置项做离线对比
+def replay(session, overrides=None):
+    header, cols = session.header, session.columns
+    snapshot = ConfigSnapshot.from_dict(header["config"])
+    if overrides: snapshot = snapshot.replace(**overrides)
+    store = ConfigStore(snapshot)
+    changes = {index: ConfigSnapshot.from_dict(values) for index, values in header["config_changes"]}
+    clock = VirtualClock(cols["t"][0] if len(cols["t"]) else 0.0)
+    cursor = [0]
+    xs, ys = cols["x"], cols["y"]
+    output = RecordingBackend(header["steps_per_unit"], clock=clock.now)
+    engine = ScrollEngine(store, RuntimeState(), lambda: (xs[cursor[0]], ys[cursor[0]]), output, clock=clock,
+                          base_multiplier=header["base_multiplier"])
+    engine.reset()
+    engine.frame_interval = header["frame_interval"]
+    recorder = SessionRecorder(capacity=max(1, header["samples"]), max_sessions=1)
+    recorder.begin(engine, header["origin"])
+    engine.recorder = recorder
+
+    origin = tuple(header["origin"])
+    for i, now in enumerate(cols["t"]):
+        if i in changes:
+            snap = changes[i].replace(**overrides) if overrides else changes[i]
+            store.publish(snap)
+        flags = cols["flags"][i]
+        if flags & FLAG_HALT:
+            engine.vx = engine.vy = 0.0
+            recorder.halt()
+        cursor[0] = i
+        clock.t = now
+        engine.advance(origin, now, bool(flags & FLAG_ACTIVE))
+    return Session.unpack(recorder.end())
+
+
+def verify(session):
+    # 回放输出与录制输出逐字节相同时返回 True
+    return replay(session).output_bytes() == session.output_bytes()
+
+
+def main(argv=None):
+    # python -m global_mouse.recorder sessions.gmrec [curve_type=bezier sensitivity=2.5 ...]
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("用法: python -m global_mouse.recorder <录制文件> [配置项=值 ...]")
+        return 2
+    overrides = {}
+    for item in argv[1:]:
+        name, _, value = item.partition("=")
+        try: overrides[name] = json.loads(value)
+        except ValueError: overrides[name] = value
+    failed = 0
+    for i, session in enumerate(load_sessions(argv[0])):
+        header = session.header
+        ok = verify(session)
+        failed += not ok
+        window = header.get("window") or ["", ""]
+        line = (f"#{i}  {session.duration():6.2f}s  {header['samples']:6d} 次 advance  {header['outputs']:6d} 次输出  "
+                f"回放{'一致' if ok else '不一致'}{'  (已截断)' if header['truncated'] else ''}  {window[0]}")
+        if overrides:
+            changed = replay(session, overrides)
+            before = (sum(session.columns["sx"]), sum(session.columns["sy"]))
+            after = (sum(changed.columns["sx"]), sum(changed.columns["sy"]))
+            line += f"\n     输出总量 {before} -> {after}，输出次数 {header['outputs']} -> {changed.header['outputs']}"
+        print(line)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import platform
+from collections import namedtuple
+
+OS_NAME = platform.system()
+
+# 一块屏幕：logical 为界面坐标 (Qt)，physical 为输入钩子/系统窗口矩形的坐标 (pynput、GetWindowRect)，均为 (left, top, width, height)
+# 只有 Windows 的高 DPI 屏幕两者不同；rate 为刷新率 (Hz)，未知时为 None
+Screen = namedtuple("Screen", "name logical physical scale rate")
+
+
+def contains(rect, x, y):
+    left, top, width, height = rect
+    return left <= x < left + width and top <= y < top + height
+
+
+def distance2(rect, x, y):
+    # 点到矩形的距离平方 (在矩形内为 0)
+    left, top, width, height = rect
+    dx = left - x if x < left else (x - (left + width) if x >= left + width else 0)
+    dy = top - y if y < top else (y - (top + height) if y >= top + height else 0)
+    return dx * dx + dy * dy
+
+
+def overlap(rect, window):
+    # 屏幕矩形 (left, top, width, height) 与窗口矩形 (left, top, right, bottom) 的重叠面积
+    left, top, width, height = rect
+    w = min(left + width, window[2]) - max(left, window[0])
+    h = min(top + height, window[3]) - max(top, window[1])
+    return w * h if w > 0 and h > 0 else 0
+
+
+# --- 屏幕布局索引 ---
+# 布局不可变：屏幕增减、分辨率/缩放/刷新率变化时整体换一个新索引，其他线程读到的总是一份完整的布局
+# 第一项为主屏；点或窗口不在任何屏幕上时取最近的屏幕 (与系统把窗口放到最近显示器的规则一致)
+# 查找先试上一次命中的屏幕：指针和前台窗口绝大多数时候都停在同一块屏幕上
+class ScreenIndex:
+    def __init__(self, screens=()):
+        self.screens = tuple(screens)
+        self.primary = self.screens[0] if self.screens else None
+        self.last = self.primary
+
+    def __len__(self):
+        return len(self.screens)
+
+    @classmethod
+    def from_rates(cls, rates):
+        # [(left, top, width, height, rate), ...] (物理坐标，引擎子进程的控制区格式) -> 索引
+        return cls(Screen(f"screen{i}", tuple(r[:4]), tuple(r[:4]), 1.0, r[4] or None) for i, r in enumerate(rates))
+
+    def rates(self):
+        return tuple(tuple(screen.physical) + (screen.rate or 0.0,) for screen in self.screens)
+
+    def at(self, x, y, physical=True):
+        # 包含该点的屏幕，不在任何屏幕上时为 None
+        field = 2 if physical else 1
+        last = self.last
+        if last is not None and contains(last[field], x, y): return last
+        for screen in self.screens:
+            if contains(screen[field], x, y):
+                self.last = screen
+                return screen
+        return None
+
+    def screen_at(self, x, y, physical=True):
+        # 包含该点的屏幕，否则最近的屏幕；没有屏幕信息时为 None
+        screen = self.at(x, y, physical)
+        if screen is not None or not self.screens: return screen
+        field = 2 if physical else 1
+        return min(self.screens, key=lambda s: distance2(s[field], x, y))
+
+    def for_rect(self, window, physical=True):
+        # 窗口矩形 (left, top, right, bottom) 所在的屏幕：重叠面积最大的一块，完全不重叠时取离窗口中心最近的
+        if not self.screens or not window: return None
+        field = 2 if physical else 1
+        last = self.last
+        if last is not None and inside(window, last[field]): return last
+        best, area = None, 0
+        for screen in self.screens:
+            a = overlap(screen[field], window)
+            if a > area: best, area = screen, a
+        if best is None: return self.screen_at((window[0] + window[2]) / 2, (window[1] + window[3]) / 2, physical)
+        self.last = best
+        return best
+
+    def covers(self, window, physical=True):
+        # 全屏判断：窗口完整覆盖它所在的那块屏幕 (副屏上的全屏程序也算，最大化但留出任务栏的窗口不算)
+        screen = self.for_rect(window, physical)
+        return screen is not None and covers_rect(window, screen[2 if physical else 1])
+
+    def refresh_rate(self, pos):
+        # 引擎在每次激活时调用，pos 为输入钩子坐标 (物理)
+        screen = self.screen_at(pos[0], pos[1])
+        return screen.rate if screen is not None else None
+
+    def to_logical(self, x, y):
+        # 物理坐标 -> 界面坐标 (按该点所在屏幕的比例换算)
+        screen = self.screen_at(x, y)
+        if screen is None: return x, y
+        (ll, lt, lw, lh), (pl, pt, pw, ph) = screen.logical, screen.physical
+        return ll + (x - pl) * lw / pw, lt + (y - pt) * lh / ph
+
+    def to_physical(self, x, y):
+        screen = self.screen_at(x, y, physical=False)
+        if screen is None: return x, y
+        (ll, lt, lw, lh), (pl, pt, pw, ph) = screen.logical, screen.physical
+        return pl + (x - ll) * pw / lw, pt + (y - lt) * ph / lh
+
+
+def inside(window, rect):
+    left, top, width, height = rect
+    return window[0] >= left and window[1] >= top and window[2] <= left + width and window[3] <= top + height
+
+
+def covers_rect(window, rect):
+    left, top, width, height = rect
+    return window[0] <= left and window[1] <= top and window[2] >= left + width and window[3] >= top + height
+
+
+def system_screens():
+    # 无 Qt 的进程 (后台实例) 使用：Windows 上枚举全部显示器 (与 GetWindowRect 同一坐标系)；
+    # 其他平台的前台窗口提供者直接给出全屏标志，返回空索引。开销很小，前台窗口每次变化时重新枚举，热插拔后自然更新
+    if OS_NAME != "Windows": return ScreenIndex()
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class MONITORINFOEXW(ctypes.Structure):
+            _fields_ = [("cbSize", wintypes.DWORD), ("rcMonitor", wintypes.RECT), ("rcWork", wintypes.RECT),
+                        ("dwFlags", wintypes.DWORD), ("szDevice", wintypes.WCHAR * 32)]
+
+        user32 = ctypes.windll.user32
+        screens = []
+
+        def callback(hmonitor, hdc, clip, data):
+            info = MONITORINFOEXW()
+            info.cbSize = ctypes.sizeof(info)
+            if user32.GetMonitorInfoW(hmonitor, ctypes.byref(info)):
+                r = info.rcMonitor
+                rect = (r.left, r.top, r.right - r.left, r.bottom - r.top)
+                screen = Screen(info.szDevice, rect, rect, 1.0, None)
+                if info.dwFlags & 1: screens.insert(0, screen)     # MONITORINFOF_PRIMARY
+                else: screens.append(screen)
+            return True
+
+        proc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HMONITOR, wintypes.HDC, ctypes.POINTER(wintypes.RECT), wintypes.LPARAM)
+        user32.EnumDisplayMonitors(None, None, proc(callback), 0)
+        return ScreenIndex(screens)
+    except Exception:
+        return ScreenIndex()
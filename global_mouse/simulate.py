@@ -0,0 +1,272 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import sys
+import csv
+import json
+import math
+import argparse
+import itertools
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from global_mouse.config import ConfigSnapshot
+from global_mouse.curves import compile_curve
+from global_mouse.engine import BASE_MULTIPLIER
+
+# 离线批量模拟：很多条指针轨迹 × 很多组候选预设，一次性用 NumPy 数组算完，用来比较灵敏度/基础速度/死区等参数
+# 与 ScrollEngine 用同一张曲线查找表、同样的积分与整数步输出规则，假设引擎每个 tick 都按时醒来 (固定节奏、无迟到)
+# 录制下来的真实调度 (迟到补算、按屏幕刷新率输出) 仍以 recorder.replay() 为准
+# numpy 只有这个工具需要，程序本身不依赖它 (可选依赖：pip install "global-mouse[sim]")
+NUMPY_HINT = '离线模拟需要 numpy：pip install "global-mouse[sim]" (或 pip install numpy)'
+
+DEFAULT_TARGET = 30.0           # "到达目标偏移" 的目标：累计滚动 30 格
+DEFAULT_TAIL = 3.0              # 轨迹结束 (松开) 后最多再模拟多少秒惯性滑行
+CHUNK_TICKS = 256               # 目标速度按时间分块计算，数组大小与轨迹长度无关
+RESULT_FIELDS = ("trace", "preset", "tick_rate", "distance", "net_x", "net_y", "time_to_target", "peak_speed", "events")
+
+
+# --- 指针轨迹 ---
+# t 为从激活开始的秒数 (升序)，dx / dy 为相对原点的指针偏移 (像素)，active 为该时刻是否仍处于激活状态
+# 两次采样之间保持上一次的读数 (与引擎每次醒来读一次指针位置相同)；最后一次采样之后视为已松开
+class Trace:
+    def __init__(self, name, t, dx, dy, active=None):
+        self.name = name
+        self.t = np.asarray(t, dtype=float)
+        self.dx = np.asarray(dx, dtype=float)
+        self.dy = np.asarray(dy, dtype=float)
+        self.active = np.ones(len(self.t), dtype=bool) if active is None else np.asarray(active, dtype=bool)
+
+    def duration(self):
+        return float(self.t[-1]) if len(self.t) else 0.0
+
+    def sample(self, times):
+        # 各 tick 时刻读到的 (dx, dy, active)
+        idx = np.maximum(np.searchsorted(self.t, times, side="right") - 1, 0)
+        return self.dx[idx], self.dy[idx], self.active[idx] & (times <= self.duration())
+
+
+def ramp_trace(distance, angle=90.0, ramp=0.25, hold=1.0, rate=1000.0, name=None):
+    # 合成轨迹：ramp 秒内把指针从原点匀速拉到 distance 像素处 (angle 为方向，90 为向下)，停留 hold 秒后松开
+    t = np.arange(0.0, ramp + hold, 1.0 / rate)
+    r = distance * np.minimum(t / ramp, 1.0) if ramp > 0 else np.full(len(t), float(distance))
+    a = math.radians(angle)
+    return Trace(name or f"ramp{distance:g}@{angle:g}/{ramp:g}s", t, r * math.cos(a), r * math.sin(a))
+
+
+def synthetic_traces(distances=(40, 80, 150, 300, 600), angles=(90, 270, 60), ramps=(0.1, 0.4), hold=1.0):
+    return [ramp_trace(d, a, r, hold) for d, a, r in itertools.product(distances, angles, ramps)]
+
+
+def session_trace(session, name):
+    # recorder.Session (一次激活) -> 轨迹；指针位置换算成相对原点的偏移
+    from global_mouse.recorder import FLAG_ACTIVE
+    cols, origin = session.columns, session.header["origin"]
+    t = np.frombuffer(cols["t"], dtype=float)
+    flags = np.frombuffer(cols["flags"], dtype=np.uint8)
+    return Trace(name, t - t[0], np.frombuffer(cols["x"], dtype=float) - origin[0],
+                 np.frombuffer(cols["y"], dtype=float) - origin[1], (flags & FLAG_ACTIVE) != 0)
+
+
+# --- 候选预设 ---
+def preset_grid(base=None, **axes):
+    # preset_grid(sensitivity=[1.5, 2, 2.5], dead_zone=[10, 20]) -> {"sensitivity=1.5 dead_zone=10": 快照, ...}
+    base = base or ConfigSnapshot()
+    names = list(axes)
+    return {" ".join(f"{n}={v:g}" if isinstance(v, (int, float)) else f"{n}={v}" for n, v in zip(names, values)):
+            base.replace(**dict(zip(names, values))) for values in itertools.product(*(axes[n] for n in names))}
+
+
+# --- 目标速度 (与 ScrollEngine.velocity 相同的算式，只是对整块数组计算) ---
+def target_velocity(curve, dx, dy, horizontal):
+    if not horizontal: dx = np.zeros_like(dx)
+    dist = np.hypot(dx, dy)
+    speed = np.zeros_like(dist)
+    near = (dist > curve.dead_zone) & (dist < curve.limit)
+    if near.any():
+        table = np.asarray(curve.table)
+        d = dist[near]
+        i = d.astype(np.int64)
+        a = table[i]
+        speed[near] = (a + (table[i + 1] - a) * (d - i)) / d
+    far = (dist > curve.dead_zone) & ~near
+    if far.any(): speed[far] = [curve.evaluate(d) / d for d in dist[far]]
+    return dx * speed, dy * speed * -1
+
+
+def simulate(traces, presets, target=DEFAULT_TARGET, steps_per_unit=1, base_multiplier=BASE_MULTIPLIER, tail=DEFAULT_TAIL):
+    # presets: {名称: ConfigSnapshot 或配置 dict}；返回每个 (轨迹, 预设) 组合一行，按轨迹、预设顺序排列
+    if np is None: raise ImportError(NUMPY_HINT)
+    snapshots = [(name, p if isinstance(p, ConfigSnapshot) else ConfigSnapshot.from_dict(p)) for name, p in presets.items()]
+    order = {name: i for i, (name, _) in enumerate(snapshots)}
+    keyed = []
+    # 同一 tick 频率的预设共享时间轴，一起计算
+    for tick_rate in sorted({snap.tick_rate for _, snap in snapshots}):
+        group = [(name, snap) for name, snap in snapshots if snap.tick_rate == tick_rate]
+        keyed += simulate_group(traces, group, tick_rate, target, steps_per_unit, base_multiplier, tail)
+    keyed.sort(key=lambda item: (item[0], order[item[1]["preset"]]))
+    return [row for _, row in keyed]
+
+
+def simulate_group(traces, presets, tick_rate, target, spu, base_multiplier, tail):
+    # 组合 c = 轨迹序号 * P + 预设序号；时间维逐 tick 推进，每一步都是长度为 C 的向量运算
+    # 返回 [(轨迹序号, 结果行)]，供 simulate() 把各 tick 频率的分组合并排序
+    dt = 1.0 / tick_rate
+    T, P = len(traces), len(presets)
+    C = T * P
+    end = max(trace.duration() for trace in traces)
+    K = int((end + tail) / dt) + 1
+    # 与引擎的 next_deadline += dt 逐次累加得到同样的浮点时刻
+    times = np.cumsum(np.concatenate(([0.0], np.full(K - 1, dt))))
+
+    curves = [compile_curve(snap, base_multiplier) for _, snap in presets]
+    horizontal = [snap.enable_horizontal for _, snap in presets]
+    decay = np.tile([math.exp(-max(0.0, snap.friction) * dt) if snap.inertia else 0.0 for _, snap in presets], T)
+    cutoff2 = np.tile([max(0.0, snap.glide_cutoff) ** 2 for _, snap in presets], T)
+
+    vx, vy = np.zeros(C), np.zeros(C)
+    ix, iy = np.zeros(C), np.zeros(C)          # 已积分的滚动量 (格)
+    ex, ey = np.zeros(C), np.zeros(C)          # 已输出的整数步
+    path = np.zeros(C)
+    events = np.zeros(C, dtype=np.int64)
+    peak2 = np.zeros(C)
+    reached = np.full(C, np.nan)
+    goal2 = (target * spu) ** 2
+    tx, ty = np.empty((C, CHUNK_TICKS)), np.empty((C, CHUNK_TICKS))
+
+    for start in range(0, K, CHUNK_TICKS):
+        chunk = times[start:start + CHUNK_TICKS]
+        n = len(chunk)
+        if chunk[0] > end and not (vx.any() or vy.any()): break
+        samples = [trace.sample(chunk) for trace in traces]
+        dx = np.stack([s[0] for s in samples]); dy = np.stack([s[1] for s in samples])
+        active = np.stack([s[2] for s in samples])
+        for p, curve in enumerate(curves):
+            px, py = target_velocity(curve, dx, dy, horizontal[p])
+            tx[p::P, :n] = np.where(active, px, 0.0)
+            ty[p::P, :n] = np.where(active, py, 0.0)
+
+        for j in range(n):
+            # ScrollEngine.tick：有目标速度时直接跟随，否则按摩擦衰减 (关闭惯性时 decay 为 0)，低于截止速度即停止
+            cx, cy = tx[:, j], ty[:, j]
+            gx, gy = vx * decay, vy * decay
+            stop = gx * gx + gy * gy < cutoff2
+            gx[stop] = 0.0; gy[stop] = 0.0
+            steer = (cx != 0) | (cy != 0)
+            vx = np.where(steer, cx, gx); vy = np.where(steer, cy, gy)
+            ix += vx * dt; iy += vy * dt
+            # ScrollEngine.flush：输出已积分但尚未输出的整数步 (向零取整)
+            sx = np.trunc(ix * spu - ex); sy = np.trunc(iy * spu - ey)
+            ex += sx; ey += sy
+            path += np.abs(sx) + np.abs(sy)
+            events += (sx != 0) | (sy != 0)
+            np.maximum(peak2, vx * vx + vy * vy, out=peak2)
+            hit = np.isnan(reached) & (ex * ex + ey * ey >= goal2)
+            if hit.any(): reached[hit] = chunk[j]
+
+    rows = []
+    for c in range(C):
+        trace, (name, _) = traces[c // P], presets[c % P]
+        rows.append((c // P, {"trace": trace.name, "preset": name, "tick_rate": tick_rate,
+                     "distance": float(path[c]) / spu, "net_x": float(ex[c]) / spu, "net_y": float(ey[c]) / spu,
+                     "time_to_target": None if np.isnan(reached[c]) else float(reached[c]),
+                     "peak_speed": math.sqrt(peak2[c]), "events": int(events[c])}))
+    return rows
+
+
+# --- 导出 ---
+def export(rows, path):
+    # 按扩展名导出为 .csv 或 .json
+    if path.lower().endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f: json.dump(rows, f, ensure_ascii=False, indent=2)
+        return
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows({name: "" if row[name] is None else row[name] for name in RESULT_FIELDS} for row in rows)
+
+
+def summarize(rows):
+    # 按预设汇总：各轨迹的平均滚动量、到达目标的比例与平均用时、峰值速度、平均输出次数
+    groups = {}
+    for row in rows: groups.setdefault(row["preset"], []).append(row)
+    summary = []
+    for name, items in groups.items():
+        times = [row["time_to_target"] for row in items if row["time_to_target"] is not None]
+        summary.append({"preset": name, "traces": len(items), "distance": sum(row["distance"] for row in items) / len(items),
+                        "reached": len(times) / len(items), "time_to_target": sum(times) / len(times) if times else None,
+                        "peak_speed": max(row["peak_speed"] for row in items),
+                        "events": sum(row["events"] for row in items) / len(items)})
+    return summary
+
+
+def parse_axis(text):
+    name, _, values = text.partition("=")
+    parsed = []
+    for value in values.split(","):
+        try: parsed.append(json.loads(value))
+        except ValueError: parsed.append(value)
+    return name, parsed
+
+
+def main(argv=None):
+    # python -m global_mouse.simulate [录制文件 ...] [--config 配置文件] [--grid sensitivity=1.5,2,2.5 ...] [-o 结果.csv]
+    parser = argparse.ArgumentParser(prog="python -m global_mouse.simulate", description="离线批量比较预设与曲线")
+    parser.add_argument("recordings", nargs="*", help=".gmrec 录制文件；不给时使用合成轨迹")
+    parser.add_argument("--config", help="配置文件：其中的全部预设作为候选 (默认为录制时的配置或内置默认配置)")
+    parser.add_argument("--grid", nargs="*", default=[], metavar="配置项=值,值", help="在每个候选预设上展开参数网格")
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET, help="目标偏移 (格)")
+    parser.add_argument("--steps-per-unit", type=int, default=None, help="输出后端每格的步数 (默认取录制文件中的值或 1)")
+    parser.add_argument("-o", "--output", help="把每个组合的结果导出为 .csv 或 .json")
+    args = parser.parse_args(argv)
+    if np is None:
+        print(NUMPY_HINT)
+        return 1
+
+    spu, base_multiplier = args.steps_per_unit, BASE_MULTIPLIER
+    presets = {"默认": ConfigSnapshot()}
+    if args.recordings:
+        # 读录制文件需要 zstandard；输出单位、基础倍率与默认候选取自第一个会话录制时的环境与配置
+        from global_mouse.recorder import load_sessions
+        sessions = [(f"{path}#{i}", session) for path in args.recordings
+                    for i, session in enumerate(load_sessions(path)) if session.header["samples"]]
+        traces = [session_trace(session, name) for name, session in sessions]
+        if sessions:
+            header = sessions[0][1].header
+            spu, base_multiplier = spu or header["steps_per_unit"], header["base_multiplier"]
+            presets = {"录制时的配置": ConfigSnapshot.from_dict(header["config"])}
+    else:
+        traces = synthetic_traces()
+    if not traces:
+        print("没有可用的轨迹")
+        return 1
+
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f: data = json.load(f)
+        presets = {name: ConfigSnapshot.from_dict(values) for name, values in (data.get("presets") or {}).items()} or presets
+    if args.grid:
+        axes = dict(parse_axis(item) for item in args.grid)
+        presets = {f"{name} {key}" if len(presets) > 1 else key: snap
+                   for name, base in presets.items() for key, snap in preset_grid(base, **axes).items()}
+
+    rows = simulate(traces, presets, args.target, spu or 1, base_multiplier)
+    for item in summarize(rows):
+        reach = f"{item['time_to_target']:.3f}s" if item["time_to_target"] is not None else "  —  "
+        print(f"{item['preset']:<40} 滚动 {item['distance']:8.1f} 格  到达 {item['reached'] * 100:5.1f}% {reach}  "
+              f"峰值 {item['peak_speed']:7.1f} 格/秒  输出 {item['events']:7.1f} 次")
+    if args.output:
+        export(rows, args.output)
+        print(f"已导出 {len(rows)} 行到 {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
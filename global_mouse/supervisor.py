@@ -0,0 +1,133 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import time
+import threading
+
+# 引擎健康状态：托盘与 ctl stats 显示
+HEALTH_RUNNING, HEALTH_DEGRADED, HEALTH_STOPPED = "running", "degraded", "stopped"
+HEALTH_NAMES = {HEALTH_RUNNING: "运行中", HEALTH_DEGRADED: "出错重试中", HEALTH_STOPPED: "已停止"}
+
+# 失败分类：读取光标位置、输出滚动事件、引擎自身 (曲线计算等)
+FAILURE_POSITION, FAILURE_OUTPUT, FAILURE_ENGINE = "position", "output", "engine"
+FAILURE_KINDS = (FAILURE_POSITION, FAILURE_OUTPUT, FAILURE_ENGINE)
+
+BACKOFF_INITIAL = 0.01          # 第一次失败后等待 10ms，之后每次翻倍
+BACKOFF_MAX = 1.0
+DEGRADED_AFTER = 3              # 连续失败达到该次数才报告 degraded，偶发的单次失败不打扰用户
+RESTART_AFTER = 3               # 输出连续失败达到该次数时重建输出后端 (例如显示连接断开后重新打开)
+MAX_CRASHES = 5                 # 引擎线程连续崩溃 (中间没有成功过一次) 超过该次数后放弃，报告 stopped
+
+
+# 引擎在读取位置 / 输出时出错会包装成 EngineFailure，监督器据此分类
+class EngineFailure(Exception):
+    def __init__(self, kind, error):
+        super().__init__(f"{kind}: {error!r}")
+        self.kind = kind
+        self.error = error
+
+
+# --- 引擎监督器 ---
+# 在自己的线程里运行 engine.run()；引擎每次失败都调用 failed(e) 取得退避时间，失败期间不会空转
+# make_output() 用于重建输出后端，on_output(output) / on_health(health) 在引擎线程中调用
+class EngineSupervisor:
+    def __init__(self, engine, make_output=None, on_output=None, on_health=None, name="scroller", clock=time.monotonic):
+        self.engine = engine
+        self.make_output = make_output
+        self.on_output = on_output
+        self.on_health = on_health
+        self.name = name
+        self.clock = clock
+        self.health = HEALTH_STOPPED
+        self.failures = dict.fromkeys(FAILURE_KINDS, 0)
+        self.last_error = None
+        self.last_failure_at = None
+        self.last_kind = None
+        self.emits_at_failure = 0
+        self.consecutive = 0            # 连续失败次数，成功一次即清零
+        self.output_streak = 0          # 连续的输出失败次数
+        self.restarts = 0
+        self.restart_errors = 0
+        self.crashes = 0
+        self.thread = None
+        engine.supervisor = self
+
+    def start(self):
+        self.set_health(HEALTH_RUNNING)
+        self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        # engine.run() 内部的失败会就地退避重试；从 run() 里逃出来的异常 (例如空闲时清空输出失败) 退避后重新进入
+        # 只有未分类的异常 (代码错误) 才计入崩溃次数，输入/输出后端的故障可能随时恢复，不会因此放弃
+        while True:
+            try:
+                self.engine.run()
+                return
+            except Exception as e:
+                if not isinstance(e, EngineFailure): self.crashes += 1
+                delay = self.failed(e)
+                if self.crashes > MAX_CRASHES:
+                    print(f"Scroll Engine Stopped: {e!r}")
+                    self.set_health(HEALTH_STOPPED)
+                    return
+                time.sleep(delay)
+
+    def set_health(self, health):
+        if health == self.health: return
+        self.health = health
+        if self.on_health is not None: self.on_health(health)
+
+    def failed(self, error):
+        # 引擎线程调用：计数、必要时重建输出后端，返回下一次重试前应等待的秒数
+        kind = error.kind if isinstance(error, EngineFailure) else FAILURE_ENGINE
+        self.failures[kind] += 1
+        self.last_error = f"{kind}: {error.error!r}" if isinstance(error, EngineFailure) else f"{kind}: {error!r}"
+        self.last_failure_at = self.clock()
+        self.last_kind = kind
+        self.emits_at_failure = self.engine.emits
+        self.consecutive += 1
+        if self.consecutive == 1: print(f"Scroll Engine Failed: {self.last_error}")
+        if kind == FAILURE_OUTPUT:
+            self.output_streak += 1
+            if self.output_streak >= RESTART_AFTER: self.restart_output()
+        else:
+            self.output_streak = 0
+        if self.consecutive >= DEGRADED_AFTER: self.set_health(HEALTH_DEGRADED)
+        return min(BACKOFF_MAX, BACKOFF_INITIAL * 2 ** min(self.consecutive - 1, 16))
+
+    def succeeded(self):
+        # 引擎线程在失败之后每完成一次 tick 调用；输出故障要等到真正输出成功一次才算恢复 (没有增量可输出的 tick 不算)
+        if self.last_kind == FAILURE_OUTPUT and self.engine.emits == self.emits_at_failure: return
+        self.recovered()
+
+    def recovered(self):
+        self.consecutive = self.output_streak = self.crashes = 0
+        self.set_health(HEALTH_RUNNING)
+
+    def restart_output(self):
+        if self.make_output is None: return
+        old = self.engine.output
+        self.output_streak = 0
+        try: old.close()
+        except Exception: pass
+        try:
+            output = self.make_output()
+        except Exception as e:
+            self.restart_errors += 1
+            print(f"Output Backend Restart Failed: {e!r}")
+            return
+        # 按整格量化的设置随后端一起保留 (不同后端的 steps_per_unit 可能不同)
+        if old.quantum > 1: output.set_quantum(output.steps_per_unit)
+        self.engine.set_output(output)
+        self.restarts += 1
+        if self.on_output is not None: self.on_output(output)
+
+    def to_dict(self):
+        return {"health": self.health, "failures": dict(self.failures), "consecutive_failures": self.consecutive,
+                "output_restarts": self.restarts, "restart_errors": self.restart_errors, "last_error": self.last_error}
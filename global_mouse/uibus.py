@@ -0,0 +1,55 @@
+# Global Mouse - A smooth scrolling tool for Windows & macOS
+# Copyright (C) 2026 AouTzxc
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+import threading
+
+# 界面更新通道：每个通道只保留最新的值
+UI_OVERLAY = "overlay"          # (visible, stamp)：显示/隐藏悬浮图标
+UI_DIRECTION = "direction"      # (direction, stamp)
+UI_SIZE = "size"                # 悬浮图标尺寸
+UI_PREVIEW = "preview"          # 在屏幕中央预览悬浮图标
+UI_HEALTH = "health"            # 引擎健康状态 (supervisor.HEALTH_*)
+UI_PRESET = "preset"            # 按前台应用自动生效的预设名，None 表示使用手动选择的预设
+UI_CONFIG = "config"            # 配置已修改，需要推送给后台实例 / 引擎进程 (拖动滑块时每帧最多推送一次)
+
+
+# --- 跨线程界面更新总线 ---
+# 任意线程 post(channel, value)，后写的值覆盖同一通道里还没被取走的旧值
+# 从上次 take() 之后只有第一次 post 会调用 wake() (由界面层投递一次事件给 GUI 线程)，其余 post 只改字典
+# take() 按各通道最后一次 post 的先后排列，与逐个发信号时的送达顺序一致 (例如先隐藏再显示时，旧方向不会盖过显示时的归零)
+class UiBus:
+    def __init__(self, wake):
+        self.wake = wake
+        self.lock = threading.Lock()
+        self.values = {}
+        self.pending = False
+        self.posts = 0
+        self.wakes = 0
+        self.takes = 0
+
+    def post(self, channel, value=None):
+        with self.lock:
+            values = self.values
+            if channel in values: del values[channel]
+            values[channel] = value
+            self.posts += 1
+            if self.pending: return
+            self.pending = True
+            self.wakes += 1
+        self.wake()
+
+    def take(self):
+        # 在 GUI 线程调用：取走所有通道的最新值，之后的 post 会重新唤醒
+        with self.lock:
+            values, self.values = self.values, {}
+            self.pending = False
+            self.takes += 1
+        return values
+
+    def counts(self):
+        return {"posts": self.posts, "wakes": self.wakes, "takes": self.takes}
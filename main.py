@@ -8,29 +8,52 @@
 
 import sys
 import os
-import math
 import time
-import threading
-import json
+started = time.perf_counter()   # 启动耗时报告的起点 (之后的导入全部计入 "导入模块")
 import platform
-import subprocess
-from pynput import mouse, keyboard
+
+# [新增] 无界面后台模式：不导入 Qt，只运行引擎、输入钩子和本地控制通道 (见 global_mouse/daemon.py)
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    from global_mouse.daemon import main as headless_main
+    sys.exit(headless_main([arg for arg in sys.argv[1:] if arg != "--headless"], started))
+# 独立引擎进程 (打包后的可执行文件由界面进程以 --engine-process 启动，同样不导入 Qt)
+if __name__ == "__main__" and "--engine-process" in sys.argv[1:]:
+    from global_mouse.engine_process import main as engine_process_main
+    sys.exit(engine_process_main([arg for arg in sys.argv[1:] if arg != "--engine-process"]))
+
+from pynput import mouse
 
 # --- PySide6 导入 ---
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QFrame, QSlider, QDoubleSpinBox, 
                              QPushButton, QDialog, QGridLayout, QCheckBox, 
                              QSystemTrayIcon, QMenu, QMessageBox, QComboBox, 
-                             QInputDialog, QTextEdit, QKeySequenceEdit)
-from PySide6.QtCore import Qt, Signal, QObject, QTimer
-from PySide6.QtGui import QColor, QPainter, QPen, QFont, QPainterPath, QIcon, QCursor, QAction, QKeySequence
+                             QKeySequenceEdit, QLineEdit)
+from PySide6.QtCore import Qt, Signal, QObject, QTimer, QFileSystemWatcher
+from PySide6.QtGui import QColor, QPainter, QPen, QFont, QPainterPath, QIcon, QCursor, QAction, QKeySequence, QGuiApplication, QPixmap
+
+from global_mouse.engine import ScrollEngine, TICK_RATES, PACING_FIXED, PACING_DISPLAY, POINTER_ABSOLUTE, POINTER_RECENTER, POINTER_CONFINE
+from global_mouse.backends import default_backend
+from global_mouse.config import ConfigStore, ConfigSnapshot, RuntimeState, valid_presets
+from global_mouse.persistence import ConfigFile, default_config_path
+from global_mouse.foreground import WindowMonitor, default_provider
+from global_mouse.screens import Screen, ScreenIndex
+from global_mouse.filters import AppFilter
+from global_mouse.hotkeys import KeyboardManager, HOTKEY_ACTIONS, HOTKEY_ACTION_NAMES
+from global_mouse.diagnostics import wakeup_counter, wakeup_counts, StartupProfile
+from global_mouse.motion import MotionRing
+from global_mouse.pointer import RelativePointer
+from global_mouse.clicks import ClickQueue, ClickDispatcher, button_codes, CLICK_TOGGLE
+from global_mouse.uibus import UiBus, UI_OVERLAY, UI_DIRECTION, UI_SIZE, UI_PREVIEW, UI_HEALTH, UI_PRESET, UI_CONFIG
+from global_mouse.app_presets import AppPresetSwitcher, preset_profiles
+from global_mouse.supervisor import EngineSupervisor, HEALTH_RUNNING, HEALTH_STOPPED, HEALTH_NAMES
+from global_mouse.curves import CURVE_TYPES, CURVE_NAMES, DEFAULT_CURVE_PARAMS, parse_curve_params, format_curve_params
 
 # --- 跨平台特定的库 ---
 OS_NAME = platform.system()
 if OS_NAME == "Windows":
     import winreg
     import ctypes
-    from ctypes import wintypes
 elif OS_NAME == "Darwin":
     import plistlib
 
@@ -42,7 +65,9 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-CONFIG_FILE = os.path.join(os.path.expanduser("~"), ".global_mouse_config.json")
+CONFIG_FILE = default_config_path()
+startup = StartupProfile(started)
+startup.mark("import")
 
 # --- 跨平台开机自启管理 ---
 class AutoStartManager:
@@ -98,162 +123,32 @@ class AutoStartManager:
         return False
 
 # --- 全局配置 ---
-class GlobalConfig:
-    dead_zone = 20.0
-    sensitivity = 2.0
-    speed_factor = 2.0
-    overlay_size = 60.0
-    enable_horizontal = True
-    start_minimized = False
-    
-    horizontal_hotkey = ""  
-    
-    filter_mode = 0  
-    filter_list = [] 
-    disable_fullscreen = False 
-    disable_desktop = True # [新增] 默认屏蔽桌面
-    
-    active = False
-    origin_pos = (0, 0)
-    current_window_name = ""
-    current_window_class = "" # [新增] 用于存储窗口底层类名
-    is_fullscreen = False
-
-    def to_dict(self):
-        return {
-            "sensitivity": self.sensitivity, "speed_factor": self.speed_factor,
-            "dead_zone": self.dead_zone, "overlay_size": self.overlay_size,
-            "enable_horizontal": self.enable_horizontal, "start_minimized": self.start_minimized,
-            "horizontal_hotkey": self.horizontal_hotkey, 
-            "filter_mode": self.filter_mode, "filter_list": self.filter_list,
-            "disable_fullscreen": self.disable_fullscreen,
-            "disable_desktop": self.disable_desktop
-        }
-
-    def from_dict(self, data):
-        self.sensitivity = data.get("sensitivity", 2.0)
-        self.speed_factor = data.get("speed_factor", 2.0)
-        self.dead_zone = data.get("dead_zone", 20.0)
-        self.overlay_size = data.get("overlay_size", 60.0)
-        self.enable_horizontal = data.get("enable_horizontal", True)
-        self.start_minimized = data.get("start_minimized", False)
-        self.horizontal_hotkey = data.get("horizontal_hotkey", "") 
-        self.filter_mode = data.get("filter_mode", 0)
-        self.filter_list = data.get("filter_list", [])
-        self.disable_fullscreen = data.get("disable_fullscreen", False)
-        self.disable_desktop = data.get("disable_desktop", True)
-
-cfg = GlobalConfig()
+# 可调参数是不可变快照，由 UI 整体发布；运行时状态 (激活/原点/前台窗口) 单独存放
+config = ConfigStore()
+state = RuntimeState()
 mouse_controller = mouse.Controller()
 
-# --- 全局键盘监听器 ---
-class KeyboardManager:
-    def __init__(self, bridge_callback):
-        self.listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
-        self.current_keys = set()
-        self.bridge_callback = bridge_callback
-        self.qt_to_pynput = {
-            'pgup': 'page_up', 'pgdown': 'page_down', 'ins': 'insert',
-            'del': 'delete', 'esc': 'esc', 'return': 'enter'
-        }
-
-    def start(self):
-        self.listener.start()
-
-    def _get_key_name(self, key):
-        if isinstance(key, keyboard.KeyCode):
-            return key.char.lower() if key.char else None
-        elif isinstance(key, keyboard.Key):
-            return key.name
-        return None
-
-    def on_press(self, key):
-        key_name = self._get_key_name(key)
-        if key_name:
-            if 'ctrl' in key_name: key_name = 'ctrl'
-            elif 'alt' in key_name: key_name = 'alt'
-            elif 'shift' in key_name: key_name = 'shift'
-            elif 'cmd' in key_name: key_name = 'meta'
-            
-            self.current_keys.add(key_name)
-            self.check_hotkey()
-
-    def on_release(self, key):
-        key_name = self._get_key_name(key)
-        if key_name:
-            if 'ctrl' in key_name: key_name = 'ctrl'
-            elif 'alt' in key_name: key_name = 'alt'
-            elif 'shift' in key_name: key_name = 'shift'
-            elif 'cmd' in key_name: key_name = 'meta'
-            
-            if key_name in self.current_keys:
-                self.current_keys.remove(key_name)
-
-    def check_hotkey(self):
-        if not cfg.horizontal_hotkey: return
-        
-        qt_keys = cfg.horizontal_hotkey.lower().split('+')
-        target_keys = set()
-        for k in qt_keys:
-            k = self.qt_to_pynput.get(k, k)
-            target_keys.add(k)
-            
-        if self.current_keys == target_keys:
-            self.bridge_callback()
-
-# --- 窗口侦听器 ---
-class WindowMonitor(threading.Thread):
-    def __init__(self):
-        super().__init__(daemon=True)
-        self.screen_width = 0
-        self.screen_height = 0
-
-    def run(self):
-        time.sleep(2)
-        try:
-            screen_geom = QApplication.primaryScreen().geometry()
-            self.screen_width = screen_geom.width()
-            self.screen_height = screen_geom.height()
-        except: pass
-
-        while True:
-            try:
-                if OS_NAME == "Windows":
-                    user32 = ctypes.windll.user32
-                    hwnd = user32.GetForegroundWindow()
-                    if hwnd:
-                        length = user32.GetWindowTextLengthW(hwnd)
-                        buf = ctypes.create_unicode_buffer(length + 1)
-                        user32.GetWindowTextW(hwnd, buf, length + 1)
-                        cfg.current_window_name = buf.value
-                        
-                        # [获取类名，用于屏蔽桌面]
-                        class_buf = ctypes.create_unicode_buffer(256)
-                        user32.GetClassNameW(hwnd, class_buf, 256)
-                        cfg.current_window_class = class_buf.value
-                        
-                        rect = wintypes.RECT()
-                        user32.GetWindowRect(hwnd, ctypes.byref(rect))
-                        w = rect.right - rect.left
-                        h = rect.bottom - rect.top
-                        cfg.is_fullscreen = (w >= self.screen_width and h >= self.screen_height)
-                
-                elif OS_NAME == "Darwin":
-                    script = 'tell application "System Events" to get name of first application process whose frontmost is true'
-                    res = subprocess.run(['osascript', '-e', script], capture_output=True, text=True)
-                    cfg.current_window_name = res.stdout.strip()
-                    cfg.is_fullscreen = False 
-            except Exception: pass
-            time.sleep(0.5)
+def qt_screen_index():
+    # 在 GUI 线程按当前的 QScreen 列表生成屏幕索引 (主屏在前)
+    # Windows 下 pynput 与 GetWindowRect 给出物理像素，而 Qt6 的屏幕原点是物理坐标、尺寸是逻辑像素；其他平台两者相同
+    screens = QGuiApplication.screens()
+    primary = QGuiApplication.primaryScreen()
+    if primary in screens: screens.remove(primary); screens.insert(0, primary)
+    items = []
+    for screen in screens:
+        geom = screen.geometry()
+        scale = screen.devicePixelRatio()
+        logical = (geom.x(), geom.y(), geom.width(), geom.height())
+        physical = (geom.x(), geom.y(), geom.width() * scale, geom.height() * scale) if OS_NAME == "Windows" else logical
+        items.append(Screen(screen.name(), logical, physical, scale, screen.refreshRate()))
+    return ScreenIndex(items)
 
 # --- 逻辑信号桥接 ---
+# [优化] 悬浮图标的显示/方向/尺寸不再每次变化发一个信号，而是写入 UiBus，ui_wake 只在 GUI 线程需要醒来时发一次
 class LogicBridge(QObject):
-    show_overlay = Signal()
-    hide_overlay = Signal()
-    update_direction = Signal(str)
-    update_size = Signal(int)
-    preview_size = Signal()
-    toggle_horizontal = Signal() 
+    ui_wake = Signal()
+    hotkey_triggered = Signal(str)
+    engine_process_exited = Signal()
 
 # --- 悬浮图标 ---
 class ResizableOverlay(QWidget):
@@ -265,27 +160,65 @@ class ResizableOverlay(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setAttribute(Qt.WA_ShowWithoutActivating)
         self.base_size = 60.0
-        self.update_geometry(int(cfg.overlay_size))
+        # [新增] 五种状态各渲染一次缓存成位图，键为 (尺寸, 设备像素比)，任一变化时整体丢弃
+        self.pixmaps = {}
+        self.pixmap_key = None
         self.direction = 'neutral'
+        self.pending_direction = 'neutral'
+        self.repaints = 0
+        self.update_geometry(int(config.snapshot.overlay_size))
         self.preview_timer = QTimer()
         self.preview_timer.setSingleShot(True)
         self.preview_timer.timeout.connect(self.hide)
+        # 方向变化合并：一帧内第一次变化立即重绘，其余的在帧末只按最后的方向重绘一次
+        self.frame_timer = QTimer()
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.timeout.connect(self.apply_direction)
 
     def update_geometry(self, size):
+        if size != self.width(): self.pixmaps.clear()
         self.setFixedSize(size, size); self.update()
 
-    def set_direction(self, direction):
-        if self.direction != direction:
-            self.direction = direction; self.update()
+    def frame_interval_ms(self):
+        screen = self.screen()
+        rate = screen.refreshRate() if screen is not None else 60.0
+        return max(1, int(round(1000.0 / (rate if rate > 1 else 60.0))))
+
+    def set_direction(self, direction, immediate=False):
+        self.pending_direction = direction
+        if immediate: self.frame_timer.stop()
+        if not self.frame_timer.isActive(): self.apply_direction()
+
+    def apply_direction(self):
+        if self.pending_direction != self.direction:
+            self.direction = self.pending_direction; self.update()
+            self.frame_timer.start(self.frame_interval_ms())
             
-    def show_preview(self):
-        screen = QApplication.primaryScreen().geometry()
-        self.set_direction('neutral')
-        self.move(int(screen.center().x() - self.width()/2), int(screen.center().y() - self.height()/2))
+    def show_preview(self, rect):
+        # rect 为要居中显示的屏幕 (界面坐标 left, top, width, height)
+        left, top, width, height = rect
+        self.set_direction('neutral', immediate=True)
+        self.move(int(left + width/2 - self.width()/2), int(top + height/2 - self.height()/2))
         self.show(); self.raise_(); self.preview_timer.start(800)
 
+    def state_pixmap(self, direction):
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), dpr)
+        if key != self.pixmap_key: self.pixmaps.clear(); self.pixmap_key = key
+        pixmap = self.pixmaps.get(direction)
+        if pixmap is None:
+            pixmap = QPixmap(int(round(self.width() * dpr)), int(round(self.height() * dpr)))
+            pixmap.setDevicePixelRatio(dpr); pixmap.fill(Qt.transparent)
+            p = QPainter(pixmap); self.draw_state(p, direction); p.end()
+            self.pixmaps[direction] = pixmap
+        return pixmap
+
     def paintEvent(self, event):
-        p = QPainter(self); p.setRenderHint(QPainter.Antialiasing)
+        self.repaints += 1
+        p = QPainter(self); p.drawPixmap(0, 0, self.state_pixmap(self.direction)); p.end()
+
+    def draw_state(self, p, direction):
+        p.setRenderHint(QPainter.Antialiasing)
         p.translate(self.width() / 2, self.height() / 2)
         scale = self.width() / self.base_size; p.scale(scale, scale)
 
@@ -302,19 +235,19 @@ class ResizableOverlay(QWidget):
                 path.moveTo(0, -4); path.lineTo(-5, 3); path.lineTo(5, 3)
             path.closeSubpath(); painter.drawPath(path); painter.restore()
 
-        if self.direction == 'neutral':
+        if direction == 'neutral':
             draw_arrow(p, 0, False); draw_arrow(p, 180, False); draw_arrow(p, 270, False); draw_arrow(p, 90, False)
-        elif self.direction == 'up': draw_arrow(p, 0, True)
-        elif self.direction == 'down': draw_arrow(p, 180, True)
-        elif self.direction == 'left': draw_arrow(p, 270, True)
-        elif self.direction == 'right': draw_arrow(p, 90, True)
+        elif direction == 'up': draw_arrow(p, 0, True)
+        elif direction == 'down': draw_arrow(p, 180, True)
+        elif direction == 'left': draw_arrow(p, 270, True)
+        elif direction == 'right': draw_arrow(p, 90, True)
 
 # --- 高级规则设置窗口 ---
 class AdvancedSettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("高级规则 (防误触/过滤)")
-        self.setFixedSize(380, 450) 
+        self.setFixedSize(380, 740) 
         self.setStyleSheet("""
             QDialog { background-color: #F8F8F8; }
             QLabel { font-size: 13px; color: #333; }
@@ -322,17 +255,21 @@ class AdvancedSettingsDialog(QDialog):
             QComboBox { border: 1px solid #CCC; border-radius: 6px; padding: 4px; background: #FFF; }
         """)
         
+        from PySide6.QtWidgets import QTextEdit
+        from global_mouse.filters import RULE_HELP
+        from global_mouse.app_presets import APP_PRESET_HELP
+        snap = config.snapshot
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20); layout.setSpacing(15)
         
         self.chk_fullscreen = QCheckBox("🎮 智能防误触：在所有全屏程序中自动禁用")
-        self.chk_fullscreen.setChecked(cfg.disable_fullscreen)
+        self.chk_fullscreen.setChecked(snap.disable_fullscreen)
         self.chk_fullscreen.setStyleSheet("font-weight: bold; color: #D32F2F;")
         layout.addWidget(self.chk_fullscreen)
         
         # [新增] 屏蔽桌面开关
         self.chk_desktop = QCheckBox("🖥️ 屏蔽系统桌面：在桌面上自动禁用滚动")
-        self.chk_desktop.setChecked(cfg.disable_desktop)
+        self.chk_desktop.setChecked(snap.disable_desktop)
         self.chk_desktop.setStyleSheet("font-weight: bold; color: #1976D2;")
         layout.addWidget(self.chk_desktop)
         
@@ -342,13 +279,28 @@ class AdvancedSettingsDialog(QDialog):
         layout.addWidget(QLabel("<b>应用过滤模式：</b>"))
         self.combo_mode = QComboBox()
         self.combo_mode.addItems(["全局生效 (不进行过滤)", "黑名单模式 (在以下程序中禁用)", "白名单模式 (仅在以下程序中启用)"])
-        self.combo_mode.setCurrentIndex(cfg.filter_mode)
+        self.combo_mode.setCurrentIndex(snap.filter_mode)
         layout.addWidget(self.combo_mode)
         
-        layout.addWidget(QLabel("<b>输入应用名称关键词 (每行一个)：</b>\n(例如输入 'League' 或 'AutoCAD')"))
+        layout.addWidget(QLabel("<b>输入应用名称关键词 (每行一个)：</b>\n(例如输入 'League' 或 'AutoCAD'，悬停查看高级规则)"))
         self.text_edit = QTextEdit()
-        self.text_edit.setPlainText("\n".join(cfg.filter_list))
+        self.text_edit.setToolTip(RULE_HELP)
+        self.text_edit.setPlainText("\n".join(snap.filter_list))
         layout.addWidget(self.text_edit)
+
+        # [新增] 不认小数滚轮的程序：只向它们输出整格滚动 (规则语法同上)
+        layout.addWidget(QLabel("<b>只接受整格滚动的应用 (每行一个)：</b>"))
+        self.quantize_edit = QTextEdit()
+        self.quantize_edit.setToolTip(RULE_HELP)
+        self.quantize_edit.setPlainText("\n".join(snap.quantize_list))
+        layout.addWidget(self.quantize_edit)
+
+        # [新增] 按前台应用自动切换预设：切到匹配的程序时换用该预设的滚动参数，切走后恢复
+        layout.addWidget(QLabel("<b>按应用自动切换预设 (规则 => 预设名)：</b>"))
+        self.app_presets_edit = QTextEdit()
+        self.app_presets_edit.setToolTip(APP_PRESET_HELP)
+        self.app_presets_edit.setPlainText("\n".join(snap.app_presets))
+        layout.addWidget(self.app_presets_edit)
         
         btn_layout = QHBoxLayout()
         btn_save = QPushButton("保存规则")
@@ -359,11 +311,13 @@ class AdvancedSettingsDialog(QDialog):
         layout.addLayout(btn_layout)
 
     def save_and_close(self):
-        cfg.disable_fullscreen = self.chk_fullscreen.isChecked()
-        cfg.disable_desktop = self.chk_desktop.isChecked()
-        cfg.filter_mode = self.combo_mode.currentIndex()
         lines = self.text_edit.toPlainText().split('\n')
-        cfg.filter_list = [line.strip() for line in lines if line.strip()]
+        quantize_lines = self.quantize_edit.toPlainText().split('\n')
+        preset_lines = self.app_presets_edit.toPlainText().split('\n')
+        config.update(disable_fullscreen=self.chk_fullscreen.isChecked(), disable_desktop=self.chk_desktop.isChecked(),
+                      filter_mode=self.combo_mode.currentIndex(), filter_list=[line.strip() for line in lines if line.strip()],
+                      quantize_list=[line.strip() for line in quantize_lines if line.strip()],
+                      app_presets=[line.strip() for line in preset_lines if line.strip()])
         self.accept()
 
 # --- 自定义快捷键输入框 (防连招且支持退格清空) ---
@@ -374,6 +328,118 @@ class HotkeyEdit(QKeySequenceEdit):
         else:
             super().keyPressEvent(event)
 
+# --- 快捷键设置窗口 ---
+class HotkeySettingsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("快捷键设置")
+        self.setFixedSize(380, 400)
+        self.setStyleSheet("""
+            QDialog { background-color: #F8F8F8; }
+            QLabel { font-size: 13px; color: #333; }
+            QKeySequenceEdit { border: 1px solid #CCC; border-radius: 4px; padding: 2px; background: #FFF; color: #000; }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20); layout.setSpacing(15)
+        layout.addWidget(QLabel("<b>为常用操作绑定全局快捷键：</b>\n(点击输入框后按下组合键，按退格键清除)"))
+
+        grid = QGridLayout(); grid.setVerticalSpacing(10)
+        self.edits = {}
+        hotkeys = dict(config.snapshot.hotkeys)
+        for row, action in enumerate(HOTKEY_ACTIONS):
+            grid.addWidget(QLabel(HOTKEY_ACTION_NAMES[action]), row, 0)
+            edit = HotkeyEdit()
+            edit.setMaximumSequenceLength(1)
+            edit.setKeySequence(QKeySequence(hotkeys.get(action, "")))
+            grid.addWidget(edit, row, 1)
+            self.edits[action] = edit
+        layout.addLayout(grid)
+        layout.addStretch()
+
+        btn_save = QPushButton("保存快捷键")
+        btn_save.setCursor(Qt.PointingHandCursor)
+        btn_save.setStyleSheet("background-color: #007AFF; color: white; border-radius: 6px; padding: 8px 0; font-weight: bold;")
+        btn_save.clicked.connect(self.save_and_close)
+        layout.addWidget(btn_save)
+
+    def save_and_close(self):
+        config.update(hotkeys={action: edit.keySequence().toString() for action, edit in self.edits.items() if not edit.keySequence().isEmpty()})
+        self.accept()
+
+# --- 诊断面板 (延迟 / 抖动直方图) ---
+class DiagnosticsDialog(QDialog):
+    def __init__(self, main_window):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.setWindowTitle("诊断面板")
+        self.setFixedSize(520, 600)
+        self.setStyleSheet("""
+            QDialog { background-color: #F8F8F8; }
+            QLabel { font-size: 13px; color: #333; }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20); layout.setSpacing(12)
+        self.chk_enabled = QCheckBox("启用测量 (关闭时不产生任何额外开销)")
+        self.chk_enabled.setChecked(main_window.stats is not None)
+        self.chk_enabled.toggled.connect(main_window.set_instrumentation)
+        layout.addWidget(self.chk_enabled)
+
+        self.table = QLabel()
+        self.table.setTextFormat(Qt.RichText); self.table.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        layout.addWidget(self.table, 1)
+
+        btn_layout = QHBoxLayout()
+        btn_reset = QPushButton("清零")
+        btn_reset.clicked.connect(self.reset)
+        btn_export = QPushButton("导出快照...")
+        btn_export.clicked.connect(self.export)
+        btn_layout.addWidget(btn_reset); btn_layout.addStretch(); btn_layout.addWidget(btn_export)
+        layout.addLayout(btn_layout)
+
+        # 只在面板可见时每秒刷新一次
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+
+    def reset(self):
+        self.main_window.latency_stats.reset()
+        if self.main_window.engine_process is not None: self.main_window.engine_process.reset_stats()
+        self.refresh()
+
+    def refresh(self):
+        def ms(seconds): return f"{seconds * 1e3:.3f}"
+        self.main_window.sync_engine_stats()
+        rows = ["<tr><th align='left'>指标</th><th>次数</th><th>p50 ms</th><th>p90 ms</th><th>p99 ms</th><th>最大 ms</th></tr>"]
+        for h in self.main_window.latency_stats.histograms():
+            rows.append(f"<tr><td>{h.help}</td><td align='right'>{h.count}</td><td align='right'>{ms(h.percentile(0.5))}</td>"
+                        f"<td align='right'>{ms(h.percentile(0.9))}</td><td align='right'>{ms(h.percentile(0.99))}</td>"
+                        f"<td align='right'>{ms(h.max)}</td></tr>")
+        startup_rows = "".join(f"<tr><td>{name}</td><td align='right'>{ms(seconds)}</td></tr>" for name, seconds in startup.rows())
+        from html import escape
+        self.table.setText("<table cellspacing='6'>" + "".join(rows) + "</table>"
+                           "<p style='color:#888'>百分位为所在直方图桶的上界</p>"
+                           f"<p>{escape(self.main_window.engine_summary())}</p>"
+                           "<table cellspacing='6'><tr><th align='left'>启动阶段</th><th>耗时 ms</th></tr>" + startup_rows + "</table>")
+
+    def export(self):
+        from PySide6.QtWidgets import QFileDialog
+        default = os.path.join(os.path.expanduser("~"), "Documents", "global_mouse_diagnostics.json")
+        path, _ = QFileDialog.getSaveFileName(self, "导出诊断快照", default, "JSON (*.json);;Prometheus 文本 (*.prom *.txt)")
+        if not path: return
+        self.main_window.sync_engine_stats()
+        try: self.main_window.latency_stats.export(path)
+        except OSError as e: QMessageBox.warning(self, "导出失败", str(e))
+
+    def showEvent(self, event):
+        self.refresh(); self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
 # --- 主界面 ---
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -384,46 +450,171 @@ class MainWindow(QMainWindow):
             self.setWindowIcon(QIcon(resource_path(icon_name)))
         
         self.setWindowTitle("Global Mouse")
-        self.setFixedSize(400, 680)
+        self.setFixedSize(400, 818)
         self.bridge = LogicBridge()
         self.overlay = ResizableOverlay()
         self.autostart = AutoStartManager()
         
         self.ui_widgets = {}
-        self.presets = {"默认": cfg.to_dict()}
+        self.ui_sliders = {}
+        self.ui_built = False
+        self.click_wakeups = wakeup_counter("mouse_hook")
+        self.motion = MotionRing()
+        self.clicks = ClickQueue()
+        self.click_codes = {}
+        self.screens = ScreenIndex()
+        self.presets = {"默认": config.snapshot.to_dict()}
         self.current_preset_name = "默认"
+        self.config_file = ConfigFile(CONFIG_FILE)
+        # [新增] 引擎的配置来源：前台应用命中规则时换成该预设的滚动参数，不写配置文件也不重建控件
+        self.app_presets = AppPresetSwitcher(config, state)
+        self.app_preset = None
+        startup.mark("main_window")
         
         self.load_presets_from_file()
-        self.init_system_tray(icon_name)
+        startup.mark("config_load")
+        self.app_filter = AppFilter.from_config(config.snapshot)
+        self.quantize_filter = AppFilter.for_quantization(config.snapshot)
+        self.output = None
+        self.engine = None
+        self.engine_process = None
+        self.reset_wakeup_sampler()
+        self.engine_health = HEALTH_STOPPED
+        self.recorder = None
+        self.stats = None               # 开启测量时为 latency_stats，关闭时为 None
+        self.latency_stats = None       # 第一次打开诊断面板或开启测量时才创建
+        self.ui_bus = UiBus(self.bridge.ui_wake.emit)
+        self.ui_drained_at = 0.0
+        self.ui_timer = QTimer(self)
+        self.ui_timer.setSingleShot(True)
+        self.ui_timer.timeout.connect(self.drain_ui)
+        self.app_presets.on_switch = self.post_preset
+        self.diagnostics_dialog = None
+        self.pushed_config = config.snapshot    # 最近一次推送给后台实例 / 引擎进程的配置
+        config.subscribe(self.on_config_changed)
         
-        self.bridge.show_overlay.connect(self.on_show_overlay)
-        self.bridge.hide_overlay.connect(self.on_hide_overlay)
-        self.bridge.update_direction.connect(self.overlay.set_direction)
-        self.bridge.update_size.connect(self.overlay.update_geometry)
-        self.bridge.preview_size.connect(self.overlay.show_preview)
-        self.bridge.toggle_horizontal.connect(self.on_toggle_horizontal_hotkey)
+        self.bridge.ui_wake.connect(self.on_ui_wake)
+        self.bridge.hotkey_triggered.connect(self.on_hotkey)
+        self.bridge.engine_process_exited.connect(self.on_engine_process_exited)
         
-        self.init_ui()
-        self.start_threads()
+        # [优化] 先把钩子和引擎跑起来 (启动后立刻就能滚动)，再建托盘；设置界面推迟到第一次打开窗口时构建
+        # 无界面后台实例 (--headless) 已在运行时不再挂第二套钩子，本进程只作为它的设置界面
+        from global_mouse.daemon import DaemonClient
+        self.daemon = DaemonClient.connect()
+        if self.daemon is not None:
+            try: self.attach_daemon()
+            except (ConnectionError, ValueError): self.daemon.close(); self.daemon = None
+        if self.daemon is None: self.start_threads()
+        startup.mark("hooks")
+        self.init_system_tray(icon_name)
+        self.update_engine_actions()
+        startup.mark("tray")
+        self.watch_config_file()
+        QApplication.instance().aboutToQuit.connect(self.config_file.close)
 
     def load_presets_from_file(self):
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.presets = data.get("presets", {"默认": cfg.to_dict()})
-                    last_used = data.get("last_used", "默认")
-                    if last_used in self.presets:
-                        self.current_preset_name = last_used
-                        cfg.from_dict(self.presets[last_used])
-            except: pass
+        data = self.config_file.load()
+        if isinstance(data, dict): self.apply_presets_data(data)
+
+    def apply_presets_data(self, data):
+        # 不合法的预设 (外部编辑写坏的数值、未知曲线等) 跳过并记录，不发布给引擎；返回跳过的预设名
+        presets, errors = valid_presets(data.get("presets") or {})
+        for name, error in errors: print(f"Preset Skipped: {name}: {error}")
+        self.presets = presets or {"默认": config.snapshot.to_dict()}
+        self.sync_app_presets()
+        last_used = data.get("last_used", "默认")
+        if last_used in self.presets:
+            self.current_preset_name = last_used
+            config.publish(ConfigSnapshot.from_dict(self.presets[last_used]))
+        self.show_preset(self.app_preset)
+        return [name for name, _ in errors]
+
+    def sync_app_presets(self):
+        # 预设增删或重新加载后调用：按应用切换只用到各预设的滚动参数
+        profiles = preset_profiles(self.presets)
+        self.app_presets.set_profiles(profiles)
+        if getattr(self, "engine_process", None) is not None: self.engine_process.write_control(profiles=profiles)
+
+    # [新增] 配置文件热加载：另一个实例或部署脚本修改文件后无需重启
+    def watch_config_file(self):
+        # 原子替换后旧 inode 的监视会失效，因此同时监视所在目录，并在每次变化后把文件重新加回来
+        self.config_watcher = QFileSystemWatcher(self)
+        self.config_watcher.addPath(os.path.dirname(CONFIG_FILE))
+        if os.path.exists(CONFIG_FILE): self.config_watcher.addPath(CONFIG_FILE)
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.timeout.connect(self.reload_config_file)
+        self.config_watcher.fileChanged.connect(self.on_config_file_changed)
+        self.config_watcher.directoryChanged.connect(self.on_config_file_changed)
+
+    def on_config_file_changed(self, path):
+        # 外部程序往往分几次写完，稍等片刻再读
+        if os.path.exists(CONFIG_FILE) and CONFIG_FILE not in self.config_watcher.files():
+            self.config_watcher.addPath(CONFIG_FILE)
+        self.reload_timer.start(200)
+
+    def reload_config_file(self):
+        data = self.config_file.reload()
+        if not isinstance(data, dict): return
+        skipped = self.apply_presets_data(data)
+        if self.ui_built: self.refresh_preset_combo()
+        if self.tray_icon.isVisible():
+            if skipped:
+                self.tray_icon.showMessage("配置已重新加载", f"以下预设有无效设置，已跳过：{'、'.join(map(str, skipped))}", QSystemTrayIcon.Warning, 3000)
+            else:
+                self.tray_icon.showMessage("配置已重新加载", f"当前预设：{self.current_preset_name}", QSystemTrayIcon.Information, 1500)
 
-    def save_presets_to_file(self):
-        data = {"presets": self.presets, "last_used": self.current_preset_name}
+    def refresh_preset_combo(self):
+        self.combo_presets.blockSignals(True); self.combo_presets.clear(); self.combo_presets.addItems(list(self.presets.keys()))
+        self.combo_presets.setCurrentText(self.current_preset_name); self.combo_presets.blockSignals(False)
+        self.sync_widgets(config.snapshot)
+
+    def on_config_changed(self, old, new):
+        # 过滤规则只在保存高级规则或切换预设时编译一次，点击时直接查缓存；快捷键同理
+        if new.filter_key() != old.filter_key(): self.app_filter = AppFilter.from_config(new)
+        if new.quantize_list != old.quantize_list: self.quantize_filter = AppFilter.for_quantization(new)
+        if new.hotkey_bindings() != old.hotkey_bindings(): self.refresh_hotkeys()
+        # 推送给后台实例 (同步请求) 与引擎进程 (整份快照 JSON) 都不便宜：经 UiBus 合并，拖动滑块时每帧最多推送一次
+        if self.daemon is not None or self.engine_process is not None: self.ui_bus.post(UI_CONFIG)
+
+    def push_config(self):
+        snap, pushed = config.snapshot, self.pushed_config
+        if snap is pushed: return
+        self.pushed_config = snap
+        if self.daemon is not None:
+            before, after = pushed.to_dict(), snap.to_dict()
+            changed = {name: value for name, value in after.items() if before[name] != value}
+            if changed: self.send_to_daemon("set", values=changed)
+        if self.engine_process is not None: self.engine_process.write_control(snapshot=snap)
+
+    # --- 作为后台实例的客户端 ---
+    def attach_daemon(self):
+        reply = self.daemon.request("config")
+        config.publish(ConfigSnapshot.from_dict(reply["config"]))
+        self.pushed_config = config.snapshot    # 来自后台实例的配置不再推送回去
+        state.paused = reply["paused"]
+        self.setWindowTitle("Global Mouse (已连接后台服务)")
+
+    def send_to_daemon(self, cmd, **args):
         try:
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-        except: pass
+            return self.daemon.request(cmd, **args)
+        except ValueError as e:
+            print(f"Daemon Request Failed: {e}")
+        except ConnectionError:
+            self.detach_daemon()
+
+    def detach_daemon(self):
+        # 后台实例退出后由本进程接管滚动
+        self.daemon.close(); self.daemon = None
+        self.setWindowTitle("Global Mouse")
+        self.start_threads()
+        self.update_engine_actions()
+        if self.tray_icon.isVisible():
+            self.tray_icon.showMessage("后台服务已断开", "已改由本程序处理滚动", QSystemTrayIcon.Information, 2000)
+
+    def save_presets_to_file(self):
+        # 交给后台写线程合并、原子写入；各预设 dict 只会被整体替换，浅拷贝即可
+        self.config_file.save({"presets": dict(self.presets), "last_used": self.current_preset_name})
 
     def init_system_tray(self, icon_name):
         self.tray_icon = QSystemTrayIcon(self)
@@ -435,14 +626,155 @@ class MainWindow(QMainWindow):
             self.tray_icon.setIcon(self.style().standardIcon(QStyle.SP_MessageBoxInformation))
 
         tray_menu = QMenu()
+        # [新增] 前两项只显示滚动引擎的健康状态 (运行中 / 出错重试中 / 已停止) 与当前生效的预设
+        self.action_health = QAction(self)
+        self.action_health.setEnabled(False)
+        self.action_preset = QAction(self)
+        self.action_preset.setEnabled(False)
         action_show = QAction("显示设置", self)
         action_show.triggered.connect(self.show_normal_window)
+        self.action_pause = QAction("暂停滚动", self)
+        self.action_pause.setCheckable(True)
+        self.action_pause.triggered.connect(lambda checked: self.set_paused(checked))
         action_quit = QAction("退出程序", self)
         action_quit.triggered.connect(QApplication.instance().quit)
         
-        tray_menu.addAction(action_show); tray_menu.addSeparator(); tray_menu.addAction(action_quit)
+        action_wakeups = QAction("后台唤醒统计", self)
+        action_wakeups.triggered.connect(self.show_wakeup_stats)
+        action_diagnostics = QAction("诊断面板 (延迟/抖动)", self)
+        action_diagnostics.triggered.connect(self.show_diagnostics)
+
+        # [新增] 会话录制 (默认关闭)：复现 "在某个软件里滚动发顿" 之类的问题，导出后可离线回放
+        self.action_record = QAction("录制滚动会话", self)
+        self.action_record.setCheckable(True)
+        self.action_record.triggered.connect(self.set_recording)
+        action_export = QAction("导出录制...", self)
+        action_export.triggered.connect(self.export_recording)
+        
+        tray_menu.addAction(self.action_health); tray_menu.addAction(self.action_preset); tray_menu.addSeparator()
+        tray_menu.addAction(action_show); tray_menu.addAction(self.action_pause); tray_menu.addAction(action_wakeups)
+        tray_menu.addAction(action_diagnostics)
+        tray_menu.addAction(self.action_record); tray_menu.addAction(action_export)
+        self.recording_actions = [self.action_record, action_export]                      # 引擎在其他进程时不可用
+        self.engine_actions = [action_diagnostics] + self.recording_actions                # 连接后台实例时不可用
+        tray_menu.addSeparator(); tray_menu.addAction(action_quit)
         self.tray_icon.setContextMenu(tray_menu); self.tray_icon.activated.connect(self.on_tray_click); self.tray_icon.show()
 
+    def update_engine_actions(self):
+        for action in self.engine_actions: action.setEnabled(self.daemon is None)
+        for action in self.recording_actions: action.setEnabled(self.daemon is None and self.engine_process is None and self.engine is not None)
+        self.show_health(self.engine_health)
+        self.show_preset(self.app_preset)
+
+    def show_health(self, health):
+        # 托盘菜单与提示文字显示引擎状态；变为出错重试或停止时弹一次通知
+        previous, self.engine_health = self.engine_health, health
+        if not hasattr(self, "action_health"): return
+        text = "由后台服务运行" if self.daemon is not None else HEALTH_NAMES[health]
+        self.action_health.setText(f"滚动引擎：{text}")
+        self.tray_icon.setToolTip(f"Global Mouse - 滚动引擎{text}")
+        if health != previous and health != HEALTH_RUNNING and self.daemon is None and self.tray_icon.isVisible():
+            message = "滚动输出出错，正在自动重试" if health != HEALTH_STOPPED else "滚动引擎已停止，请重新启动程序"
+            self.tray_icon.showMessage("滚动引擎", message, QSystemTrayIcon.Warning, 3000)
+
+    def show_preset(self, name):
+        # name 为按应用自动生效的预设，None 表示使用手动选择的预设
+        self.app_preset = name
+        if not hasattr(self, "action_preset"): return
+        if name is None: self.action_preset.setText(f"当前预设：{self.current_preset_name}")
+        else: self.action_preset.setText(f"当前预设：{name} (按应用自动)")
+
+    def show_wakeup_stats(self):
+        # 自上次查看以来各后台线程的唤醒频率，空闲时应接近 0
+        rates = self.wakeup_sampler.sample()
+        lines = [f"{name}: {rate:.1f} 次/分钟" for name, rate in sorted(rates.items())]
+        QMessageBox.information(self, "后台唤醒统计", "\n".join(lines) or "暂无数据")
+
+    def reset_wakeup_sampler(self):
+        # 切换引擎运行方式后重新取基准 (子进程的计数从 0 开始)
+        from global_mouse.diagnostics import WakeupSampler
+        self.wakeup_sampler = WakeupSampler(counts=self.all_wakeup_counts)
+
+    def load_latency_stats(self):
+        if self.latency_stats is None:
+            from global_mouse.diagnostics import LatencyStats
+            self.latency_stats = LatencyStats()
+        return self.latency_stats
+
+    def show_diagnostics(self):
+        if self.diagnostics_dialog is None:
+            self.load_latency_stats()
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.show(); self.diagnostics_dialog.raise_(); self.diagnostics_dialog.activateWindow()
+
+    def set_instrumentation(self, enabled):
+        # 关闭时把各处的 stats 置为 None，热路径只剩一次 None 判断
+        stats = self.load_latency_stats() if enabled else None
+        self.stats = stats
+        if self.engine is not None: self.engine.stats = stats
+        if self.engine_process is not None: self.engine_process.write_control(stats=enabled)
+        if hasattr(self, "key_manager"): self.key_manager.stats = stats
+
+    # --- 界面更新 ---
+    # 任意线程调用；开启测量时附带投递时刻，送达时记录 overlay_signal / direction_signal
+    def post_overlay(self, visible):
+        self.ui_bus.post(UI_OVERLAY, (visible, time.perf_counter() if visible and self.stats is not None else None))
+
+    def post_health(self, health):
+        self.ui_bus.post(UI_HEALTH, health)
+
+    def post_preset(self, name):
+        self.ui_bus.post(UI_PRESET, name)
+
+    def post_direction(self, direction):
+        self.ui_bus.post(UI_DIRECTION, (direction, time.perf_counter() if self.stats is not None else None))
+
+    def on_ui_wake(self):
+        # 距上次应用不足一帧时推迟到帧末，期间的更新都合并进同一次 drain_ui
+        if self.ui_timer.isActive(): return
+        wait = self.overlay.frame_interval_ms() / 1000.0 - (time.perf_counter() - self.ui_drained_at)
+        if wait > 0: self.ui_timer.start(max(1, int(wait * 1000)))
+        else: self.drain_ui()
+
+    def drain_ui(self):
+        self.ui_drained_at = time.perf_counter()
+        stats = self.stats
+        for channel, value in self.ui_bus.take().items():
+            if channel == UI_DIRECTION:
+                direction, stamp = value
+                if stats is not None and stamp is not None: stats.direction_signal.record(time.perf_counter() - stamp)
+                self.overlay.set_direction(direction)
+            elif channel == UI_OVERLAY:
+                visible, stamp = value
+                if not visible: self.overlay.hide(); continue
+                if stats is not None and stamp is not None: stats.overlay_signal.record(time.perf_counter() - stamp)
+                self.on_show_overlay()
+            elif channel == UI_HEALTH: self.show_health(value)
+            elif channel == UI_PRESET: self.show_preset(value)
+            elif channel == UI_CONFIG: self.push_config()
+            elif channel == UI_SIZE: self.overlay.update_geometry(value)
+            elif channel == UI_PREVIEW: self.overlay.show_preview(self.cursor_screen_rect())
+
+    def set_recording(self, enabled):
+        if enabled and self.recorder is None:
+            from global_mouse.recorder import SessionRecorder
+            self.recorder = SessionRecorder()
+        self.engine.recorder = self.recorder if enabled else None
+
+    def export_recording(self):
+        if self.recorder is None or not self.recorder.sessions:
+            QMessageBox.information(self, "导出录制", "还没有录制到任何滚动会话。")
+            return
+        from PySide6.QtWidgets import QFileDialog
+        default = os.path.join(os.path.expanduser("~"), "Documents", "global_mouse_sessions.gmrec")
+        path, _ = QFileDialog.getSaveFileName(self, "导出录制", default, "Global Mouse 录制 (*.gmrec)")
+        if not path: return
+        try:
+            count = self.recorder.save(path)
+            self.tray_icon.showMessage("导出录制", f"已导出 {count} 个会话到 {path}")
+        except OSError as e:
+            QMessageBox.warning(self, "导出失败", str(e))
+
     def on_tray_click(self, reason):
         if reason == QSystemTrayIcon.DoubleClick or reason == QSystemTrayIcon.Trigger:
             self.show_normal_window()
@@ -450,6 +782,18 @@ class MainWindow(QMainWindow):
     def show_normal_window(self):
         self.show(); self.setWindowState(Qt.WindowNoState); self.raise_(); self.activateWindow()
 
+    def ensure_ui(self):
+        # 开机最小化启动时设置窗口可能从不打开，第一次显示前才构建
+        if self.ui_built: return
+        begin = time.perf_counter()
+        self.init_ui()
+        self.ui_built = True
+        startup.record("settings_window", time.perf_counter() - begin)
+
+    def setVisible(self, visible):
+        if visible: self.ensure_ui()
+        super().setVisible(visible)
+
     def closeEvent(self, event):
         if self.tray_icon.isVisible():
             self.hide()
@@ -480,6 +824,8 @@ class MainWindow(QMainWindow):
         grid = QGridLayout(settings_panel)
         grid.setContentsMargins(20, 20, 20, 20); grid.setVerticalSpacing(18); grid.setHorizontalSpacing(15)
         
+        snap = config.snapshot
+
         def add_row(key, row_idx, label_text, val, min_v, max_v, callback, decimals=1):
             lbl = QLabel(label_text); grid.addWidget(lbl, row_idx, 0)
             spin = QDoubleSpinBox()
@@ -497,16 +843,94 @@ class MainWindow(QMainWindow):
             
             grid.addWidget(slider, row_idx, 1); grid.addWidget(spin, row_idx, 2)
             self.ui_widgets[key] = spin
-
-        add_row("sensitivity", 0, "加速度曲线", cfg.sensitivity, 1.0, 5.0, lambda v: setattr(cfg, 'sensitivity', v), decimals=1)
-        add_row("speed_factor", 1, "基础速度", cfg.speed_factor, 0.01, 10.00, lambda v: setattr(cfg, 'speed_factor', v), decimals=2)
-        add_row("dead_zone", 2, "中心死区", cfg.dead_zone, 0.0, 100.0, lambda v: setattr(cfg, 'dead_zone', v), decimals=1)
-        add_row("overlay_size", 3, "UI 大小", cfg.overlay_size, 30, 150, lambda v: (setattr(cfg, 'overlay_size', v), self.bridge.update_size.emit(int(v)), self.bridge.preview_size.emit()), decimals=0)
+            self.ui_sliders[key] = (slider, scale)
+
+        add_row("sensitivity", 0, "加速度曲线", snap.sensitivity, 1.0, 5.0, lambda v: config.update(sensitivity=v), decimals=1)
+        add_row("speed_factor", 1, "基础速度", snap.speed_factor, 0.01, 10.00, lambda v: config.update(speed_factor=v), decimals=2)
+        add_row("dead_zone", 2, "中心死区", snap.dead_zone, 0.0, 100.0, lambda v: config.update(dead_zone=v), decimals=1)
+        add_row("overlay_size", 3, "UI 大小", snap.overlay_size, 30, 150, lambda v: (config.update(overlay_size=v), self.ui_bus.post(UI_SIZE, int(v)), self.ui_bus.post(UI_PREVIEW)), decimals=0)
+
+        # [新增] 滚动引擎刷新频率 (固定步长) 与输出节奏 (跟随屏幕时按原点所在屏幕的刷新率输出)
+        grid.addWidget(QLabel("刷新频率"), 4, 0)
+        combo_rate = QComboBox()
+        for rate in TICK_RATES: combo_rate.addItem(f"{rate} Hz", rate)
+        combo_rate.setCurrentIndex(max(0, combo_rate.findData(snap.tick_rate)))
+        combo_rate.currentIndexChanged.connect(lambda i: config.update(tick_rate=combo_rate.itemData(i)))
+        combo_rate.setFocusPolicy(Qt.NoFocus)
+        combo_pacing = QComboBox()
+        combo_pacing.addItem("固定频率输出", PACING_FIXED); combo_pacing.addItem("跟随屏幕刷新", PACING_DISPLAY)
+        combo_pacing.setCurrentIndex(max(0, combo_pacing.findData(snap.pacing)))
+        combo_pacing.currentIndexChanged.connect(lambda i: config.update(pacing=combo_pacing.itemData(i)))
+        combo_pacing.setToolTip("跟随屏幕刷新：物理仍按左侧频率计算，输出按屏幕刷新率抽取，避免 60/144Hz 屏幕上的抖动")
+        combo_pacing.setFocusPolicy(Qt.NoFocus)
+        grid.addWidget(combo_rate, 4, 1); grid.addWidget(combo_pacing, 4, 2)
+        self.ui_widgets["tick_rate"] = combo_rate
+        self.ui_widgets["pacing"] = combo_pacing
+
+        # [新增] 曲线形状：幂函数 / 饱和封顶 / 贝塞尔 / 分段线性，参数随预设保存
+        grid.addWidget(QLabel("曲线形状"), 5, 0)
+        combo_curve = QComboBox()
+        for curve_type in CURVE_TYPES: combo_curve.addItem(CURVE_NAMES[curve_type], curve_type)
+        combo_curve.setCurrentIndex(max(0, combo_curve.findData(snap.curve_type)))
+        combo_curve.setFocusPolicy(Qt.NoFocus)
+        edit_params = QLineEdit(format_curve_params(snap.curve_params))
+        edit_params.setMinimumWidth(100)
+        edit_params.setToolTip("饱和封顶: 上限\n贝塞尔: x1, y1, x2, y2\n分段线性: x0, y0, x1, y1, ...\n(x=1 对应死区外 400 像素)")
+        edit_params.setEnabled(snap.curve_type != "power")
+
+        def on_curve_type(i):
+            curve_type = combo_curve.itemData(i)
+            config.update(curve_type=curve_type, curve_params=DEFAULT_CURVE_PARAMS[curve_type])
+            edit_params.setText(format_curve_params(config.snapshot.curve_params)); edit_params.setEnabled(curve_type != "power")
+
+        def on_curve_params():
+            try: config.update(curve_params=parse_curve_params(edit_params.text()))
+            except ValueError: pass
+            edit_params.setText(format_curve_params(config.snapshot.curve_params))
+
+        combo_curve.currentIndexChanged.connect(on_curve_type)
+        edit_params.editingFinished.connect(on_curve_params)
+        grid.addWidget(combo_curve, 5, 1); grid.addWidget(edit_params, 5, 2)
+        self.ui_widgets["curve_type"] = combo_curve
+        self.ui_widgets["curve_params"] = edit_params
+
+        # [新增] 惯性滑行：松开或回到死区后按摩擦衰减，低于停止速度时结束
+        chk_inertia = QCheckBox("惯性滑行")
+        chk_inertia.setChecked(snap.inertia)
+        chk_inertia.toggled.connect(lambda v: config.update(inertia=v))
+        chk_inertia.setFocusPolicy(Qt.NoFocus)
+        spin_friction = QDoubleSpinBox()
+        spin_friction.setRange(0.5, 20.0); spin_friction.setDecimals(1); spin_friction.setSingleStep(0.5)
+        spin_friction.setPrefix("摩擦 "); spin_friction.setValue(snap.friction)
+        spin_friction.valueChanged.connect(lambda v: config.update(friction=v)); spin_friction.setFocusPolicy(Qt.ClickFocus)
+        spin_cutoff = QDoubleSpinBox()
+        spin_cutoff.setRange(0.1, 50.0); spin_cutoff.setDecimals(1); spin_cutoff.setSingleStep(0.5)
+        spin_cutoff.setPrefix("停止 "); spin_cutoff.setValue(snap.glide_cutoff)
+        spin_cutoff.setToolTip("滑行速度低于该值 (格/秒) 时停止")
+        spin_cutoff.valueChanged.connect(lambda v: config.update(glide_cutoff=v)); spin_cutoff.setFocusPolicy(Qt.ClickFocus)
+        grid.addWidget(chk_inertia, 6, 0); grid.addWidget(spin_friction, 6, 1); grid.addWidget(spin_cutoff, 6, 2)
+        self.ui_widgets["inertia"] = chk_inertia
+        self.ui_widgets["friction"] = spin_friction
+        self.ui_widgets["glide_cutoff"] = spin_cutoff
+
+        # [新增] 指针模式：相对位移时在屏幕边缘激活也能一直加速，最高速度只由曲线决定
+        grid.addWidget(QLabel("指针模式"), 7, 0)
+        combo_pointer = QComboBox()
+        combo_pointer.addItem("绝对位置 (经典)", POINTER_ABSOLUTE)
+        combo_pointer.addItem("相对位移：指针停在原处", POINTER_RECENTER)
+        combo_pointer.addItem("相对位移：指针限制在屏幕内", POINTER_CONFINE)
+        combo_pointer.setCurrentIndex(max(0, combo_pointer.findData(snap.pointer_mode)))
+        combo_pointer.currentIndexChanged.connect(lambda i: config.update(pointer_mode=combo_pointer.itemData(i)))
+        combo_pointer.setToolTip("相对位移：按鼠标移动的累积距离计算速度，不受屏幕边缘限制\n"
+                                 "停在原处：每次移动后指针移回原处\n限制在屏幕内：指针快到屏幕边缘时才移回")
+        combo_pointer.setFocusPolicy(Qt.NoFocus)
+        grid.addWidget(combo_pointer, 7, 1, 1, 2)
+        self.ui_widgets["pointer_mode"] = combo_pointer
 
         horiz_layout = QHBoxLayout()
         chk_horiz = QCheckBox("启用横向滚动")
-        chk_horiz.setChecked(cfg.enable_horizontal)
-        chk_horiz.toggled.connect(lambda v: setattr(cfg, 'enable_horizontal', v))
+        chk_horiz.setChecked(snap.enable_horizontal)
+        chk_horiz.toggled.connect(lambda v: config.update(enable_horizontal=v))
         chk_horiz.setFocusPolicy(Qt.NoFocus)
         self.ui_widgets["enable_horizontal"] = chk_horiz
         
@@ -514,27 +938,34 @@ class MainWindow(QMainWindow):
         lbl_hotkey.setStyleSheet("color: #666; font-size: 12px; margin-left: 10px;")
         
         self.hotkey_edit = HotkeyEdit()
-        self.hotkey_edit.setKeySequence(QKeySequence(cfg.horizontal_hotkey))
+        self.hotkey_edit.setKeySequence(QKeySequence(snap.horizontal_hotkey))
         self.hotkey_edit.setMaximumSequenceLength(1)
         self.hotkey_edit.setToolTip("点击输入框，直接按下你要的快捷键 (按退格键清除)")
         self.hotkey_edit.setStyleSheet("QKeySequenceEdit { border: 1px solid #CCC; border-radius: 4px; padding: 2px; background: #FFF; color: #000; min-width: 80px; }")
-        self.hotkey_edit.keySequenceChanged.connect(lambda seq: setattr(cfg, 'horizontal_hotkey', seq.toString()))
+        self.hotkey_edit.keySequenceChanged.connect(lambda seq: config.update(horizontal_hotkey=seq.toString()))
         self.ui_widgets["hotkey_edit"] = self.hotkey_edit
         
         horiz_layout.addWidget(chk_horiz); horiz_layout.addStretch(); horiz_layout.addWidget(lbl_hotkey); horiz_layout.addWidget(self.hotkey_edit)
-        grid.addLayout(horiz_layout, 4, 0, 1, 3)
+        grid.addLayout(horiz_layout, 8, 0, 1, 3)
 
         chk_autorun = QCheckBox("开机自动启动")
         chk_autorun.setChecked(self.autostart.is_autorun())
         chk_autorun.toggled.connect(self.toggle_autorun)
-        chk_autorun.setFocusPolicy(Qt.NoFocus); grid.addWidget(chk_autorun, 5, 0, 1, 3)
+        chk_autorun.setFocusPolicy(Qt.NoFocus); grid.addWidget(chk_autorun, 9, 0, 1, 3)
 
         chk_min = QCheckBox("启动时隐藏最小化")
-        chk_min.setChecked(cfg.start_minimized)
-        chk_min.toggled.connect(lambda v: setattr(cfg, 'start_minimized', v))
-        chk_min.setFocusPolicy(Qt.NoFocus); grid.addWidget(chk_min, 6, 0, 1, 3)
+        chk_min.setChecked(snap.start_minimized)
+        chk_min.toggled.connect(lambda v: config.update(start_minimized=v))
+        chk_min.setFocusPolicy(Qt.NoFocus); grid.addWidget(chk_min, 10, 0, 1, 3)
         self.ui_widgets["start_minimized"] = chk_min
 
+        # [新增] 引擎与鼠标钩子放进子进程，界面繁忙时滚动不再卡顿
+        chk_process = QCheckBox("在独立进程中运行滚动引擎 (重启后生效)")
+        chk_process.setChecked(snap.engine_process)
+        chk_process.toggled.connect(lambda v: config.update(engine_process=v))
+        chk_process.setFocusPolicy(Qt.NoFocus); grid.addWidget(chk_process, 11, 0, 1, 3)
+        self.ui_widgets["engine_process"] = chk_process
+
         main_layout.addWidget(settings_panel)
         
         btn_adv = QPushButton("🚀 高级规则 (防误触/应用排除)")
@@ -542,6 +973,12 @@ class MainWindow(QMainWindow):
         btn_adv.setStyleSheet("QPushButton { background-color: #E5E5EA; color: #1C1C1E; border-radius: 8px; padding: 10px; font-weight: bold; font-size: 13px; } QPushButton:hover { background-color: #D1D1D6; }")
         btn_adv.clicked.connect(self.open_advanced_settings)
         main_layout.addWidget(btn_adv)
+
+        btn_keys = QPushButton("⌨️ 快捷键设置 (暂停/切换预设/曲线)")
+        btn_keys.setCursor(Qt.PointingHandCursor)
+        btn_keys.setStyleSheet(btn_adv.styleSheet())
+        btn_keys.clicked.connect(self.open_hotkey_settings)
+        main_layout.addWidget(btn_keys)
         
         main_layout.addStretch()
 
@@ -568,10 +1005,42 @@ class MainWindow(QMainWindow):
         footer_link.setText("<a href='https://github.com/AouTzxc/Global-mouse' style='color: #8E8E93; text-decoration: none; font-weight: bold;'>By: 阿呆</a>")
         main_layout.addWidget(footer_link)
 
+    def on_hotkey(self, action):
+        if action == "toggle_horizontal": self.on_toggle_horizontal_hotkey()
+        elif action == "toggle_pause": self.set_paused(not state.paused)
+        elif action == "cycle_curve":
+            current = config.snapshot.curve_type
+            curve_type = CURVE_TYPES[(CURVE_TYPES.index(current) + 1) % len(CURVE_TYPES) if current in CURVE_TYPES else 0]
+            if self.ui_built:
+                combo = self.ui_widgets["curve_type"]
+                combo.setCurrentIndex(max(0, combo.findData(curve_type)))
+            else: config.update(curve_type=curve_type, curve_params=DEFAULT_CURVE_PARAMS[curve_type])
+            if self.tray_icon.isVisible():
+                self.tray_icon.showMessage("曲线形状切换", CURVE_NAMES[curve_type], QSystemTrayIcon.Information, 1500)
+        elif action.startswith("preset:"):
+            names = list(self.presets.keys())
+            index = int(action.split(":", 1)[1]) - 1
+            if 0 <= index < len(names):
+                if self.ui_built: self.combo_presets.setCurrentText(names[index])
+                else: self.load_selected_preset(names[index])
+                if self.tray_icon.isVisible():
+                    self.tray_icon.showMessage("预设切换", f"当前预设：{names[index]}", QSystemTrayIcon.Information, 1500)
+
+    def set_paused(self, paused):
+        if self.daemon is not None: self.send_to_daemon("toggle", paused=paused)
+        if self.engine_process is not None: self.engine_process.write_control(paused=paused)
+        state.paused = paused
+        if paused and state.active:
+            state.active = False
+            self.post_overlay(False)
+        self.action_pause.setChecked(paused)
+        if self.tray_icon.isVisible():
+            self.tray_icon.showMessage("全局滚动", "已暂停 ⏸️" if paused else "已恢复 ▶️", QSystemTrayIcon.Information, 1500)
+
     def on_toggle_horizontal_hotkey(self):
-        new_state = not cfg.enable_horizontal
-        setattr(cfg, 'enable_horizontal', new_state)
-        self.ui_widgets["enable_horizontal"].setChecked(new_state)
+        new_state = not config.snapshot.enable_horizontal
+        config.update(enable_horizontal=new_state)
+        if self.ui_built: self.ui_widgets["enable_horizontal"].setChecked(new_state)
         if self.tray_icon.isVisible():
             state_str = "已开启 🟢" if new_state else "已关闭 🔴"
             self.tray_icon.showMessage("横向滚动切换", f"横向滚动 {state_str}", QSystemTrayIcon.Information, 1500)
@@ -581,133 +1050,286 @@ class MainWindow(QMainWindow):
         if dialog.exec() == QDialog.Accepted:
             self.save_presets_to_file()
 
+    def open_hotkey_settings(self):
+        dialog = HotkeySettingsDialog(self)
+        if dialog.exec() == QDialog.Accepted:
+            self.save_presets_to_file()
+
+    def refresh_hotkeys(self):
+        if getattr(self, 'key_manager', None) is None: return
+        try: self.key_manager.set_bindings(config.snapshot.hotkey_bindings())
+        except Exception as e: print(f"Keyboard Hook Failed: {e}")
+
     def toggle_autorun(self, checked):
         if not self.autostart.set_autorun(checked):
             self.sender().blockSignals(True); self.sender().setChecked(not checked); self.sender().blockSignals(False)
             QMessageBox.warning(self, "设置失败", "权限不足或路径错误。")
 
     def save_new_preset(self):
+        from PySide6.QtWidgets import QInputDialog
         text, ok = QInputDialog.getText(self, "保存参数", "请输入预设名称:", text=self.current_preset_name)
         if ok and text:
-            self.presets[text] = cfg.to_dict(); self.current_preset_name = text; self.save_presets_to_file()
+            self.presets[text] = config.snapshot.to_dict(); self.current_preset_name = text; self.save_presets_to_file()
+            self.sync_app_presets(); self.show_preset(self.app_preset)
             self.combo_presets.blockSignals(True); self.combo_presets.clear(); self.combo_presets.addItems(list(self.presets.keys()))
             self.combo_presets.setCurrentText(text); self.combo_presets.blockSignals(False)
 
     def delete_preset(self):
         name = self.combo_presets.currentText()
         if name == "默认": QMessageBox.warning(self, "提示", "默认配置无法删除。"); return
-        del self.presets[name]; self.current_preset_name = "默认"; self.save_presets_to_file()
+        del self.presets[name]; self.current_preset_name = "默认"; self.save_presets_to_file(); self.sync_app_presets()
         self.combo_presets.blockSignals(True); self.combo_presets.clear(); self.combo_presets.addItems(list(self.presets.keys()))
         self.combo_presets.setCurrentText("默认"); self.combo_presets.blockSignals(False); self.load_selected_preset("默认")
 
     def load_selected_preset(self, name):
+        # 预设整体作为一个快照发布，控件仅同步显示，不再逐项回写配置
         if name in self.presets:
-            cfg.from_dict(self.presets[name]); self.current_preset_name = name
-            self.ui_widgets["sensitivity"].setValue(cfg.sensitivity); self.ui_widgets["speed_factor"].setValue(cfg.speed_factor)
-            self.ui_widgets["dead_zone"].setValue(cfg.dead_zone); self.ui_widgets["overlay_size"].setValue(cfg.overlay_size)
-            self.ui_widgets["enable_horizontal"].setChecked(cfg.enable_horizontal)
-            self.ui_widgets["start_minimized"].setChecked(cfg.start_minimized)
-            self.ui_widgets["hotkey_edit"].setKeySequence(QKeySequence(cfg.horizontal_hotkey))
+            config.publish(ConfigSnapshot.from_dict(self.presets[name])); self.current_preset_name = name
+            self.sync_widgets(config.snapshot); self.show_preset(self.app_preset)
             self.save_presets_to_file()
 
+    def sync_widgets(self, snap):
+        if not self.ui_built: return
+        widgets = list(self.ui_widgets.values()) + [slider for slider, _ in self.ui_sliders.values()]
+        for widget in widgets: widget.blockSignals(True)
+        try:
+            for key, (slider, scale) in self.ui_sliders.items():
+                self.ui_widgets[key].setValue(getattr(snap, key)); slider.setValue(int(getattr(snap, key) * scale))
+            self.ui_widgets["tick_rate"].setCurrentIndex(max(0, self.ui_widgets["tick_rate"].findData(snap.tick_rate)))
+            self.ui_widgets["pacing"].setCurrentIndex(max(0, self.ui_widgets["pacing"].findData(snap.pacing)))
+            self.ui_widgets["inertia"].setChecked(snap.inertia)
+            self.ui_widgets["friction"].setValue(snap.friction)
+            self.ui_widgets["glide_cutoff"].setValue(snap.glide_cutoff)
+            self.ui_widgets["curve_type"].setCurrentIndex(max(0, self.ui_widgets["curve_type"].findData(snap.curve_type)))
+            self.ui_widgets["curve_params"].setText(format_curve_params(snap.curve_params))
+            self.ui_widgets["curve_params"].setEnabled(snap.curve_type != "power")
+            self.ui_widgets["pointer_mode"].setCurrentIndex(max(0, self.ui_widgets["pointer_mode"].findData(snap.pointer_mode)))
+            self.ui_widgets["enable_horizontal"].setChecked(snap.enable_horizontal)
+            self.ui_widgets["start_minimized"].setChecked(snap.start_minimized)
+            self.ui_widgets["engine_process"].setChecked(snap.engine_process)
+            self.ui_widgets["hotkey_edit"].setKeySequence(QKeySequence(snap.horizontal_hotkey))
+        finally:
+            for widget in widgets: widget.blockSignals(False)
+        self.overlay.update_geometry(int(snap.overlay_size))
+
     def on_show_overlay(self):
-        self.overlay.set_direction('neutral')
-        self.overlay.move(int(QCursor.pos().x() - cfg.overlay_size / 2), int(QCursor.pos().y() - cfg.overlay_size / 2))
+        self.overlay.set_direction('neutral', immediate=True)
+        size = config.snapshot.overlay_size
+        self.overlay.move(int(QCursor.pos().x() - size / 2), int(QCursor.pos().y() - size / 2))
         self.overlay.show(); self.overlay.raise_()
-    
-    def on_hide_overlay(self):
-        self.overlay.hide()
+
+    def cursor_screen_rect(self):
+        # 指针所在屏幕的界面坐标区域 (预览悬浮图标时居中显示在这块屏幕上)
+        pos = QCursor.pos()
+        screen = self.screens.screen_at(pos.x(), pos.y(), physical=False)
+        if screen is not None: return screen.logical
+        geom = QApplication.primaryScreen().geometry()
+        return geom.x(), geom.y(), geom.width(), geom.height()
+
+    # --- 屏幕布局 ---
+    # [优化] 屏幕增减、主屏切换以及单块屏幕的分辨率/缩放/刷新率变化时重建索引；引擎线程与前台窗口侦听只读 self.screens
+    def watch_screens(self):
+        qapp = QGuiApplication.instance()
+        qapp.screenAdded.connect(self.on_screen_added); qapp.screenRemoved.connect(self.refresh_screens)
+        qapp.primaryScreenChanged.connect(self.refresh_screens)
+        for screen in QGuiApplication.screens(): self.watch_screen(screen)
+        self.refresh_screens()
+
+    def watch_screen(self, screen):
+        for signal in (screen.geometryChanged, screen.logicalDotsPerInchChanged, screen.physicalDotsPerInchChanged,
+                       screen.refreshRateChanged):
+            signal.connect(self.refresh_screens)
+
+    def on_screen_added(self, screen):
+        self.watch_screen(screen)
+        self.refresh_screens()
+
+    def refresh_screens(self, *args):
+        self.screens = qt_screen_index()
+        if self.engine_process is not None: self.engine_process.write_control(screens=self.screens.rates())
+        # 换了屏幕布局后重新判断当前前台窗口是否全屏
+        monitor = getattr(self, "window_monitor", None)
+        if monitor is not None: monitor.refresh()
+
+    def refresh_rate_at(self, pos):
+        # 引擎线程在每次激活时调用
+        return self.screens.refresh_rate(pos)
 
     def start_threads(self):
-        try:
-            self.window_monitor = WindowMonitor()
-            self.window_monitor.start()
-        except Exception: pass
+        # 顺序即优先级：引擎与鼠标钩子 -> 快捷键 -> 前台窗口侦听 -> 屏幕刷新率 (缺失时引擎按固定频率输出)
+        # [新增] 选择独立进程时，引擎、鼠标钩子与前台窗口侦听都在子进程里运行，本进程只保留界面与键盘快捷键
+        if not (config.snapshot.engine_process and self.start_engine_process()): self.start_engine_threads()
 
         try:
-            self.key_manager = KeyboardManager(lambda: self.bridge.toggle_horizontal.emit())
-            self.key_manager.start()
+            self.key_manager = KeyboardManager(self.bridge.hotkey_triggered.emit)
+            self.key_manager.set_bindings(config.snapshot.hotkey_bindings())
         except Exception as e:
             print(f"Keyboard Hook Failed: {e}") 
 
+        if self.engine_process is None: self.start_window_monitor()
+
+        self.watch_screens()
+
+    def start_engine_threads(self):
+        try:
+            self.output = default_backend(mouse_controller)
+            self.engine = ScrollEngine(self.app_presets, state, self.read_position, self.output,
+                                       on_direction=self.post_direction, get_refresh_rate=self.refresh_rate_at)
+            self.engine.stats = self.stats
+            self.engine.pointer = RelativePointer(mouse_controller, lambda: self.screens)
+            # 引擎由监督器运行：失败分类计数、指数退避、输出后端连续失败时重建，健康状态显示在托盘
+            self.supervisor = EngineSupervisor(self.engine, lambda: default_backend(mouse_controller), self.on_output_restarted, self.post_health)
+            self.supervisor.start()
+            self.click_codes = button_codes(mouse.Button)
+            self.click_dispatcher = ClickDispatcher(self.clicks, self.handle_click)
+            self.click_dispatcher.start()
+        except Exception as e:
+            # 引擎起不来时不挂鼠标钩子：否则点击会堆在没有线程处理的队列里；托盘显示引擎已停止
+            print(f"Scroll Engine Failed: {e}")
+            self.engine = self.supervisor = None
+            self.post_health(HEALTH_STOPPED)
+            if hasattr(self, "tray_icon") and self.tray_icon.isVisible():
+                self.tray_icon.showMessage("滚动引擎", f"滚动引擎启动失败：{e}", QSystemTrayIcon.Warning, 3000)
+            return
+
         # [微软商店过审护盾：捕获无 runFullTrust 权限时的崩溃并弹窗提示]
         try:
-            self.listener = mouse.Listener(on_click=self.on_click)
+            self.listener = mouse.Listener(on_click=self.on_click, on_move=self.on_move)
             self.listener.start()
         except Exception as e:
-            self.ui_widgets["enable_horizontal"].setChecked(False) 
+            config.update(enable_horizontal=False)
             QMessageBox.critical(self, "权限不足", "无法启动鼠标拦截服务。\n\n这通常是因为缺少底层挂钩权限。\n如果是在应用商店版中运行，请确保已授予该权限。")
-            
+
+    def start_window_monitor(self):
         try:
-            self.scroller = threading.Thread(target=self.scroll_loop, daemon=True)
-            self.scroller.start()
+            self.window_monitor = WindowMonitor(state, default_provider(), lambda: self.screens, self.app_presets.on_foreground_changed)
+            self.window_monitor.start()
         except Exception: pass
 
-    def is_current_app_allowed(self):
-        if cfg.disable_fullscreen and cfg.is_fullscreen: return False
-        
-        # [新增] 拦截 Windows 桌面
-        if cfg.disable_desktop and OS_NAME == "Windows":
-            if cfg.current_window_class in ("Progman", "WorkerW"): 
-                return False
-
-        if cfg.filter_mode == 0: return True
-            
-        app_name = cfg.current_window_name.lower()
-        if cfg.filter_mode == 1:
-            for keyword in cfg.filter_list:
-                if keyword.lower() in app_name: return False
-            return True
-        elif cfg.filter_mode == 2:
-            for keyword in cfg.filter_list:
-                if keyword.lower() in app_name: return True
+    # --- 独立引擎进程 ---
+    # 界面重绘、保存大配置等占用 GIL 的工作不再推迟滚动 tick；两进程之间只交换共享内存里的固定布局数据
+    def start_engine_process(self):
+        self.screens = qt_screen_index()
+        self.pushed_config = config.snapshot
+        from global_mouse.engine_process import EngineProcess
+        process = EngineProcess(self.on_engine_status, self.bridge.engine_process_exited.emit)
+        try:
+            process.start(config.snapshot, paused=state.paused, screens=self.screens.rates(), profiles=preset_profiles(self.presets))
+        except Exception as e:
+            print(f"Engine Process Failed: {e}")
             return False
+        self.engine_process = process
+        self.reset_wakeup_sampler()
+        if self.stats is not None: process.write_control(stats=True)
+        QApplication.instance().aboutToQuit.connect(process.close)
         return True
 
+    def on_output_restarted(self, output):
+        self.output = output
+
+    def on_engine_status(self, active, paused, direction, origin, health, preset):
+        # 运行在读取引擎进程门铃的线程；多次状态变化可能合并成一次，只看最新状态
+        if health != self.engine_health: self.post_health(health)
+        if preset != self.app_preset: self.post_preset(preset)
+        was_active, state.active = state.active, active
+        if active and not was_active:
+            self.post_overlay(True)
+            if direction != 'neutral': self.post_direction(direction)
+        elif was_active and not active:
+            self.post_overlay(False)
+        elif active:
+            self.post_direction(direction)
+
+    def on_engine_process_exited(self):
+        # 子进程意外退出 (被结束、崩溃)：改回在本进程内运行引擎与钩子
+        if self.engine_process is None: return
+        self.engine_process.close(); self.engine_process = None
+        state.active = False
+        self.overlay.hide()
+        self.start_engine_threads()
+        self.start_window_monitor()
+        self.reset_wakeup_sampler()
+        self.update_engine_actions()
+        if self.tray_icon.isVisible():
+            self.tray_icon.showMessage("引擎进程已退出", "已改为在本进程中处理滚动", QSystemTrayIcon.Information, 2000)
+
+    def all_wakeup_counts(self):
+        # 唤醒统计：子进程的线程加上 "engine:" 前缀与本进程的合并显示
+        counts = wakeup_counts()
+        if self.engine_process is not None:
+            counts.update({f"engine:{name}": count for name, count in self.engine_process.read_stats()["wakeups"].items()})
+        return counts
+
+    def engine_summary(self):
+        # 诊断面板显示的引擎失败计数
+        if self.engine_process is not None:
+            counters = self.engine_process.read_stats()["counters"]
+            return (f"滚动引擎 (独立进程)：{HEALTH_NAMES[self.engine_health]}，失败 {counters['engine_failures']} 次，"
+                    f"重建输出后端 {counters['output_restarts']} 次")
+        if self.engine is None: return ""
+        info = self.supervisor.to_dict()
+        failures = " / ".join(f"{kind} {count}" for kind, count in info["failures"].items())
+        text = f"滚动引擎：{HEALTH_NAMES[info['health']]}，失败 {failures}，重建输出后端 {info['output_restarts']} 次"
+        return text + (f"，最近错误 {info['last_error']}" if info["last_error"] else "")
+
+    def sync_engine_stats(self, timeout=0.0):
+        # 诊断面板刷新前，把子进程的直方图拷贝进本进程的 latency_stats (与同一次刷新里的其他读取共用一份统计，不等待子进程)
+        if self.engine_process is None or self.latency_stats is None: return
+        for name, (counts, count, total, maximum) in self.engine_process.read_stats(timeout)["histograms"].items():
+            h = getattr(self.latency_stats, name)
+            h.counts, h.count, h.total, h.max = counts, count, total, maximum
+
+    def is_current_app_allowed(self):
+        window = state.window
+        return self.app_filter.allowed(window.title, window.window_class, window.fullscreen)
+
+    def apply_quantization(self):
+        # 每次激活时按当前前台应用决定输出粒度 (结果由 AppFilter 的 LRU 缓存)
+        window = state.window
+        whole = self.quantize_filter.allowed(window.title, window.window_class, window.fullscreen)
+        self.output.set_quantum(self.output.steps_per_unit if whole else 1)
+
+    def on_move(self, x, y):
+        self.motion.push(x, y)
+
+    def read_position(self):
+        # 优先读取钩子记录的最新位置 (无系统调用)，还没有任何样本时才询问系统
+        pos = self.motion.position()
+        return pos if pos is not None else mouse_controller.position
+
     def on_click(self, x, y, button, pressed):
-        if button == mouse.Button.middle:
-            if pressed:
-                if not self.is_current_app_allowed(): return
-                cfg.active = not cfg.active
-                if cfg.active:
-                    cfg.origin_pos = (x, y)
-                    self.bridge.show_overlay.emit()
+        # [优化] 钩子线程里只记录时间戳并写入预分配队列 (Windows 下回调过慢会被系统摘掉钩子，且会拖慢全局点击)
+        # 过滤判定、状态切换和界面通知都交给 click_dispatch 线程；监听器不拦截事件，钩子里唯一的判断是查按键表
+        stats = self.stats
+        if stats is not None: started = time.perf_counter()
+        self.click_wakeups.hit()
+        self.motion.push(x, y)
+        if pressed:
+            code = self.click_codes.get(button)
+            if code: self.clicks.push(code, x, y)
+        if stats is not None: stats.on_click.record(time.perf_counter() - started)
+
+    def handle_click(self, code, x, y, t):
+        # 运行在 click_dispatch 线程；t 为钩子记录的点击时间
+        stats = self.stats
+        if code == CLICK_TOGGLE:
+            if not state.paused and self.is_current_app_allowed():
+                if not state.active:
+                    state.origin_pos = (x, y)
+                    self.apply_quantization()
+                    state.active = True
+                    self.engine.notify(t)
+                    self.post_overlay(True)
                 else:
-                    self.bridge.hide_overlay.emit()
-        elif pressed and (button == mouse.Button.left or button == mouse.Button.right):
-            if cfg.active:
-                cfg.active = False
-                self.bridge.hide_overlay.emit()
-
-    def scroll_loop(self):
-        last_dir = 'neutral'
-        while True:
-            if cfg.active:
-                try:
-                    curr_x, curr_y = mouse_controller.position
-                    dx, dy = curr_x - cfg.origin_pos[0], curr_y - cfg.origin_pos[1]
-                    if not cfg.enable_horizontal: dx = 0
-
-                    dist = math.hypot(dx, dy)
-                    current_dir = 'neutral'
-                    if dist > cfg.dead_zone:
-                        if abs(dx) > abs(dy): current_dir = 'right' if dx > 0 else 'left'
-                        else: current_dir = 'down' if dy > 0 else 'up'
-                    
-                    if current_dir != last_dir:
-                        self.bridge.update_direction.emit(current_dir)
-                        last_dir = current_dir
-
-                    if dist > cfg.dead_zone:
-                        eff_dist = dist - cfg.dead_zone
-                        base_multiplier = 0.0001 if OS_NAME == "Darwin" else 0.00005
-                        speed_scalar = math.pow(eff_dist, cfg.sensitivity) * base_multiplier * cfg.speed_factor
-                        mouse_controller.scroll((dx / dist) * speed_scalar, (dy / dist) * speed_scalar * -1)
-                    time.sleep(0.01)
-                except: pass
-            else:
-                last_dir = 'neutral'
-                time.sleep(0.05)
+                    state.active = False
+                    self.post_overlay(False)
+        else:
+            # 左/右键是 "取消"：立即停止，不进入惯性滑行
+            if state.active:
+                state.active = False
+                self.post_overlay(False)
+            if self.engine.gliding(): self.engine.stop_glide()
+        if stats is not None: stats.click_dispatch.record(time.perf_counter() - t)
 
 if __name__ == "__main__":
     try:
@@ -723,9 +1345,19 @@ if __name__ == "__main__":
 
         font_name = ".AppleSystemUIFont" if OS_NAME == "Darwin" else "Segoe UI"
         app.setFont(QFont(font_name, 11 if OS_NAME == "Windows" else 13))
+        startup.mark("qt_init")
         
         window = MainWindow()
-        if not cfg.start_minimized: window.show()
+        if not config.snapshot.start_minimized:
+            window.show(); startup.mark("window_show")
+        # 事件循环开始处理事件时启动完成；--startup-report 时输出各阶段耗时 (JSON) 后退出，用于跟踪开机登录时的开销
+        report = "--startup-report" in sys.argv
+        def on_started():
+            startup.mark("event_loop")
+            if report:
+                import json
+                print(json.dumps(startup.to_dict(), ensure_ascii=False)); app.quit()
+        QTimer.singleShot(0, on_started)
         sys.exit(app.exec())
     except Exception as e:
         # [最后一道防线] 发生致命崩溃时，在用户的【文档】目录下生成 crash_log.txt